@@ -0,0 +1,76 @@
+
+
+"""
+Compares the validated Button construction with Button.trusted,
+per button and for the month calendar keyboard
+
+Run: python benchmarks/button_benchmark.py
+"""
+
+import timeit
+
+from datetime import date
+
+from usefulgram.keyboard import Button, Row, Builder
+from usefulgram.utils.calendar_manager import CalendarDateFilter
+
+
+class ResultFilter(CalendarDateFilter):
+    prefix: str = "result"
+
+
+NUMBER = 20_000
+
+CALENDAR_NUMBER = 500
+
+CALENDAR_BUTTONS = 49
+
+test_filter = ResultFilter(date_value=date(2023, 9, 17))
+
+
+def _print_result(
+        name: str,
+        old_seconds: float,
+        new_seconds: float,
+        number: int
+) -> None:
+
+    old_us = old_seconds / number * 1e6
+    new_us = new_seconds / number * 1e6
+
+    print(
+        f"{name:<10} Button: {old_us:8.2f} us  "
+        f"Button.trusted: {new_us:8.2f} us  x{old_us / new_us:.1f}"
+    )
+
+
+def _build_calendar(is_trusted: bool) -> None:
+    get_button = Button.trusted if is_trusted else Button
+
+    buttons = [
+        get_button(str(day), test_filter) for day in range(CALENDAR_BUTTONS)
+    ]
+
+    Builder(*(Row(*buttons[i:i + 7]) for i in range(0, CALENDAR_BUTTONS, 7)))
+
+
+def main() -> None:
+    _print_result(
+        "button",
+        timeit.timeit(lambda: Button("17", test_filter), number=NUMBER),
+        timeit.timeit(
+            lambda: Button.trusted("17", test_filter), number=NUMBER
+        ),
+        NUMBER
+    )
+
+    _print_result(
+        "calendar",
+        timeit.timeit(lambda: _build_calendar(False), number=CALENDAR_NUMBER),
+        timeit.timeit(lambda: _build_calendar(True), number=CALENDAR_NUMBER),
+        CALENDAR_NUMBER
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+
+
+"""
+Compares the fixed-width TemporalCodec with the strftime/strptime path
+which was used for every datetime, date and time callback value
+
+Run: python benchmarks/temporal_benchmark.py
+"""
+
+import timeit
+
+from datetime import datetime
+
+from usefulgram.enums import Const
+from usefulgram.parsing.temporal import TemporalCodec
+
+
+NUMBER = 200_000
+
+test_datetime = datetime(year=2023, month=9, day=17, hour=13,
+                         minute=45, second=7)
+
+test_value = test_datetime.strftime(Const.DATETIME_FORMAT)
+
+temporal = TemporalCodec()
+
+
+def _print_result(name: str, old_seconds: float, new_seconds: float) -> None:
+    old_ns = old_seconds / NUMBER * 1e9
+    new_ns = new_seconds / NUMBER * 1e9
+
+    print(
+        f"{name:<10} strptime/strftime: {old_ns:8.1f} ns  "
+        f"TemporalCodec: {new_ns:8.1f} ns  x{old_ns / new_ns:.1f}"
+    )
+
+
+def main() -> None:
+    _print_result(
+        "parse",
+        timeit.timeit(
+            lambda: datetime.strptime(test_value, Const.DATETIME_FORMAT),
+            number=NUMBER
+        ),
+        timeit.timeit(
+            lambda: temporal.to_datetime(test_value), number=NUMBER
+        )
+    )
+
+    _print_result(
+        "parse date",
+        timeit.timeit(
+            lambda: datetime.strptime(test_value, Const.DATETIME_FORMAT).date(),
+            number=NUMBER
+        ),
+        timeit.timeit(lambda: temporal.to_date(test_value), number=NUMBER)
+    )
+
+    _print_result(
+        "format",
+        timeit.timeit(
+            lambda: test_datetime.strftime(Const.DATETIME_FORMAT),
+            number=NUMBER
+        ),
+        timeit.timeit(
+            lambda: temporal.datetime_to_str(test_datetime), number=NUMBER
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+
+
+"""
+Memory and time of the throttling store with 1 000 000 active users,
+compared with the TTLCache of the same size
+
+Run: python benchmarks/throttling_memory_benchmark.py
+"""
+
+import time
+import tracemalloc
+
+from typing import Callable
+
+from cachetools import TTLCache
+
+from usefulgram.throttling import (
+    BaseThrottlingAlgorithm,
+    ThrottlingStore,
+    Cooldown,
+    GCRA
+)
+
+
+USERS = 1_000_000
+
+# The users come during the minute, so the keys are in 60 buckets
+SECONDS = 60
+
+
+def _measure(name: str, fill: Callable[[], object]) -> None:
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    store = fill()
+    seconds = time.perf_counter() - start
+
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<22} {memory / 2 ** 20:8.1f} MiB  "
+        f"{memory / USERS:6.1f} B/user  "
+        f"{seconds / USERS * 1e6:6.2f} us/hit"
+    )
+
+    del store
+
+
+def _fill_store(
+        algorithm: BaseThrottlingAlgorithm
+) -> Callable[[], ThrottlingStore]:
+    def fill() -> ThrottlingStore:
+        store = ThrottlingStore()
+
+        for user_id in range(USERS):
+            store.hit(user_id, algorithm, user_id * SECONDS / USERS)
+
+        return store
+
+    return fill
+
+
+def _fill_ttl_cache() -> TTLCache:
+    cache: TTLCache = TTLCache(maxsize=USERS, ttl=SECONDS * 2)
+
+    for user_id in range(USERS):
+        cache[user_id] = None
+
+    return cache
+
+
+def main() -> None:
+    _measure("TTLCache", _fill_ttl_cache)
+    _measure("store, Cooldown", _fill_store(Cooldown(SECONDS * 2)))
+    _measure("store, GCRA", _fill_store(GCRA(rate=1, burst=SECONDS * 2)))
+
+    store = _fill_store(Cooldown(1))()
+
+    store.get(0, SECONDS + 2)
+
+    print(
+        f"after expiry: occupancy {store.occupancy}, "
+        f"expired {store.expired}, evicted {store.evicted}"
+    )
+
+
+if __name__ == "__main__":
+    main()
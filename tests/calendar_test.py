@@ -0,0 +1,175 @@
+
+
+import asyncio
+import unittest
+
+from datetime import date
+from unittest.mock import patch
+from typing import Any, Optional
+
+from aiogram.types import InlineKeyboardMarkup
+
+from usefulgram.utils.calendar_manager import CalendarDateFilter
+from usefulgram.utils.calendar_manager.views import Calendar
+
+
+class ResultFilter(CalendarDateFilter):
+    prefix: str = "result"
+
+
+class FakeSender:
+    async def send(
+            self,
+            text: Optional[str] = None,
+            reply_markup: Optional[InlineKeyboardMarkup] = None,
+            **kwargs: Any
+    ) -> InlineKeyboardMarkup:
+
+        return reply_markup
+
+
+TODAY = date(2023, 9, 17)
+
+
+class CalendarPrefetchTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calendar = Calendar()
+        self.sender = FakeSender()
+
+        self.date_patch = patch.object(
+            Calendar, "_get_current_date", return_value=TODAY
+        )
+
+        self.date_patch.start()
+
+    def tearDown(self):
+        self.date_patch.stop()
+
+    async def _show(self, month: int, year: int, **kwargs: Any):
+        return await self.calendar.show(
+            self.sender, month, year, ResultFilter(), **kwargs
+        )
+
+    async def test_prefetch_adjacent_months(self):
+        markup = await self._show(1, 2024, prefetch=True)
+
+        await asyncio.gather(*self.calendar._tasks)
+
+        previous_markup = await self._show(12, 2023)
+        next_markup = await self._show(2, 2024)
+
+        self.assertTrue(markup.inline_keyboard[-1][1].text == "1.2024")
+        self.assertTrue(
+            previous_markup.inline_keyboard[-1][1].text == "12.2023"
+        )
+        self.assertTrue(next_markup.inline_keyboard[-1][1].text == "2.2024")
+
+        self.assertTrue(len(self.calendar._markups) == 3)
+
+        with patch.object(self.calendar, "_build_markup") as build_markup:
+            self.assertTrue(next_markup == await self._show(2, 2024))
+
+        self.assertTrue(not build_markup.called)
+
+    async def test_without_prefetch(self):
+        await self._show(1, 2024)
+
+        self.assertTrue(not self.calendar._tasks)
+        self.assertTrue(len(self.calendar._markups) == 1)
+
+    async def test_midnight(self):
+        await self._show(9, 2023, prefetch=True)
+        await asyncio.gather(*self.calendar._tasks)
+
+        today_markup = await self._show(10, 2023)
+
+        with patch.object(
+                Calendar, "_get_current_date", return_value=date(2023, 9, 18)
+        ):
+            tomorrow_markup = await self._show(10, 2023)
+
+        self.assertTrue(today_markup == tomorrow_markup)
+        self.assertTrue(self.calendar._markups_date == date(2023, 9, 18))
+        self.assertTrue(len(self.calendar._markups) == 1)
+
+    async def test_prefetch_after_midnight(self):
+        await self._show(9, 2023, prefetch=True)
+
+        with patch.object(
+                Calendar, "_get_current_date", return_value=date(2023, 9, 18)
+        ):
+            tomorrow_markup = await self._show(10, 2023)
+
+            # The prefetch of yesterday runs after the midnight
+            await asyncio.gather(*self.calendar._tasks)
+
+            self.assertTrue(self.calendar._markups_date == date(2023, 9, 18))
+            self.assertTrue(len(self.calendar._markups) == 1)
+            self.assertTrue(
+                tomorrow_markup == next(iter(self.calendar._markups.values()))
+            )
+
+
+class CalendarMarkupTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calendar = Calendar()
+        self.sender = FakeSender()
+
+    async def test_markup_cache(self):
+        result_class = ResultFilter()
+
+        with patch.object(Calendar, "_get_current_date", return_value=TODAY):
+            markup = await self.calendar.show(
+                self.sender, 9, 2023, result_class
+            )
+
+            cached_markup = await self.calendar.show(
+                self.sender, 9, 2023, ResultFilter()
+            )
+
+        self.assertTrue(markup == cached_markup)
+        self.assertTrue(len(self.calendar._markups) == 1)
+        self.assertTrue(result_class.date_value is None)
+
+    async def test_changed_markup(self):
+        with patch.object(Calendar, "_get_current_date", return_value=TODAY):
+            markup = await self.calendar.show(
+                self.sender, 9, 2023, ResultFilter()
+            )
+
+            # The caller changes its keyboard, the cached one is the same
+            markup.inline_keyboard.append([])
+            markup.inline_keyboard[0][0].text = "changed"
+
+            next_markup = await self.calendar.show(
+                self.sender, 9, 2023, ResultFilter()
+            )
+
+        self.assertTrue(next_markup != markup)
+        self.assertTrue(next_markup.inline_keyboard[0][0].text == "Mo")
+
+    async def test_markup(self):
+        with patch.object(Calendar, "_get_current_date", return_value=TODAY):
+            markup = await self.calendar.show(
+                self.sender, 9, 2023, ResultFilter()
+            )
+
+        heading, empty_row, first_week = markup.inline_keyboard[:3]
+        last_week = markup.inline_keyboard[-2]
+
+        self.assertTrue([button.text for button in heading][0] == "Mo")
+        self.assertTrue(empty_row == [])
+        self.assertTrue(
+            [button.text for button in first_week] ==
+            [" ", " ", " ", " ", "1", "2", "3"]
+        )
+
+        self.assertTrue(last_week[0].text == "25")
+        self.assertTrue(markup.inline_keyboard[4][6].text == "[17]")
+        self.assertTrue(
+            all(len(row) == 7 for row in markup.inline_keyboard[2:-1])
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+
+
+import asyncio
+import unittest
+
+from usefulgram.lazy.coalescer import EditCoalescer
+
+
+class EditCoalescerTestCase(unittest.TestCase):
+    @staticmethod
+    def _get_request(calls: list[str], name: str):
+        async def request() -> str:
+            calls.append(name)
+
+            return name
+
+        return request
+
+    def test_latest_request_is_sent(self):
+        calls: list[str] = []
+
+        async def run() -> list[str]:
+            coalescer = EditCoalescer(window=0.05)
+
+            return await asyncio.gather(*(
+                coalescer.call((1, 1), self._get_request(calls, name))
+                for name in ("first", "second", "third")
+            ))
+
+        results = asyncio.run(run())
+
+        self.assertTrue(calls == ["third"])
+        self.assertTrue(results == ["third", "third", "third"])
+
+    def test_different_messages(self):
+        calls: list[str] = []
+
+        async def run() -> list[str]:
+            coalescer = EditCoalescer(window=0.05)
+
+            return await asyncio.gather(
+                coalescer.call((1, 1), self._get_request(calls, "first")),
+                coalescer.call((1, 2), self._get_request(calls, "second"))
+            )
+
+        results = asyncio.run(run())
+
+        self.assertTrue(sorted(calls) == ["first", "second"])
+        self.assertTrue(results == ["first", "second"])
+
+    def test_next_window(self):
+        calls: list[str] = []
+
+        async def run() -> None:
+            coalescer = EditCoalescer(window=0.01)
+
+            await coalescer.call((1, 1), self._get_request(calls, "first"))
+            await coalescer.call((1, 1), self._get_request(calls, "second"))
+
+            self.assertTrue(len(coalescer) == 0)
+
+        asyncio.run(run())
+
+        self.assertTrue(calls == ["first", "second"])
+
+    def test_error_for_all_callers(self):
+        async def request() -> str:
+            raise RuntimeError("edit error")
+
+        async def run() -> list[object]:
+            coalescer = EditCoalescer(window=0.01)
+
+            return await asyncio.gather(
+                coalescer.call((1, 1), request),
+                coalescer.call((1, 1), request),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+
+        self.assertTrue(all(isinstance(i, RuntimeError) for i in results))
+
+    def test_cancelled_request(self):
+        async def request() -> str:
+            raise asyncio.CancelledError
+
+        async def run() -> tuple[list[object], int]:
+            coalescer = EditCoalescer(window=0.01)
+
+            results = await asyncio.gather(
+                coalescer.call((1, 1), request),
+                coalescer.call((1, 1), request),
+                return_exceptions=True
+            )
+
+            return results, len(coalescer)
+
+        results, pending_count = asyncio.run(
+            asyncio.wait_for(run(), timeout=1)
+        )
+
+        self.assertTrue(
+            all(isinstance(i, asyncio.CancelledError) for i in results)
+        )
+        self.assertTrue(pending_count == 0)
+
+    def test_cancelled_window(self):
+        async def run() -> list[object]:
+            coalescer = EditCoalescer(window=10)
+
+            calls = asyncio.gather(
+                coalescer.call((1, 1), self._get_request([], "first")),
+                return_exceptions=True
+            )
+
+            await asyncio.sleep(0.01)
+
+            for task in coalescer._tasks:
+                task.cancel()
+
+            results = await calls
+
+            self.assertTrue(len(coalescer) == 0)
+
+            return results
+
+        results = asyncio.run(asyncio.wait_for(run(), timeout=1))
+
+        self.assertTrue(isinstance(results[0], asyncio.CancelledError))
+
+
+if __name__ == '__main__':
+    unittest.main()
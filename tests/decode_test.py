@@ -11,6 +11,8 @@ import unittest
 
 from usefulgram.parsing.encode import CallbackData
 from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.parsing.codec import codec_registry, CodecRegistry
+from usefulgram.parsing.temporal import TemporalCodec
 
 from pydantic import BaseModel
 
@@ -53,6 +55,16 @@ class NestedPadanticClass(BaseModel):
     value2: int = 100
 
 
+class PrefixInvestedClass(BaseModel):
+    prefix: Optional[str] = None
+    value: int = 1
+
+
+class NestedWithPrefixClass(BaseModel):
+    class_: PrefixInvestedClass = PrefixInvestedClass()
+    value: int = 2
+
+
 class EnumValueClass(Enum):
     FIRST: int = 1
     SECOND: int = 2
@@ -75,6 +87,10 @@ class OptionalTestClass(BaseModel):
     value: Optional[int]
 
 
+class EnumUnionTestClass(BaseModel):
+    value: Union[EnumValueClass, date, int, str, None]
+
+
 test_date = datetime(year=1999, month=1, day=10, hour=3,
                      minute=30, second=59)
 
@@ -142,6 +158,24 @@ class DecodeTestCase(unittest.TestCase):
 
         self.assertTrue(decode.value == str_value)
 
+    def test_enum_union_value_decode(self):
+        values = (EnumValueClass.THIRD, -15, test_date.date(), "text", None)
+
+        for value in values:
+            callback = CallbackData("prefix", value)
+
+            decode = DecodeCallbackData(callback).to_format(EnumUnionTestClass)
+
+            self.assertTrue(decode.value == value)
+
+    def test_wrong_checked_union_value_decode(self):
+        # It looks like a date, but there is no 13th month
+        callback = CallbackData("prefix", "19991310000000")
+
+        decode = DecodeCallbackData(callback).to_format(EnumUnionTestClass)
+
+        self.assertTrue(decode.value == 19991310000000)
+
     def test_optional_value_decode(self):
         int_value = 1
 
@@ -235,6 +269,106 @@ class DecodeTestCase(unittest.TestCase):
             decode == different_type_values_with_prefix_test_class
         )
 
+    def test_nested_with_prefix_decode(self):
+        nested_class = NestedWithPrefixClass(
+            class_=PrefixInvestedClass(value=5), value=10
+        )
+
+        callback = CallbackData("prefix", nested_class)
+
+        decode = DecodeCallbackData(callback).to_format(NestedWithPrefixClass)
+
+        self.assertTrue(decode.value == 10 and decode.class_.value == 5)
+
+    def test_decode_plan_is_cached(self):
+        first_plan = codec_registry.get_decode_plan(NestedPadanticClass)
+        second_plan = codec_registry.get_decode_plan(NestedPadanticClass)
+
+        self.assertTrue(first_plan is second_plan)
+        self.assertTrue(first_plan.width == 4)
+
+    def test_fixed_temporal_matches_strptime(self):
+        temporal = TemporalCodec()
+
+        value = test_date.strftime("%Y%m%d%H%M%S")
+
+        self.assertTrue(temporal.datetime_to_str(test_date) == value)
+        self.assertTrue(temporal.to_datetime(value) == test_date)
+        self.assertTrue(
+            temporal.time_to_str(test_date.time())
+            == test_date.time().strftime("%Y%m%d%H%M%S")
+        )
+
+    def test_custom_temporal_format_decode(self):
+        registry = CodecRegistry(TemporalCodec("%d.%m.%Y-%H:%M:%S"))
+
+        value = registry.encode_value(datetime_values_test_class)
+
+        decode = registry.decode(DatetimeValuesClass, "prefix", value.split("&"))
+
+        self.assertTrue(value.startswith("10.01.1999-03:30:59"))
+        self.assertTrue(decode == datetime_values_test_class)
+
+    def test_compact_temporal_decode(self):
+        registry = CodecRegistry(TemporalCodec(compact=True))
+
+        old_date = datetime(year=1950, month=5, day=1, hour=23)
+
+        for value in (datetime_values_test_class, DatetimeValuesClass(
+            datetime_value=old_date, date_value=old_date.date(),
+            time_value=old_date.time()
+        )):
+            encoded = registry.encode_value(value)
+
+            decode = registry.decode(
+                DatetimeValuesClass, "prefix", encoded.split("&")
+            )
+
+            self.assertTrue(len(encoded) < 20)
+            self.assertTrue(decode == value)
+
+    def test_compact_temporal_decode_fixed_value(self):
+        registry = CodecRegistry(TemporalCodec(compact=True))
+
+        callback = CallbackData("prefix", datetime_values_test_class)
+
+        decode = registry.decode(
+            DatetimeValuesClass, "prefix", callback.split("/")[1].split("&")
+        )
+
+        self.assertTrue(decode == datetime_values_test_class)
+
+    def test_compact_temporal_union(self):
+        registry = CodecRegistry(TemporalCodec(compact=True))
+
+        test_day = date(2023, 9, 17)
+
+        for obj_type, values in (
+                (Union[date, str], (test_day, "hello", "15", "~", "~1")),
+                (Union[date, int], (test_day, 15, 0, -3)),
+                (str, ("~1", "~~2", "~-3", "text"))
+        ):
+            decoder = registry.get_value_decoder(obj_type)
+
+            for value in values:
+                encoded = registry.encode_value(value)
+
+                self.assertTrue(decoder(encoded) == value)
+                self.assertTrue(type(decoder(encoded)) is type(value))
+
+    def test_lazy_decoder_split(self):
+        decoder = DecodeCallbackData("prefix/text")
+
+        self.assertTrue(decoder._prefix is None)
+        self.assertTrue(decoder.additional == ["text"])
+        self.assertTrue(decoder.prefix == "prefix")
+
+    def test_decoder_without_separator(self):
+        decoder = DecodeCallbackData("other_library_data")
+
+        self.assertTrue(decoder.prefix == "other_library_data")
+        self.assertTrue(decoder.additional == [])
+
 
 if __name__ == '__main__':
     unittest.main()
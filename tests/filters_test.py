@@ -264,6 +264,31 @@ class FilterTestCase(unittest.TestCase):
 
         self.assertFalse(asyncio.run(result))
 
+    def test_decode_is_memoized(self):
+        decoder = self._get_simple_test_decoder()
+
+        first_result = asyncio.run(
+            SimpleData(prefix="some_prefix")(self._test_callback, decoder)
+        )
+
+        second_result = asyncio.run(
+            SimpleData(number=1)(self._test_callback, decoder)
+        )
+
+        self.assertTrue(first_result is second_result)
+        self.assertTrue(
+            decoder.to_format(SimpleData, add_prefix=True)
+            is decoder.to_format(SimpleData, add_prefix=True)
+        )
+
+    def test_decode_error_is_memoized(self):
+        decoder = self._get_simple_test_decoder()
+
+        for _ in range(2):
+            result = InvestedData(value=1)(self._test_callback, decoder)
+
+            self.assertFalse(asyncio.run(result))
+
     def test_prefix_filter(self):
         decoder = self._get_simple_test_decoder()
 
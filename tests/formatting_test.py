@@ -0,0 +1,114 @@
+
+
+import unittest
+
+from types import SimpleNamespace
+from datetime import datetime, timezone
+
+from aiogram import Bot
+from aiogram.client.default import Default, DefaultBotProperties
+from aiogram.types import Message, MessageEntity, Chat
+
+from usefulgram.lazy.formatting import TextFormatter
+
+
+def _get_message(text: str, *entities: MessageEntity) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.now(tz=timezone.utc),
+        chat=Chat(id=1, type="private"),
+        text=text,
+        entities=list(entities) or None
+    )
+
+
+class TextFormatterTestCase(unittest.TestCase):
+    def test_html(self):
+        result = TextFormatter.render(
+            '<b>bold</b> <a href="https://example.com">link</a> &amp;', "HTML"
+        )
+
+        self.assertTrue(result == ("bold link &", (
+            ("bold", 0, 4, None),
+            ("text_link", 5, 4, "https://example.com")
+        )))
+
+    def test_html_pre_language(self):
+        result = TextFormatter.render(
+            '<pre><code class="language-python">x = 1</code></pre>', "HTML"
+        )
+
+        self.assertTrue(result == ("x = 1", (("pre", 0, 5, "python"),)))
+
+    def test_utf16_offsets(self):
+        result = TextFormatter.render("😀 <i>text</i>", "HTML")
+
+        self.assertTrue(result == ("😀 text", (("italic", 3, 4, None),)))
+
+    def test_markdown_v2(self):
+        result = TextFormatter.render(
+            r"*bold* __under__ \. `co\`de`", "MarkdownV2"
+        )
+
+        self.assertTrue(result == ("bold under . co`de", (
+            ("bold", 0, 4, None),
+            ("code", 13, 5, None),
+            ("underline", 5, 5, None)
+        )))
+
+    def test_markdown(self):
+        result = TextFormatter.render(
+            "*bold* [link](https://example.com)", "Markdown"
+        )
+
+        self.assertTrue(result == ("bold link", (
+            ("bold", 0, 4, None),
+            ("text_link", 5, 4, "https://example.com")
+        )))
+
+    def test_unsupported(self):
+        html = TextFormatter.render("<unknown>a</unknown>", "HTML")
+        markdown = TextFormatter.render("*not closed", "MarkdownV2")
+
+        self.assertTrue(html is None)
+        self.assertTrue(markdown is None)
+
+    def test_same_text(self):
+        message = _get_message(
+            "bold @user",
+            MessageEntity(type="bold", offset=0, length=4),
+            MessageEntity(type="mention", offset=5, length=5)
+        )
+
+        self.assertTrue(
+            TextFormatter.is_same_text(message, "<b>bold</b> @user", "HTML")
+        )
+
+        self.assertFalse(
+            TextFormatter.is_same_text(message, "<i>bold</i> @user", "HTML")
+        )
+
+        self.assertFalse(
+            TextFormatter.is_same_text(message, "bold @user", None)
+        )
+
+    def test_parse_mode(self):
+        bot = Bot(
+            "42:TEST", default=DefaultBotProperties(parse_mode="HTML")
+        )
+
+        # The aiogram before 3.4 has the sentinel and bot.parse_mode
+        old_bot = SimpleNamespace(parse_mode="MarkdownV2")
+
+        self.assertTrue(
+            TextFormatter.get_parse_mode(bot, Default("parse_mode")) == "HTML"
+        )
+        self.assertTrue(
+            TextFormatter.get_parse_mode(old_bot, object()) == "MarkdownV2"
+        )
+        self.assertTrue(TextFormatter.get_parse_mode(bot, None) is None)
+        self.assertTrue(TextFormatter.get_parse_mode(bot, "HTML") == "HTML")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,10 @@ from usefulgram.keyboard import (
     Row,
     ReplyRow,
     Builder,
-    ReplyBuilder
+    ReplyBuilder,
+    MarkupFingerprint,
+    KeyboardTemplate,
+    Slot
 )
 
 from usefulgram.parsing.encode import CallbackData
@@ -226,6 +229,110 @@ class KeyboardTestCase(unittest.TestCase):
 
         return self.assertTrue(builder1 == builder2)
 
+    def test_fingerprint(self):
+        markup = Builder(
+            Row(Button("first", prefix="a"), Button("second", prefix="b"))
+        )
+
+        same_markup = InlineKeyboardMarkup(inline_keyboard=[[
+            InlineKeyboardButton(text="first", callback_data="a/"),
+            InlineKeyboardButton(text="second", callback_data="b/")
+        ]])
+
+        other_markup = Builder(
+            Row(Button("first", prefix="a"), Button("second", prefix="c"))
+        )
+
+        fingerprint = MarkupFingerprint.get(markup)
+
+        self.assertTrue(fingerprint == MarkupFingerprint(same_markup))
+        self.assertTrue(fingerprint is MarkupFingerprint.get(markup))
+
+        self.assertTrue(MarkupFingerprint.is_same_markup(same_markup, markup))
+        self.assertFalse(
+            MarkupFingerprint.is_same_markup(other_markup, markup)
+        )
+        self.assertFalse(MarkupFingerprint.is_same_markup(None, markup))
+        self.assertTrue(MarkupFingerprint.is_same_markup(None, None))
+
+    def test_changed_markup(self):
+        markup = Builder(Row(Button("first", prefix="a")))
+        current = Builder(Row(Button("first", prefix="a")))
+
+        self.assertTrue(MarkupFingerprint.is_same_markup(current, markup))
+
+        # The handler changes the same keyboard before the next show
+        markup.inline_keyboard.append([Button("back", prefix="b")])
+
+        self.assertFalse(MarkupFingerprint.is_same_markup(current, markup))
+
+    def test_trusted_button(self):
+        button = Button("text", PrefixTestData(), prefix="prefix")
+        trusted_button = Button.trusted(
+            "text", PrefixTestData(), prefix="prefix"
+        )
+
+        self.assertTrue(button == trusted_button)
+        self.assertTrue(
+            button.model_dump_json(exclude_none=True)
+            == trusted_button.model_dump_json(exclude_none=True)
+        )
+
+        self.assertTrue(
+            Button.trusted(1, PrefixTestData()) == Button(1, PrefixTestData())
+        )
+
+    def test_static_template(self):
+        template = KeyboardTemplate(
+            Row(Button("first", prefix="a"), Button("second", prefix="b")),
+            Row(Button("url", url=self.sample_url))
+        )
+
+        builder = Builder(
+            Row(Button("first", prefix="a"), Button("second", prefix="b")),
+            Row(Button("url", url=self.sample_url))
+        )
+
+        self.assertTrue(template.render() == builder)
+        self.assertTrue(template.render() is template.render())
+
+    def test_template_slots(self):
+        template = KeyboardTemplate(
+            Row(Button("first", prefix="a"), Slot("button")),
+            Slot("rows")
+        )
+
+        result = template.render(
+            button=Button("second", prefix="b"),
+            rows=[
+                Row(Button("third", prefix="c")),
+                Row(Button("fourth", prefix="d"))
+            ]
+        )
+
+        builder = Builder(
+            Row(Button("first", prefix="a"), Button("second", prefix="b")),
+            Row(Button("third", prefix="c")),
+            Row(Button("fourth", prefix="d"))
+        )
+
+        self.assertTrue(result == builder)
+        self.assertTrue(
+            template.render() == Builder(Row(Button("first", prefix="a")))
+        )
+
+        self.assertTrue(self.is_raise_value_exception(
+            template.render, unknown=None
+        ))
+
+        try:
+            template._adjust = 1
+
+            self.assertFalse(True)
+
+        except AttributeError:
+            self.assertTrue(True)
+
 
 if __name__ == '__main__':
     unittest.main()
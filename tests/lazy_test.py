@@ -0,0 +1,263 @@
+
+
+import asyncio
+import unittest
+
+from typing import Any
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from aiogram.types import (
+    CallbackQuery,
+    Message,
+    User,
+    Chat,
+    PhotoSize,
+    MessageEntity,
+    InlineKeyboardMarkup,
+    InlineKeyboardButton
+)
+
+from usefulgram.enums import Const, CallbackAnswerMode
+from usefulgram.lazy import LazyEditor, LazySender
+from usefulgram.lazy.callback_responder import CallbackAnswer
+
+
+class FakeBot:
+    def __init__(self, answer_error: bool = False):
+        self.calls: list[str] = []
+        self.answer_error = answer_error
+
+    async def answer_callback_query(self, **_kwargs: Any) -> bool:
+        self.calls.append("answer")
+
+        if self.answer_error:
+            raise RuntimeError("answer error")
+
+        return True
+
+    async def edit_message_text(self, **_kwargs: Any) -> bool:
+        await asyncio.sleep(0)
+
+        self.calls.append("edit")
+
+        return True
+
+    async def edit_message_caption(self, **_kwargs: Any) -> bool:
+        self.calls.append("edit_caption")
+
+        return True
+
+    async def edit_message_reply_markup(self, **_kwargs: Any) -> bool:
+        self.calls.append("edit_markup")
+
+        return True
+
+    async def send_message(self, **_kwargs: Any) -> bool:
+        await asyncio.sleep(0)
+
+        self.calls.append("send")
+
+        return True
+
+
+def _get_markup(text: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text=text, callback_data=text)
+    ]])
+
+
+def _get_callback(**message_fields: Any) -> CallbackQuery:
+    user = User(id=1, is_bot=False, first_name="user")
+
+    if not message_fields:
+        message_fields = {"text": "old text"}
+
+    message = Message(
+        message_id=1,
+        date=datetime.now(tz=timezone.utc),
+        chat=Chat(id=1, type="private"),
+        from_user=user,
+        **message_fields
+    )
+
+    return CallbackQuery(
+        id="1",
+        from_user=user,
+        chat_instance="1",
+        message=message,
+        data="prefix"
+    )
+
+
+async def _wait_answers() -> None:
+    await asyncio.gather(*CallbackAnswer._tasks)
+
+
+@patch.object(Const, "SECONDS_BETWEEN_OPERATION", 0)
+class CallbackAnswerModeTestCase(unittest.TestCase):
+    @staticmethod
+    async def _edit(bot: FakeBot, answer_mode: CallbackAnswerMode) -> None:
+        editor = LazyEditor(
+            _get_callback(), bot, answer_mode=answer_mode  # type: ignore
+        )
+
+        await editor.edit(text="new text")
+
+        bot.calls.append("returned")
+
+        await _wait_answers()
+
+    def test_inline_editor(self):
+        bot = FakeBot()
+
+        asyncio.run(self._edit(bot, CallbackAnswerMode.INLINE))
+
+        self.assertTrue(bot.calls == ["edit", "answer", "returned"])
+
+    def test_background_editor(self):
+        bot = FakeBot()
+
+        asyncio.run(self._edit(bot, CallbackAnswerMode.BACKGROUND))
+
+        self.assertTrue(bot.calls == ["edit", "returned", "answer"])
+
+    def test_concurrent_editor(self):
+        bot = FakeBot()
+
+        asyncio.run(self._edit(bot, CallbackAnswerMode.CONCURRENT))
+
+        self.assertTrue(bot.calls == ["answer", "edit", "returned"])
+
+    def test_mode_override(self):
+        bot = FakeBot()
+
+        async def send() -> None:
+            sender = LazySender(_get_callback(), bot)  # type: ignore
+
+            await sender.send(
+                text="text", answer_mode=CallbackAnswerMode.BACKGROUND
+            )
+
+            bot.calls.append("returned")
+
+            await _wait_answers()
+
+        asyncio.run(send())
+
+        self.assertTrue(bot.calls == ["send", "returned", "answer"])
+
+    def test_error_handler(self):
+        bot = FakeBot(answer_error=True)
+        errors: list[Exception] = []
+
+        async def send() -> None:
+            sender = LazySender(
+                _get_callback(),
+                bot,  # type: ignore
+                answer_mode=CallbackAnswerMode.BACKGROUND,
+                answer_error_handler=errors.append
+            )
+
+            await sender.send(text="text")
+            await _wait_answers()
+
+        asyncio.run(send())
+
+        self.assertTrue(len(errors) == 1)
+        self.assertTrue(isinstance(errors[0], RuntimeError))
+
+    def test_error_handler_error(self):
+        bot = FakeBot(answer_error=True)
+
+        async def error_handler(_error: Exception) -> None:
+            raise ValueError("handler error")
+
+        async def send() -> list[Any]:
+            sender = LazySender(
+                _get_callback(),
+                bot,  # type: ignore
+                answer_mode=CallbackAnswerMode.BACKGROUND,
+                answer_error_handler=error_handler
+            )
+
+            await sender.send(text="text")
+
+            return await asyncio.gather(*CallbackAnswer._tasks)
+
+        with self.assertLogs(
+                "usefulgram.lazy.callback_responder", level="ERROR"
+        ) as logs:
+            results = asyncio.run(send())
+
+        self.assertTrue(results == [None])
+        self.assertTrue("handler error" in logs.output[0])
+
+
+class ChangeDetectionTestCase(unittest.TestCase):
+    @staticmethod
+    def _edit(callback: CallbackQuery, **kwargs: Any) -> list[str]:
+        bot = FakeBot()
+        editor = LazyEditor(callback, bot)  # type: ignore
+
+        asyncio.run(editor.edit(autoanswer=False, **kwargs))
+
+        return bot.calls
+
+    def test_nothing_changed(self):
+        callback = _get_callback(text="text", reply_markup=_get_markup("a"))
+
+        calls = self._edit(callback, text="text", reply_markup=_get_markup("a"))
+
+        self.assertTrue(calls == [])
+
+    def test_keep_text(self):
+        callback = _get_callback(text="text", reply_markup=_get_markup("a"))
+
+        calls = self._edit(callback, reply_markup=_get_markup("a"))
+
+        self.assertTrue(calls == [])
+
+    def test_only_markup_changed(self):
+        callback = _get_callback(text="text", reply_markup=_get_markup("a"))
+
+        calls = self._edit(callback, text="text", reply_markup=_get_markup("b"))
+
+        self.assertTrue(calls == ["edit_markup"])
+
+    def test_markup_removed(self):
+        callback = _get_callback(text="text", reply_markup=_get_markup("a"))
+
+        calls = self._edit(callback, text="text")
+
+        self.assertTrue(calls == ["edit_markup"])
+
+    def test_same_html_text(self):
+        callback = _get_callback(
+            text="bold", entities=[MessageEntity(type="bold", offset=0, length=4)]
+        )
+
+        calls = self._edit(callback, text="<b>bold</b>", parse_mode="HTML")
+
+        self.assertTrue(calls == [])
+
+    def test_caption(self):
+        callback = _get_callback(
+            photo=[PhotoSize(file_id="1", file_unique_id="1", width=1, height=1)],
+            caption="caption"
+        )
+
+        self.assertTrue(
+            self._edit(callback, text="caption", keep_media=True) == []
+        )
+
+        self.assertTrue(
+            self._edit(callback, text="new caption", keep_media=True)
+            == ["edit_caption"]
+        )
+
+        self.assertTrue(self._edit(callback, text="caption") == ["send"])
+
+
+if __name__ == '__main__':
+    unittest.main()
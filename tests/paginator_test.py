@@ -0,0 +1,120 @@
+
+
+import unittest
+
+from typing import Sequence, Any
+
+from aiogram.types import InlineKeyboardButton
+
+from usefulgram.keyboard import Button
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.utils.paginator import (
+    paginator,
+    PageSource,
+    PaginatorPageButton
+)
+
+
+class CountingSequence(Sequence[int]):
+    def __init__(self, length: int):
+        self.length = length
+        self.accessed = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            result = list(range(*index.indices(self.length)))
+
+            self.accessed += len(result)
+
+            return result
+
+        self.accessed += 1
+
+        return index
+
+
+class ListSource(PageSource):
+    def __init__(self, length: int):
+        self.length = length
+        self.requests: list[tuple[int, int]] = []
+
+    async def count(self) -> int:
+        return self.length
+
+    async def get_items(self, offset: int, limit: int) -> Sequence[Any]:
+        self.requests.append((offset, limit))
+
+        return list(range(offset, min(offset + limit, self.length)))
+
+
+def _get_button(item: int) -> InlineKeyboardButton:
+    return Button(str(item), url="https://example.com")
+
+
+class PaginatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_only_page_items(self):
+        items = CountingSequence(1_000_000)
+
+        markup = await paginator.get_markup(
+            items, 5, _get_button, page_size=10
+        )
+
+        item_rows = markup.inline_keyboard[:-1]
+
+        self.assertTrue(items.accessed == 10)
+        self.assertTrue(
+            [row[0].text for row in item_rows] ==
+            [str(item) for item in range(50, 60)]
+        )
+
+    async def test_page_source(self):
+        source = ListSource(25)
+
+        markup = await paginator.get_markup(
+            source, 2, _get_button, page_size=10, adjust=5
+        )
+
+        self.assertTrue(source.requests == [(20, 10)])
+        self.assertTrue(len(markup.inline_keyboard) == 2)
+        self.assertTrue(markup.inline_keyboard[-1][1].text == "3/3")
+
+    async def test_navigation(self):
+        markup = await paginator.get_markup(
+            list(range(30)), 0, _get_button, page_size=10
+        )
+
+        left, _, right = markup.inline_keyboard[-1]
+
+        left_page = DecodeCallbackData(left.callback_data).to_format(
+            PaginatorPageButton
+        )
+
+        right_page = DecodeCallbackData(right.callback_data).to_format(
+            PaginatorPageButton
+        )
+
+        self.assertTrue(left_page.page == 2)
+        self.assertTrue(right_page.page == 1)
+
+    async def test_correct_page(self):
+        markup = await paginator.get_markup(
+            list(range(30)), 100, _get_button, page_size=10
+        )
+
+        self.assertTrue(markup.inline_keyboard[0][0].text == "20")
+        self.assertTrue(markup.inline_keyboard[-1][1].text == "3/3")
+
+    async def test_single_page(self):
+        markup = await paginator.get_markup(
+            list(range(3)), 0, _get_button, page_size=10
+        )
+
+        self.assertTrue(len(markup.inline_keyboard) == 3)
+        self.assertTrue(markup.inline_keyboard[-1][0].text == "2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+
+
+import os
+import asyncio
+import tempfile
+import unittest
+
+from typing import Optional
+
+from aiogram.types import CallbackQuery
+
+from usefulgram.keyboard import Button
+from usefulgram.exceptions import PrefixCodesAreOver
+from usefulgram.filters import BasePydanticFilter
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.parsing.prefixes import PrefixRegistry, prefix_registry
+
+
+class MenuData(BasePydanticFilter):
+    prefix: str = "main_menu_navigation"
+    page: Optional[int] = None
+
+
+class NoPrefixData(BasePydanticFilter):
+    page: Optional[int] = None
+
+
+class PrefixRegistryTestCase(unittest.TestCase):
+    _test_callback: Optional[CallbackQuery] = None
+
+    def tearDown(self):
+        prefix_registry.clear()
+
+    def test_short_code_in_button(self):
+        prefix_registry.register(MenuData)
+
+        button = Button("text", MenuData(page=2))
+
+        decoder = DecodeCallbackData(button.callback_data)
+
+        self.assertTrue(len(button.callback_data) == 3)
+        self.assertTrue(decoder.prefix == "main_menu_navigation")
+
+    def test_filter_with_short_code(self):
+        prefix_registry.register(MenuData)
+
+        button = Button("text", MenuData(page=2))
+
+        result = MenuData()(
+            self._test_callback, DecodeCallbackData(button.callback_data)
+        )
+
+        self.assertTrue(asyncio.run(result) == {
+            "prefix": "main_menu_navigation", "page": 2
+        })
+
+    def test_prefix_is_code_error(self):
+        prefix_registry.register("some_prefix")
+
+        try:
+            Button("text", prefix="0")
+
+            self.assertFalse(True)
+
+        except ValueError:
+            self.assertTrue(True)
+
+    def test_undefined_prefix_error(self):
+        try:
+            prefix_registry.register(NoPrefixData)
+
+            self.assertFalse(True)
+
+        except ValueError:
+            self.assertTrue(True)
+
+    def test_codes_are_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prefixes.json")
+
+            first_registry = PrefixRegistry(path)
+            first_registry.register("first", "second")
+
+            second_registry = PrefixRegistry(path)
+            second_registry.register("third", "second")
+
+            self.assertTrue(
+                first_registry.to_code("second")
+                == second_registry.to_code("second")
+            )
+
+            self.assertTrue(
+                second_registry.to_code("third")
+                not in (first_registry.to_code("first"),
+                        first_registry.to_code("second"))
+            )
+
+    def test_load_conflict(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prefixes.json")
+
+            PrefixRegistry(path).register("first", "second")
+
+            registry = PrefixRegistry()
+            registry.register("second")
+
+            try:
+                registry.load(path)
+
+                self.assertFalse(True)
+
+            except ValueError:
+                self.assertTrue(True)
+
+            # The registry is not changed by the failed load
+            self.assertTrue(registry.to_code("second") == "0")
+            self.assertTrue(registry.to_prefix("1") == "1")
+
+    def test_load_after_same_register(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "prefixes.json")
+
+            PrefixRegistry(path).register("first", "second")
+
+            registry = PrefixRegistry()
+            registry.register("first")
+            registry.load(path)
+
+            self.assertTrue(registry.to_prefix("1") == "second")
+
+    def test_codes_are_over(self):
+        registry = PrefixRegistry()
+        registry.register(*(f"prefix_{number}" for number in range(3906)))
+
+        try:
+            registry.register("one_more")
+
+            self.assertFalse(True)
+
+        except ValueError as e:
+            self.assertTrue(e is PrefixCodesAreOver)
+
+
+if __name__ == '__main__':
+    unittest.main()
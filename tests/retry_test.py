@@ -0,0 +1,95 @@
+
+
+import time
+import asyncio
+import unittest
+
+from aiogram.methods import SendMessage
+from aiogram.exceptions import TelegramRetryAfter, TelegramNetworkError
+
+from usefulgram.lazy.retry import RetryPolicy
+from usefulgram.lazy.scheduler import OutboundScheduler
+
+
+_METHOD = SendMessage(chat_id=1, text="text")
+
+
+class FailingRequest:
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+
+        if self.errors:
+            raise self.errors.pop(0)
+
+        return "result"
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def test_retry_after(self):
+        request = FailingRequest(
+            TelegramRetryAfter(_METHOD, "", retry_after=0.1)  # type: ignore
+        )
+
+        start = time.monotonic()
+
+        result = asyncio.run(RetryPolicy().call(1, request))
+
+        self.assertTrue(result == "result")
+        self.assertTrue(request.calls == 2)
+        self.assertTrue(time.monotonic() - start >= 0.1)
+
+    def test_network_error(self):
+        request = FailingRequest(
+            TelegramNetworkError(_METHOD, ""), TelegramNetworkError(_METHOD, "")
+        )
+
+        policy = RetryPolicy(backoff_base=0.01)
+
+        self.assertTrue(asyncio.run(policy.call(1, request)) == "result")
+        self.assertTrue(request.calls == 3)
+
+    def test_deadline(self):
+        request = FailingRequest(
+            TelegramRetryAfter(_METHOD, "", retry_after=10)
+        )
+
+        try:
+            asyncio.run(RetryPolicy(deadline=1).call(1, request))
+
+            self.assertFalse(True)
+
+        except TelegramRetryAfter:
+            self.assertTrue(request.calls == 1)
+
+    def test_penalty_pauses_chat(self):
+        scheduler = OutboundScheduler(private_rate=100)
+        finish_times: dict[str, float] = {}
+
+        async def call(name: str, request: FailingRequest) -> None:
+            await RetryPolicy().call(1, request, scheduler)
+
+            finish_times[name] = time.monotonic()
+
+        async def run() -> None:
+            await asyncio.gather(
+                call("flood", FailingRequest(
+                    TelegramRetryAfter(
+                        _METHOD, "", retry_after=0.2  # type: ignore
+                    )
+                )),
+                call("other", FailingRequest())
+            )
+
+        start = time.monotonic()
+
+        asyncio.run(run())
+
+        self.assertTrue(finish_times["other"] - start >= 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+
+
+import asyncio
+import unittest
+
+from typing import Optional
+
+from aiogram.types import CallbackQuery, User
+
+from usefulgram.keyboard import Button
+from usefulgram.routers import PrefixRouter
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.filters import BasePydanticFilter, CallbackPrefixFilter
+
+
+class FirstData(BasePydanticFilter):
+    prefix: str = "first"
+    value: Optional[int] = None
+
+
+class SecondData(BasePydanticFilter):
+    prefix: str = "second"
+    value: Optional[int] = None
+
+
+class AnyData(BasePydanticFilter):
+    value: Optional[int] = None
+
+
+def _get_callback(button: Button) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="user"),
+        chat_instance="1",
+        data=button.callback_data
+    )
+
+
+class RouterTestCase(unittest.TestCase):
+    @staticmethod
+    def _get_router() -> PrefixRouter:
+        router = PrefixRouter()
+
+        @router.callback_query(FirstData(value=2))
+        async def first_two(_callback: CallbackQuery):
+            return "first_two"
+
+        @router.callback_query(AnyData(value=3))
+        async def any_three(_callback: CallbackQuery):
+            return "any_three"
+
+        @router.callback_query(FirstData())
+        async def first(_callback: CallbackQuery, value: int):
+            return f"first_{value}"
+
+        @router.callback_query(CallbackPrefixFilter("second"))
+        async def second(_callback: CallbackQuery):
+            return "second"
+
+        return router
+
+    @staticmethod
+    def _trigger(router: PrefixRouter, button: Button) -> str:
+        callback = _get_callback(button)
+
+        return asyncio.run(router.callback_query.trigger(
+            callback, decoder=DecodeCallbackData(callback.data)
+        ))
+
+    def test_candidates(self):
+        router = self._get_router()
+
+        first_names = [
+            i.callback.__name__
+            for i in router.callback_query.get_candidates("first")
+        ]
+
+        unknown_names = [
+            i.callback.__name__
+            for i in router.callback_query.get_candidates("unknown")
+        ]
+
+        self.assertTrue(first_names == ["first_two", "any_three", "first"])
+        self.assertTrue(unknown_names == ["any_three"])
+
+    def test_registration_order(self):
+        router = self._get_router()
+
+        self.assertTrue(
+            self._trigger(router, Button("", FirstData(value=2))) == "first_two"
+        )
+
+        self.assertTrue(
+            self._trigger(router, Button("", FirstData(value=3))) == "any_three"
+        )
+
+        self.assertTrue(
+            self._trigger(router, Button("", FirstData(value=4))) == "first_4"
+        )
+
+    def test_prefix_filter(self):
+        router = self._get_router()
+
+        self.assertTrue(
+            self._trigger(router, Button("", SecondData(value=4))) == "second"
+        )
+
+    def test_all_handlers_outside_trigger(self):
+        router = self._get_router()
+
+        self.assertTrue(len(router.callback_query.handlers) == 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+
+
+import asyncio
+import unittest
+
+from datetime import datetime, timedelta, timezone
+
+from usefulgram.lazy.scheduler import OutboundScheduler
+from usefulgram.lazy.stable_wait import StableWaiter
+
+
+class OutboundSchedulerTestCase(unittest.TestCase):
+    def test_private_chat(self):
+        scheduler = OutboundScheduler()
+
+        send_times = [scheduler.reserve(1, now=100) for _ in range(3)]
+
+        self.assertTrue(send_times == [100, 101, 102])
+
+    def test_group_chat(self):
+        scheduler = OutboundScheduler(group_burst=20)
+
+        send_times = [scheduler.reserve(-1, now=100) for _ in range(21)]
+
+        self.assertTrue(send_times[19] == 100)
+        self.assertTrue(round(send_times[20], 3) == 103)
+
+    def test_chats_do_not_wait_for_each_other(self):
+        scheduler = OutboundScheduler(global_burst=30)
+
+        first = scheduler.reserve(1, now=100)
+        second = scheduler.reserve(2, now=100)
+
+        self.assertTrue(first == second == 100)
+
+    def test_backlog_does_not_delay_other_chats(self):
+        scheduler = OutboundScheduler()
+
+        group_times = [scheduler.reserve(-100, now=100) for _ in range(3)]
+
+        # Only the first group request is due, it takes the global slot
+        scheduler.reserve_global(now=100)
+
+        self.assertTrue([round(t) for t in group_times] == [100, 103, 106])
+
+        self.assertTrue(scheduler.reserve(5, now=100) == 100)
+        self.assertTrue(scheduler.reserve_global(now=100) < 100.1)
+
+    def test_global_limit(self):
+        scheduler = OutboundScheduler(global_rate=2)
+
+        send_times = [scheduler.reserve_global(now=100) for _ in range(4)]
+
+        self.assertTrue(send_times == [100, 100.5, 101, 101.5])
+
+    def test_refill(self):
+        scheduler = OutboundScheduler()
+
+        scheduler.reserve(1, now=100)
+
+        self.assertTrue(scheduler.reserve(1, now=105) == 105)
+
+    def test_idle_chats_are_removed(self):
+        scheduler = OutboundScheduler(idle_check_seconds=10)
+
+        scheduler.reserve(1, now=100)
+        scheduler.reserve(2, now=100)
+
+        self.assertTrue(len(scheduler) == 2)
+
+        scheduler.reserve(3, now=200)
+
+        self.assertTrue(len(scheduler) == 1)
+
+    def test_call(self):
+        scheduler = OutboundScheduler()
+
+        async def request() -> str:
+            return "result"
+
+        result = asyncio.run(scheduler.call(1, request))
+
+        self.assertTrue(result == "result")
+
+    def test_stable_waiter(self):
+        now = datetime.now(tz=timezone.utc)
+
+        wait_time = StableWaiter.get_stable_wait_time(now)
+        old_wait_time = StableWaiter.get_stable_wait_time(
+            now - timedelta(seconds=1)
+        )
+
+        self.assertTrue(0 < wait_time <= 0.7)
+        self.assertTrue(old_wait_time < 0)
+
+        asyncio.run(StableWaiter.wait(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+
+
+import os
+import time
+import tempfile
+import unittest
+
+from typing import Optional
+
+from usefulgram.keyboard import Button
+from usefulgram.filters import BasePydanticFilter
+from usefulgram.parsing.encode import CallbackData
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.parsing.storage import MemoryPayloadStore, SQLitePayloadStore
+
+
+class LongData(BasePydanticFilter):
+    prefix: str = "long"
+    first: Optional[str] = None
+    second: Optional[str] = None
+
+
+long_data = LongData(first="first" * 10, second="second" * 10)
+
+
+class StorageTestCase(unittest.TestCase):
+    def tearDown(self):
+        CallbackData.set_store(None)
+
+    def test_long_button_without_store(self):
+        try:
+            Button("text", long_data)
+
+            self.assertFalse(True)
+
+        except ValueError:
+            self.assertTrue(True)
+
+    def test_long_button_with_store(self):
+        store = MemoryPayloadStore()
+
+        CallbackData.set_store(store)
+
+        button = Button("text", long_data)
+
+        decode = DecodeCallbackData(button.callback_data).to_format(LongData)
+
+        self.assertTrue(len(button.callback_data.encode()) <= 64)
+        self.assertTrue(decode == long_data)
+        self.assertTrue(store.stats.hits == 1)
+
+    def test_short_button_with_store(self):
+        store = MemoryPayloadStore()
+
+        CallbackData.set_store(store)
+
+        button = Button("text", LongData(first="first"))
+
+        self.assertTrue(button.callback_data == "long/first&")
+        self.assertTrue(len(store) == 0)
+
+    def test_separator_in_value(self):
+        data = LongData(first="/x", second="a/b")
+
+        try:
+            Button("text", data)
+
+            self.assertFalse(True)
+
+        except ValueError:
+            self.assertTrue(True)
+
+        CallbackData.set_store(MemoryPayloadStore())
+
+        button = Button("text", data)
+        decoder = DecodeCallbackData(button.callback_data)
+
+        self.assertTrue(decoder.to_format(LongData) == data)
+        self.assertFalse(decoder.payload_expired)
+
+    def test_same_payload_same_token(self):
+        store = MemoryPayloadStore()
+
+        self.assertTrue(store.put("payload") == store.put("payload"))
+        self.assertTrue(len(store) == 1)
+
+    def test_memory_store_eviction(self):
+        store = MemoryPayloadStore(maxsize=2)
+
+        first_token = store.put("first")
+        store.put("second")
+        store.get(first_token)
+        store.put("third")
+
+        self.assertTrue(store.get(first_token) == "first")
+        self.assertTrue(len(store) == 2)
+        self.assertTrue(store.stats.evictions == 1)
+
+    def test_memory_store_expiration(self):
+        store = MemoryPayloadStore(ttl=0.01)
+
+        token = store.put("payload")
+
+        time.sleep(0.02)
+
+        self.assertTrue(store.get(token) is None)
+        self.assertTrue(store.stats.expirations == 1)
+
+    def test_expired_payload_decode(self):
+        store = MemoryPayloadStore()
+
+        CallbackData.set_store(store)
+
+        button = Button("text", long_data)
+
+        decoder = DecodeCallbackData(
+            button.callback_data, store=MemoryPayloadStore()
+        )
+
+        self.assertTrue(decoder.payload_expired)
+        self.assertTrue(decoder.prefix == "long")
+
+    def test_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payloads.sqlite3")
+
+            store = SQLitePayloadStore(path, maxsize=2)
+            first_token = store.put("first")
+            store.close()
+
+            store = SQLitePayloadStore(path, maxsize=2)
+
+            self.assertTrue(store.get(first_token) == "first")
+            self.assertTrue(store.get("unknown") is None)
+
+            store.put("second")
+            store.put("third")
+
+            self.assertTrue(len(store) == 2)
+
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,432 @@
+
+
+import os
+import time
+import fcntl
+import asyncio
+import hashlib
+import unittest
+import multiprocessing
+
+from typing import Any, Optional
+from uuid import uuid4
+
+from usefulgram.exceptions import RedisResponseError
+from usefulgram.throttling import (
+    MemoryThrottlingBackend,
+    SharedMemoryThrottlingBackend,
+    RedisThrottlingBackend,
+    Cooldown,
+    TokenBucket,
+    SlidingWindowCounter,
+    GCRA
+)
+from usefulgram.throttling.redis_backend import _SCRIPTS
+from usefulgram.throttling.algorithms import State, BaseThrottlingAlgorithm
+
+try:
+    from lupa import lua51
+
+except ImportError:
+    lua51 = None
+
+
+class StandInRedis:
+    """
+    Server with the Redis protocol for the tests. It knows the scripts
+    of the backend and runs the same algorithms in python
+    """
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.scripts: dict[str, type] = {}
+        self.states: dict[bytes, State] = {}
+        self.commands: list[str] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0
+        )
+
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+        count = int((await reader.readuntil(b"\r\n"))[1:-2])
+
+        args = []
+
+        for _ in range(count):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+
+        return args
+
+    def _run_script(self, algorithm_type: type, args: list[bytes]) -> bytes:
+        key = args[1]
+        parameters = [float(arg) for arg in args[3:]]
+
+        algorithm = algorithm_type(*parameters)
+
+        is_allowed, self.states[key] = algorithm.hit(
+            self.states.get(key), time.monotonic()
+        )
+
+        return f":{int(is_allowed)}\r\n".encode()
+
+    def _execute(self, args: list[bytes]) -> bytes:
+        command = args[0].decode().upper()
+
+        self.commands.append(command)
+
+        if command == "AUTH":
+            if args[1].decode() != self.password:
+                return b"-WRONGPASS invalid password\r\n"
+
+            return b"+OK\r\n"
+
+        if command == "SELECT":
+            return b"+OK\r\n"
+
+        if command == "EVAL":
+            script = args[1].decode()
+            script_hash = hashlib.sha1(args[1]).hexdigest()
+
+            for algorithm_type, known_script in _SCRIPTS.items():
+                if known_script == script:
+                    self.scripts[script_hash] = algorithm_type
+
+            return self._run_script(self.scripts[script_hash], args[2:])
+
+        if command == "EVALSHA":
+            algorithm_type = self.scripts.get(args[1].decode())
+
+            if algorithm_type is None:
+                return b"-NOSCRIPT No matching script\r\n"
+
+            return self._run_script(algorithm_type, args[2:])
+
+        return b"-ERR unknown command\r\n"
+
+    async def _handle(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter
+    ) -> None:
+
+        try:
+            while True:
+                args = await self._read_command(reader)
+
+                writer.write(self._execute(args))
+
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+
+async def _hit_times(backend: Any, key: Any, algorithm: Any, times: int):
+    return [await backend.hit(key, algorithm) for _ in range(times)]
+
+
+class MemoryBackendTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_hit(self):
+        backend = MemoryThrottlingBackend()
+
+        results = await _hit_times(backend, 1, TokenBucket(1, burst=2), 3)
+
+        self.assertTrue(results == [True, True, False])
+
+
+class RedisBackendTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StandInRedis(password="secret")
+
+        port = await self.server.start()
+
+        self.backend = RedisThrottlingBackend(
+            port=port, host="127.0.0.1", password="secret", db=1
+        )
+
+    async def asyncTearDown(self):
+        await self.backend.close()
+        await self.server.stop()
+
+    async def test_one_round_trip(self):
+        algorithm = TokenBucket(1, burst=2)
+
+        results = await _hit_times(self.backend, 1, algorithm, 3)
+
+        self.assertTrue(results == [True, True, False])
+
+        # The script is sent once, then every hit is one command
+        self.assertTrue(self.server.commands == [
+            "AUTH", "SELECT", "EVALSHA", "EVAL", "EVALSHA", "EVALSHA"
+        ])
+
+        self.assertTrue(
+            list(self.server.states) == [b"usefulgram:throttling:1"]
+        )
+
+    async def test_concurrent_hits(self):
+        algorithm = GCRA(1, burst=5)
+
+        await self.backend.hit("warm", algorithm)
+
+        results = await asyncio.gather(
+            *(self.backend.hit("user", algorithm) for _ in range(8))
+        )
+
+        self.assertTrue(results.count(True) == 5)
+
+    async def test_all_algorithms(self):
+        algorithms = (
+            Cooldown(10),
+            TokenBucket(0.1),
+            SlidingWindowCounter(1, 10),
+            GCRA(0.1)
+        )
+
+        for number, algorithm in enumerate(algorithms):
+            results = await _hit_times(self.backend, number, algorithm, 2)
+
+            self.assertTrue(results == [True, False])
+
+    async def test_error(self):
+        with self.assertRaises(RedisResponseError):
+            await self.backend._connection.execute("UNKNOWN")
+
+        # The connection works after the error
+        self.assertTrue(await self.backend.hit(1, Cooldown(1)))
+
+    async def test_failed_handshake(self):
+        backend = RedisThrottlingBackend(
+            port=self.backend._connection._port,
+            host="127.0.0.1",
+            password="wrong",
+            db=1
+        )
+
+        for _ in range(2):
+            with self.assertRaises(RedisResponseError):
+                await backend.hit(1, Cooldown(1))
+
+        await backend.close()
+
+        # Every hit tries the handshake again and nothing else is sent
+        self.assertTrue(self.server.commands == ["AUTH", "AUTH"])
+
+
+class LuaRedis:
+    """
+    The redis functions of the scripts for Lua 5.1, the Lua of Redis
+    """
+
+    def __init__(self):
+        self.runtime = lua51.LuaRuntime()
+        self.values: dict[str, str] = {}
+        self.now = 0.0
+
+    def _call(self, command: str, *args: Any) -> Any:
+        if command == "TIME":
+            seconds = int(self.now)
+            microseconds = round((self.now - seconds) * 1_000_000)
+
+            return self.runtime.table(str(seconds), str(microseconds))
+
+        if command == "GET":
+            # Redis gives false to Lua for the missing key
+            return self.values.get(args[0], False)
+
+        if command == "SET":
+            self.values[args[0]] = args[1]
+
+            return "OK"
+
+        raise ValueError(command)
+
+    def hit(self, algorithm: BaseThrottlingAlgorithm, now: float) -> bool:
+        self.now = now
+
+        lua_globals = self.runtime.globals()
+
+        lua_globals.KEYS = self.runtime.table("key")
+        lua_globals.ARGV = self.runtime.table(
+            *(f"{arg}" for arg in (algorithm.ttl, *algorithm.parameters))
+        )
+        lua_globals.redis = self.runtime.table_from({"call": self._call})
+
+        return self.runtime.execute(_SCRIPTS[type(algorithm)]) == 1
+
+
+@unittest.skipIf(lua51 is None, "lupa is not installed")
+class RedisScriptsTestCase(unittest.TestCase):
+    def test_scripts_match_algorithms(self):
+        start = 1_700_000_000
+        offsets = (0, 0, 0.25, 0.5, 1, 1, 1.75, 3, 3, 3, 10, 10.5, 25, 25)
+
+        algorithms = (
+            Cooldown(1),
+            TokenBucket(2, burst=3),
+            SlidingWindowCounter(3, 2),
+            GCRA(1, burst=2)
+        )
+
+        for algorithm in algorithms:
+            lua_redis = LuaRedis()
+            state: Optional[State] = None
+
+            for offset in offsets:
+                is_allowed, state = algorithm.hit(state, start + offset)
+
+                self.assertTrue(
+                    lua_redis.hit(algorithm, start + offset) == is_allowed,
+                    (type(algorithm), offset)
+                )
+
+
+def _hit_in_process(name: str, times: int, results: Any) -> None:
+    backend = SharedMemoryThrottlingBackend(name, capacity=64)
+
+    allowed = asyncio.run(
+        _hit_times(backend, "user", TokenBucket(0.001, burst=10), times)
+    )
+
+    results.put(allowed.count(True))
+
+    asyncio.run(backend.close())
+
+
+class SharedMemoryBackendTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.name = f"usefulgram_test_{uuid4().hex[:8]}"
+        self.backend = SharedMemoryThrottlingBackend(self.name, capacity=64)
+
+    async def asyncTearDown(self):
+        await self.backend.close()
+        self.backend.unlink()
+
+    async def test_shared_limit(self):
+        other_backend = SharedMemoryThrottlingBackend(self.name, capacity=64)
+
+        algorithm = TokenBucket(0.001, burst=2)
+
+        first = await _hit_times(self.backend, 1, algorithm, 1)
+        second = await _hit_times(other_backend, 1, algorithm, 2)
+
+        await other_backend.close()
+
+        self.assertTrue(first + second == [True, True, False])
+
+    async def test_keys(self):
+        algorithm = Cooldown(10)
+
+        results = [
+            await self.backend.hit(key, algorithm)
+            for key in (1, "1", 2, 1)
+        ]
+
+        self.assertTrue(results == [True, True, True, False])
+
+    async def test_full_set(self):
+        backend = SharedMemoryThrottlingBackend(
+            f"{self.name}_small", capacity=2, set_size=2
+        )
+
+        algorithm = Cooldown(10)
+
+        for key in range(3):
+            await backend.hit(key, algorithm)
+
+        # The first key is replaced, so it is new again
+        results = [await backend.hit(key, algorithm) for key in (2, 0)]
+
+        await backend.close()
+        backend.unlink()
+
+        self.assertTrue(results == [False, True])
+
+
+def _hold_lock(lock_path: str, is_locked: Any, is_released: Any) -> None:
+    lock_fd = os.open(lock_path, os.O_RDWR)
+
+    # Zero length locks all the sets
+    fcntl.lockf(lock_fd, fcntl.LOCK_EX)
+
+    is_locked.set()
+    is_released.wait()
+
+    os.close(lock_fd)
+
+
+class SharedMemoryProcessesTestCase(unittest.TestCase):
+    def test_processes(self):
+        name = f"usefulgram_test_{uuid4().hex[:8]}"
+        backend = SharedMemoryThrottlingBackend(name, capacity=64)
+
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+
+        processes = [
+            context.Process(
+                target=_hit_in_process, args=(name, 10, results)
+            )
+            for _ in range(3)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join()
+
+        allowed = sum(results.get() for _ in processes)
+
+        asyncio.run(backend.close())
+        backend.unlink()
+
+        self.assertTrue(allowed == 10)
+
+    def test_locked_set(self):
+        name = f"usefulgram_test_{uuid4().hex[:8]}"
+        backend = SharedMemoryThrottlingBackend(name, capacity=64)
+
+        context = multiprocessing.get_context("fork")
+        is_locked = context.Event()
+        is_released = context.Event()
+
+        process = context.Process(
+            target=_hold_lock,
+            args=(backend._lock_path, is_locked, is_released)
+        )
+
+        process.start()
+        is_locked.wait()
+
+        async def hit_locked() -> tuple[bool, bool]:
+            task = asyncio.create_task(backend.hit(1, Cooldown(1)))
+
+            # The event loop works while the set is locked
+            await asyncio.sleep(0.05)
+            is_waiting = not task.done()
+
+            is_released.set()
+
+            return is_waiting, await task
+
+        result = asyncio.run(hit_locked())
+
+        process.join()
+
+        asyncio.run(backend.close())
+        backend.unlink()
+
+        self.assertTrue(result == (True, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
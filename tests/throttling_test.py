@@ -0,0 +1,239 @@
+
+
+import unittest
+
+from types import SimpleNamespace
+from typing import Any, Optional
+from unittest.mock import patch
+
+from aiogram.types import User, Chat
+
+from usefulgram.enums import ThrottlingKeyType
+from usefulgram.exceptions import Throttling
+from usefulgram.middlewares import ThrottlingMiddleware
+from usefulgram.throttling import (
+    BaseThrottlingAlgorithm,
+    Cooldown,
+    TokenBucket,
+    SlidingWindowCounter,
+    GCRA,
+    ThrottlingStore,
+    ThrottlingPolicy
+)
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.throttling.algorithms import State
+
+
+def _get_results(
+        algorithm: BaseThrottlingAlgorithm,
+        *times: float
+) -> list[bool]:
+
+    state: Optional[State] = None
+    results = []
+
+    for now in times:
+        is_allowed, state = algorithm.hit(state, now)
+        results.append(is_allowed)
+
+    return results
+
+
+class AlgorithmsTestCase(unittest.TestCase):
+    def test_cooldown(self):
+        results = _get_results(Cooldown(1), 0, 0.5, 1.2, 2.5)
+
+        # The throttled event at 0.5 starts the cooldown again
+        self.assertTrue(results == [True, False, False, True])
+
+    def test_token_bucket(self):
+        results = _get_results(
+            TokenBucket(rate=1, burst=3), 0, 0, 0, 0, 1, 1, 5, 5, 5, 5
+        )
+
+        self.assertTrue(results == [
+            True, True, True, False, True, False, True, True, True, False
+        ])
+
+    def test_sliding_window(self):
+        results = _get_results(
+            SlidingWindowCounter(limit=2, window=10), 1, 2, 3, 12, 13, 30
+        )
+
+        # At 13 the events of 1 and 2 are counted as 1.4 events
+        self.assertTrue(results == [True, True, False, True, False, True])
+
+    def test_gcra(self):
+        algorithm = GCRA(rate=1, burst=2)
+
+        results = _get_results(algorithm, 0, 0, 0, 1, 1.5, 3, 3)
+
+        self.assertTrue(
+            results == [True, True, False, True, False, True, True]
+        )
+
+    def test_ttl(self):
+        algorithms = (
+            Cooldown(1),
+            TokenBucket(rate=2, burst=4),
+            SlidingWindowCounter(limit=3, window=5),
+            GCRA(rate=2, burst=4)
+        )
+
+        for algorithm in algorithms:
+            _, state = algorithm.hit(None, 100)
+            _, state = algorithm.hit(state, 100)
+
+            is_allowed, expired_state = algorithm.hit(
+                state, 100 + algorithm.ttl
+            )
+
+            self.assertTrue(is_allowed)
+            self.assertTrue(
+                expired_state == algorithm.hit(None, 100 + algorithm.ttl)[1]
+            )
+
+
+class ThrottlingStoreTestCase(unittest.TestCase):
+    def test_many_users(self):
+        store = ThrottlingStore()
+        algorithm = Cooldown(10)
+
+        for user_id in range(20_000):
+            store.hit(user_id, algorithm, 0)
+
+        # The old cache forgot the users after 10 000
+        self.assertTrue(not store.hit(0, algorithm, 1))
+        self.assertTrue(store.occupancy == 20_000)
+        self.assertTrue(store.evicted == 0)
+
+    def test_expiry(self):
+        store = ThrottlingStore(bucket_seconds=1)
+        algorithm = Cooldown(1.5)
+
+        store.hit(1, algorithm, 0)
+        store.hit(2, algorithm, 0.4)
+
+        self.assertTrue(store.get(1, 1.9) is not None)
+        self.assertTrue(store.occupancy == 2)
+
+        # Both keys are in the bucket of the first second
+        self.assertTrue(store.get(1, 2) is None)
+        self.assertTrue(store.occupancy == 0)
+        self.assertTrue(store.expired == 2)
+
+    def test_hit_moves_key(self):
+        store = ThrottlingStore(bucket_seconds=1)
+        algorithm = Cooldown(1)
+
+        store.hit(1, algorithm, 0)
+        store.hit(1, algorithm, 1.5)
+
+        self.assertTrue(store.get(1, 2.5) == (1.5,))
+        self.assertTrue(store.get(1, 3) is None)
+        self.assertTrue(store.expired == 1)
+
+    def test_maxsize(self):
+        store = ThrottlingStore(maxsize=2, bucket_seconds=1)
+        algorithm = Cooldown(10)
+
+        store.hit(1, algorithm, 0)
+        store.hit(2, algorithm, 1)
+        store.hit(3, algorithm, 2)
+
+        self.assertTrue(store.get(1, 2) is None)
+        self.assertTrue(store.occupancy == 2)
+        self.assertTrue(store.evicted == 1)
+
+
+class ThrottlingMiddlewareTestCase(unittest.IsolatedAsyncioTestCase):
+    @staticmethod
+    async def _handler(_event: Any, _data: dict[str, Any]) -> bool:
+        return True
+
+    async def _call(
+            self,
+            middleware: ThrottlingMiddleware,
+            now: float,
+            user_id: int = 1,
+            **data: Any
+    ):
+
+        data["event_from_user"] = User(
+            id=user_id, is_bot=False, first_name="user"
+        )
+
+        data["event_chat"] = Chat(id=-100, type="group")
+
+        with patch("time.monotonic", return_value=now):
+            return await middleware(self._handler, None, data)
+
+    async def test_default(self):
+        middleware = ThrottlingMiddleware(rate_limit=1)
+
+        self.assertTrue(await self._call(middleware, 0))
+        self.assertTrue(await self._call(middleware, 0.5) is None)
+
+    async def test_algorithm(self):
+        middleware = ThrottlingMiddleware(
+            simple=False, algorithm=TokenBucket(rate=1, burst=2)
+        )
+
+        self.assertTrue(await self._call(middleware, 0))
+        self.assertTrue(await self._call(middleware, 0))
+
+        with self.assertRaises(Throttling):
+            await self._call(middleware, 0)
+
+    async def test_prefix_policies(self):
+        middleware = ThrottlingMiddleware(
+            rate_limit=1,
+            prefix_policies={"menu": ThrottlingPolicy(None)}
+        )
+
+        menu = DecodeCallbackData("menu/1")
+        other = DecodeCallbackData("other/1")
+
+        for _ in range(3):
+            self.assertTrue(await self._call(middleware, 0, decoder=menu))
+
+        self.assertTrue(await self._call(middleware, 0, decoder=other))
+        self.assertTrue(await self._call(middleware, 0) is None)
+
+    async def test_flag_policies(self):
+        middleware = ThrottlingMiddleware(
+            rate_limit=0.1,
+            prefix_policies={"report": ThrottlingPolicy(None)},
+            flag_policies={"reports": ThrottlingPolicy(GCRA(rate=1 / 60))}
+        )
+
+        handler = SimpleNamespace(flags={"throttling": "reports"})
+        decoder = DecodeCallbackData("report/1")
+
+        # The flag is more important than the prefix
+        results = [
+            await self._call(middleware, now, handler=handler, decoder=decoder)
+            for now in (0, 30, 61)
+        ]
+
+        self.assertTrue(results == [True, None, True])
+
+        # The other policies have the own state
+        self.assertTrue(await self._call(middleware, 61.05))
+
+    async def test_chat_key(self):
+        middleware = ThrottlingMiddleware(
+            rate_limit=1, key_type=ThrottlingKeyType.CHAT
+        )
+
+        self.assertTrue(await self._call(middleware, 0, user_id=1))
+        self.assertTrue(await self._call(middleware, 0, user_id=2) is None)
+
+        user_middleware = ThrottlingMiddleware(rate_limit=1)
+
+        self.assertTrue(await self._call(user_middleware, 0, user_id=1))
+        self.assertTrue(await self._call(user_middleware, 0, user_id=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,8 @@ from . import filters
 from . import middlewares
 from . import exceptions
 from . import enums
+from . import routers
+from . import throttling
 
 
 __all__ = (
@@ -13,5 +15,7 @@ __all__ = (
     "keyboard",
     "filters",
     "middlewares",
-    "exceptions"
+    "exceptions",
+    "routers",
+    "throttling"
 )
@@ -2,3 +2,5 @@
 
 from .const import Const
 from .calendar import CalendarEnum
+from .callback_answer import CallbackAnswerMode
+from .throttling import ThrottlingKeyType
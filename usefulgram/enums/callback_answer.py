@@ -0,0 +1,14 @@
+
+
+from enum import Enum
+
+
+class CallbackAnswerMode(Enum):
+    # Wait and answer inside the handler
+    INLINE = "inline"
+
+    # Answer after the delay in a background task
+    BACKGROUND = "background"
+
+    # Answer in a background task together with the edit or send
+    CONCURRENT = "concurrent"
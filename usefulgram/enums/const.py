@@ -1,12 +1,46 @@
 
 
 from typing import Final
+from datetime import date
 
 
 class Const:
     DATETIME_FORMAT: Final[str] = "%Y%m%d%H%M%S"
 
+    COMPACT_TEMPORAL_EPOCH: Final[date] = date(2000, 1, 1)
+    COMPACT_TEMPORAL_BASE: Final[int] = 62
+
+    CALLBACK_DATA_MAX_BYTES: Final[int] = 64
+
+    PAYLOAD_TOKEN_BYTES: Final[int] = 8
+    PAYLOAD_STORE_MAXSIZE: Final[int] = 100_000
+    PAYLOAD_STORE_TTL: Final[float] = 7 * 24 * 60 * 60
+
     ALLOW_EDITING_DELTA: Final[int] = 47
     SECONDS_BETWEEN_OPERATION: Final[int] = 1
 
     STABLE_WAIT_TIME_SECONDS: Final[float] = 0.7
+
+    PRIVATE_CHAT_MESSAGES_PER_SECOND: Final[float] = 1
+    GROUP_CHAT_MESSAGES_PER_SECOND: Final[float] = 20 / 60
+    GLOBAL_MESSAGES_PER_SECOND: Final[float] = 30
+    SCHEDULER_IDLE_CHECK_SECONDS: Final[float] = 60
+
+    RETRY_DEADLINE_SECONDS: Final[float] = 60
+    RETRY_BACKOFF_BASE_SECONDS: Final[float] = 0.5
+    RETRY_BACKOFF_MAX_SECONDS: Final[float] = 10
+
+    EDIT_COALESCE_WINDOW_SECONDS: Final[float] = 0.3
+
+    FORMATTED_TEXT_CACHE_SIZE: Final[int] = 1024
+    MARKUP_FINGERPRINT_CACHE_SIZE: Final[int] = 1024
+
+    PAGINATOR_PAGE_SIZE: Final[int] = 10
+
+    CALENDAR_CACHE_SIZE: Final[int] = 256
+
+    THROTTLING_BUCKET_SECONDS: Final[float] = 1
+    SHARED_THROTTLING_CAPACITY: Final[int] = 1 << 18
+    SHARED_THROTTLING_SET_SIZE: Final[int] = 8
+    SHARED_THROTTLING_LOCK_RETRY_SECONDS: Final[float] = 0.001
+    REDIS_THROTTLING_PREFIX: Final[str] = "usefulgram:throttling:"
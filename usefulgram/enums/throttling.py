@@ -0,0 +1,11 @@
+
+
+from enum import Enum
+
+
+class ThrottlingKeyType(Enum):
+    # Every user has own limit
+    USER = "user"
+
+    # The users of the chat share the limit
+    CHAT = "chat"
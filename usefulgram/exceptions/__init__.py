@@ -5,6 +5,7 @@ from .exceptions import (
     UnknownButtonType,
     NoOneButtonParamIsFilled,
     TooMoreCharacters,
+    SeparatorInCallbackData,
     RecursionObjectParse,
     WrongObjectType,
     CantEditMedia,
@@ -14,5 +15,14 @@ from .exceptions import (
     UndefinedMagicFilterModel,
     UndefinedType,
     CallbackEventWasNotGiven,
-    Throttling
+    UndefinedPrefix,
+    PrefixIsCode,
+    PrefixCodeConflict,
+    PrefixCodesAreOver,
+    UnknownSlot,
+    UnknownThrottlingAlgorithm,
+    SharedMemoryIsUnavailable,
+    SharedMemoryIsTooSmall,
+    Throttling,
+    RedisResponseError
 )
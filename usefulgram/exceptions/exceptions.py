@@ -11,6 +11,11 @@ TooMoreCharacters = ValueError(
     "(~62 or less characters because separator)"
 )
 
+SeparatorInCallbackData = ValueError(
+    "The callback data values cannot contain the separator "
+    "without the payload store"
+)
+
 RecursionObjectParse = ValueError("Now objects cannot contain objects")
 
 WrongObjectType = ValueError("Wrong object type in the decode")
@@ -29,6 +34,34 @@ UndefinedType = ValueError("Error event type in a middleware")
 
 CallbackEventWasNotGiven = ValueError("Callback event was not given to decoder")
 
+UndefinedPrefix = ValueError("The filter has no default prefix")
+
+PrefixIsCode = ValueError(
+    "The prefix is the same as a code of a registered prefix"
+)
+
+PrefixCodeConflict = ValueError(
+    "The saved prefix codes conflict with the registered prefixes"
+)
+
+PrefixCodesAreOver = ValueError(
+    "All the short prefix codes are used, register fewer prefixes"
+)
+
+UnknownSlot = ValueError("The keyboard template has no slot with this name")
+
+UnknownThrottlingAlgorithm = ValueError(
+    "The throttling backend has no script for this algorithm"
+)
+
+SharedMemoryIsUnavailable = ValueError(
+    "The shared memory throttling backend needs fcntl, it is Unix only"
+)
+
+SharedMemoryIsTooSmall = ValueError(
+    "The shared memory segment is smaller than the throttling table"
+)
+
 
 class Throttling(Exception):
     def __init__(self):
@@ -36,3 +69,9 @@ class Throttling(Exception):
 
         super().__init__(self.message)
 
+
+class RedisResponseError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+        super().__init__(self.message)
@@ -12,6 +12,7 @@ from aiogram.filters.magic_data import MagicData
 from aiogram.utils.magic_filter import MagicFilter
 
 from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.parsing.codec import codec_registry
 from usefulgram.exceptions import UndefinedMagicFilterModel
 
 
@@ -100,13 +101,13 @@ class _BaseDataclassesFilter(_BaseMagicFilter, ABC):
             if await self._ckeck_magic_filter(
                 callback=callback,
                 magic_filter=magic_filter,
-                model=decoder.class_to_dict(callback_data_model)
+                model=decoder.to_dict(type(self))
             ):
-                return decoder.class_to_dict(callback_data_model)
+                return decoder.to_dict(type(self))
 
             return False
 
-        return decoder.class_to_dict(callback_data_model)
+        return decoder.to_dict(type(self))
 
 
 class BasePydanticFilter(_BaseDataclassesFilter, BaseModel, BaseFilter):
@@ -118,7 +119,7 @@ class BasePydanticFilter(_BaseDataclassesFilter, BaseModel, BaseFilter):
             decoder: DecodeCallbackData
     ) -> Union[bool, Dict[str, Any]]:
 
-        fields = self.model_fields.keys()
+        fields = codec_registry.get_field_names(type(self))
 
         return await self.get_filter(
             callback=callback,
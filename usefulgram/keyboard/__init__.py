@@ -3,3 +3,5 @@
 from .builder import Builder, ReplyBuilder
 from .rows import Row, ReplyRow
 from .buttons import Button, ReplyButton
+from .fingerprint import MarkupFingerprint
+from .template import KeyboardTemplate, Slot
@@ -17,6 +17,12 @@ from aiogram.types import (
 from usefulgram.parsing.encode import CallbackData
 
 
+# The default values and the private attributes of the button classes
+_trusted_prototypes: dict[
+    type, tuple[dict[str, Any], Optional[dict[str, Any]]]
+] = {}
+
+
 class Button(InlineKeyboardButton):
     def __init__(
             self,
@@ -57,6 +63,91 @@ class Button(InlineKeyboardButton):
             switch_inline_query_current_chat=switch_inline_query_current_chat,
         )
 
+    @classmethod
+    def trusted(
+            cls,
+            text: Union[str, int],
+            *args: Any,
+            prefix: Optional[str] = None,
+            separator: str = "/"
+    ) -> "Button":
+        """
+        Fast callback button without the pydantic validation.
+        The callback data is made by CallbackData, so it is always correct
+        :param text:
+        :param args: callback data objects
+        :param prefix:
+        :param separator:
+        :return:
+        """
+
+        prefix = cls._get_prefix(prefix, args)
+
+        if isinstance(text, int):
+            text = str(text)
+
+        if prefix is not None:
+            callback_data = CallbackData(prefix, *args, separator=separator)
+            fields_set = {"text", "callback_data"}
+
+        else:
+            callback_data = None
+            fields_set = {"text"}
+
+        default_values, private_values = cls._get_trusted_prototype()
+
+        values = default_values.copy()
+        values["text"] = text
+        values["callback_data"] = callback_data
+
+        # It is what model_construct does, but the default values
+        # are resolved once for the class, not for every button
+        button = cls.__new__(cls)
+
+        set_attr = object.__setattr__
+
+        set_attr(button, "__dict__", values)
+        set_attr(button, "__pydantic_fields_set__", fields_set)
+        set_attr(button, "__pydantic_extra__", cls._get_trusted_extra())
+        set_attr(
+            button,
+            "__pydantic_private__",
+            None if private_values is None else private_values.copy()
+        )
+
+        return button
+
+    @classmethod
+    def _get_trusted_prototype(
+            cls
+    ) -> tuple[dict[str, Any], Optional[dict[str, Any]]]:
+
+        prototype = _trusted_prototypes.get(cls)
+
+        if prototype is not None:
+            return prototype
+
+        empty_button = cls.model_construct()
+
+        # The fields keep the order of the model, so the json is the same
+        default_values = {
+            name: empty_button.__dict__.get(name)
+            for name in cls.model_fields
+        }
+
+        prototype = (default_values, empty_button.__pydantic_private__)
+
+        _trusted_prototypes[cls] = prototype
+
+        return prototype
+
+    @classmethod
+    def _get_trusted_extra(cls) -> Optional[dict[str, Any]]:
+        if cls.model_config.get("extra") == "allow":
+            return {}
+
+        return None
+
     @staticmethod
     def _get_prefix(prefix: Optional[str], args: tuple[Any, ...]) -> Optional[str]:
         if prefix is not None:
@@ -0,0 +1,84 @@
+
+
+from typing import Any, Optional
+
+from cachetools import LRUCache
+
+from aiogram.types import InlineKeyboardMarkup
+
+from usefulgram.enums import Const
+
+
+class MarkupFingerprint:
+    """
+    Structural key of the inline keyboard: the tuples of the button fields.
+    The hash is counted once, so the different keyboards
+    are compared by the number and only the equal hashes
+    compare the fields, without the pydantic models comparison
+    """
+
+    __slots__ = ("_key", "_hash")
+
+    _key: tuple[tuple[tuple[Any, ...], ...], ...]
+    _hash: int
+
+    _cache: LRUCache = LRUCache(maxsize=Const.MARKUP_FINGERPRINT_CACHE_SIZE)
+
+    def __init__(self, markup: InlineKeyboardMarkup):
+        self._key = tuple(
+            tuple(tuple(button.__dict__.values()) for button in row)
+            for row in markup.inline_keyboard
+        )
+
+        self._hash = hash(self._key)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MarkupFingerprint):
+            return NotImplemented
+
+        return self._hash == other._hash and self._key == other._key
+
+    @classmethod
+    def get(cls, markup: InlineKeyboardMarkup) -> "MarkupFingerprint":
+        """
+        Get the fingerprint from the cache. It is useful for the keyboards
+        which are built once and shown many times.
+        The keyboard must not be changed after the first call
+        """
+
+        cached: Optional[tuple[InlineKeyboardMarkup, MarkupFingerprint]]
+
+        cached = cls._cache.get(id(markup))
+
+        # The cache keeps the keyboard alive, so its id is not reused
+        if cached is not None:
+            return cached[1]
+
+        fingerprint = cls(markup)
+
+        cls._cache[id(markup)] = (markup, fingerprint)
+
+        return fingerprint
+
+    @staticmethod
+    def is_same_markup(
+            current: Optional[InlineKeyboardMarkup],
+            new: Optional[InlineKeyboardMarkup]
+    ) -> bool:
+        """
+        The fingerprints are not cached, the keyboard can be changed
+        by the handler between the shows
+        :param current: keyboard of the message
+        :param new: keyboard which is shown
+        """
+
+        if current is None or new is None:
+            return current is new
+
+        if current is new:
+            return True
+
+        return MarkupFingerprint(current) == MarkupFingerprint(new)
@@ -7,6 +7,8 @@ from aiogram.types import (
 
 
 class Row:
+    __slots__ = ("rows",)
+
     rows: list[InlineKeyboardButton]
 
     def __init__(self, *args: InlineKeyboardButton):
@@ -17,6 +19,8 @@ class Row:
 
 
 class ReplyRow:
+    __slots__ = ("rows",)
+
     rows: list[KeyboardButton]
 
     def __init__(self, *args: KeyboardButton):
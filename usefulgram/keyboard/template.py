@@ -0,0 +1,204 @@
+
+
+from typing import Optional, Union, Any, Sequence
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from usefulgram.exceptions import UnknownSlot
+from usefulgram.keyboard.rows import Row
+from usefulgram.keyboard.builder import BaseBuilder
+
+
+SlotValue = Union[
+    InlineKeyboardButton,
+    Row,
+    Sequence[Union[InlineKeyboardButton, Row]],
+    None
+]
+
+
+class Slot:
+    """
+    Dynamic part of the keyboard template.
+    In the row it is replaced by the buttons,
+    outside of the rows it is replaced by the rows
+    """
+
+    __slots__ = ("name",)
+
+    name: str
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+_TemplateRow = tuple[Union[InlineKeyboardButton, Slot], ...]
+
+
+class KeyboardTemplate:
+    """
+    Inline keyboard which is declared once.
+    The static buttons are validated once, the slots are filled
+    on every render without validation of the rest of the keyboard.
+    The keyboard without the slots is built once and the same object
+    is returned every time.
+
+    The json of the keyboard is not cached: aiogram serializes
+    the markup object of the request itself, so the ready json
+    could not be sent
+    """
+
+    __slots__ = ("_rows", "_adjust", "_slot_names", "_markup")
+
+    _rows: tuple[Union[_TemplateRow, Slot], ...]
+    _adjust: Optional[int]
+    _slot_names: frozenset[str]
+    _markup: Optional[InlineKeyboardMarkup]
+
+    def __init__(
+            self,
+            *rows: Union[Row, Slot],
+            adjust: Optional[int] = None
+    ):
+
+        template_rows: list[Union[_TemplateRow, Slot]] = []
+        slot_names: set[str] = set()
+
+        for row in rows:
+            if isinstance(row, Slot):
+                template_rows.append(row)
+                slot_names.add(row.name)
+
+                continue
+
+            template_row: list[Union[InlineKeyboardButton, Slot]] = []
+
+            for button in row.get_rows():
+                if isinstance(button, Slot):
+                    slot_names.add(button.name)
+
+                template_row.append(button)
+
+            template_rows.append(tuple(template_row))
+
+        set_attr = super().__setattr__
+
+        set_attr("_rows", tuple(template_rows))
+        set_attr("_adjust", adjust)
+        set_attr("_slot_names", frozenset(slot_names))
+        set_attr("_markup", None)
+
+        if not slot_names:
+            set_attr("_markup", self._get_markup(self._get_buttons({})))
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("KeyboardTemplate is frozen")
+
+    @property
+    def slot_names(self) -> frozenset[str]:
+        return self._slot_names
+
+    @staticmethod
+    def _get_slot_buttons(
+            value: SlotValue
+    ) -> list[InlineKeyboardButton]:
+
+        if value is None:
+            return []
+
+        if isinstance(value, InlineKeyboardButton):
+            values: Sequence[Any] = (value,)
+
+        elif isinstance(value, Row):
+            values = value.get_rows()
+
+        else:
+            values = value
+
+        result: list[InlineKeyboardButton] = []
+
+        for item in values:
+            if isinstance(item, Row):
+                result.extend(KeyboardTemplate._get_slot_buttons(item))
+
+            else:
+                result.append(item)
+
+        return result
+
+    @staticmethod
+    def _get_slot_rows(
+            value: SlotValue
+    ) -> list[list[InlineKeyboardButton]]:
+
+        if value is None:
+            return []
+
+        if isinstance(value, InlineKeyboardButton):
+            return [[value]]
+
+        if isinstance(value, Row):
+            return [KeyboardTemplate._get_slot_buttons(value)]
+
+        result: list[list[InlineKeyboardButton]] = []
+
+        for item in value:
+            result.extend(KeyboardTemplate._get_slot_rows(item))
+
+        return result
+
+    def _check_slots(self, slots: dict[str, SlotValue]) -> None:
+        if not self._slot_names.issuperset(slots):
+            raise UnknownSlot
+
+    def _get_buttons(
+            self,
+            slots: dict[str, SlotValue]
+    ) -> list[list[InlineKeyboardButton]]:
+
+        result: list[list[InlineKeyboardButton]] = []
+
+        for row in self._rows:
+            if isinstance(row, Slot):
+                result.extend(self._get_slot_rows(slots.get(row.name)))
+
+                continue
+
+            result_row: list[InlineKeyboardButton] = []
+
+            for button in row:
+                if isinstance(button, Slot):
+                    result_row.extend(
+                        self._get_slot_buttons(slots.get(button.name))
+                    )
+
+                else:
+                    result_row.append(button)
+
+            # The row of the empty slots is not shown
+            if result_row:
+                result.append(result_row)
+
+        return BaseBuilder._get_different_keyboar(result, self._adjust)
+
+    @staticmethod
+    def _get_markup(
+            buttons: list[list[InlineKeyboardButton]]
+    ) -> InlineKeyboardMarkup:
+
+        # The buttons are already validated
+        return InlineKeyboardMarkup.model_construct(inline_keyboard=buttons)
+
+    def render(self, **slots: SlotValue) -> InlineKeyboardMarkup:
+        """
+        :param slots: buttons or rows for the slots by the slot names,
+        None or missing slot is empty
+        :return: keyboard
+        """
+
+        self._check_slots(slots)
+
+        if self._markup is not None:
+            return self._markup
+
+        return self._get_markup(self._get_buttons(slots))
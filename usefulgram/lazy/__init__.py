@@ -2,3 +2,6 @@
 
 from .lazy_editor import LazyEditor
 from .lazy_sender import LazySender
+from .scheduler import OutboundScheduler, outbound_scheduler
+from .retry import RetryPolicy
+from .coalescer import EditCoalescer
@@ -1,14 +1,26 @@
 
 
 import asyncio
-from typing import Optional
+import inspect
+import logging
+
+from typing import Optional, Callable, Any
 
 from aiogram import Bot
 
 from usefulgram.enums.const import Const
+from usefulgram.enums.callback_answer import CallbackAnswerMode
+
+
+logger = logging.getLogger(__name__)
+
+AnswerErrorHandler = Callable[[Exception], Any]
 
 
 class CallbackAnswer:
+    # The event loop keeps only weak references to the tasks
+    _tasks: set["asyncio.Task[Optional[bool]]"] = set()
+
     @staticmethod
     async def auto_callback_answer(
             bot: Bot,
@@ -28,3 +40,137 @@ class CallbackAnswer:
             text=answer_text,
             show_alert=answer_show_alert
         )
+
+    @staticmethod
+    async def _handle_error(
+            error: Exception,
+            error_handler: Optional[AnswerErrorHandler]
+    ) -> None:
+
+        if error_handler is None:
+            logger.exception("Callback answer error", exc_info=error)
+
+            return
+
+        # The answer is in the background task, nobody else gets the error
+        try:
+            result = error_handler(error)
+
+            if inspect.isawaitable(result):
+                await result
+
+        except Exception as handler_error:
+            logger.exception(
+                "Callback answer error handler error", exc_info=handler_error
+            )
+
+    @staticmethod
+    async def _background_callback_answer(
+            bot: Bot,
+            callback_id: str,
+            answer_text: Optional[str],
+            answer_show_alert: bool,
+            delay: float,
+            error_handler: Optional[AnswerErrorHandler]
+    ) -> Optional[bool]:
+
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            return await bot.answer_callback_query(
+                callback_query_id=callback_id,
+                text=answer_text,
+                show_alert=answer_show_alert
+            )
+
+        except Exception as error:
+            await CallbackAnswer._handle_error(error, error_handler)
+
+            return None
+
+    @staticmethod
+    def schedule_callback_answer(
+            bot: Bot,
+            callback_id: str,
+            autoanswer: bool = True,
+            answer_text: Optional[str] = None,
+            answer_show_alert: bool = False,
+            delay: float = Const.SECONDS_BETWEEN_OPERATION,
+            error_handler: Optional[AnswerErrorHandler] = None
+    ) -> Optional["asyncio.Task[Optional[bool]]"]:
+        """
+        Answer the callback in a background task, so the handler
+        does not wait for it
+        :param bot:
+        :param callback_id:
+        :param autoanswer:
+        :param answer_text:
+        :param answer_show_alert:
+        :param delay: seconds before the answer
+        :param error_handler: gets the answer exception,
+        it can be a function or a coroutine function.
+        Without it the exception is logged
+        :return: the task or None if autoanswer is False
+        """
+
+        if not autoanswer:
+            return None
+
+        task = asyncio.create_task(
+            CallbackAnswer._background_callback_answer(
+                bot=bot,
+                callback_id=callback_id,
+                answer_text=answer_text,
+                answer_show_alert=answer_show_alert,
+                delay=delay,
+                error_handler=error_handler
+            )
+        )
+
+        CallbackAnswer._tasks.add(task)
+        task.add_done_callback(CallbackAnswer._tasks.discard)
+
+        return task
+
+    @staticmethod
+    async def answer_by_mode(
+            bot: Bot,
+            callback_id: str,
+            answer_mode: CallbackAnswerMode,
+            autoanswer: bool = True,
+            answer_text: Optional[str] = None,
+            answer_show_alert: bool = False,
+            error_handler: Optional[AnswerErrorHandler] = None
+    ) -> None:
+        """
+        CONCURRENT mode should be called before the edit or send,
+        the other modes after it
+        """
+
+        if answer_mode is CallbackAnswerMode.INLINE:
+            await CallbackAnswer.auto_callback_answer(
+                bot=bot,
+                callback_id=callback_id,
+                autoanswer=autoanswer,
+                answer_text=answer_text,
+                answer_show_alert=answer_show_alert
+            )
+
+            return
+
+        if answer_mode is CallbackAnswerMode.BACKGROUND:
+            delay: float = Const.SECONDS_BETWEEN_OPERATION
+
+        else:
+            delay = 0
+
+        CallbackAnswer.schedule_callback_answer(
+            bot=bot,
+            callback_id=callback_id,
+            autoanswer=autoanswer,
+            answer_text=answer_text,
+            answer_show_alert=answer_show_alert,
+            delay=delay,
+            error_handler=error_handler
+        )
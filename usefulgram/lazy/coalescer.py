@@ -0,0 +1,98 @@
+
+
+import asyncio
+
+from typing import Any, Hashable
+
+from usefulgram.enums import Const
+from usefulgram.lazy.scheduler import RequestFactory, T
+
+
+def _retrieve_exception(future: "asyncio.Future[Any]") -> None:
+    # The callers can be gone, then the error is not logged as unretrieved
+    if not future.cancelled():
+        future.exception()
+
+
+class _PendingEdit:
+    __slots__ = ("request", "future")
+
+    request: RequestFactory[Any]
+    future: "asyncio.Future[Any]"
+
+    def __init__(self, request: RequestFactory[Any]):
+        self.request = request
+        self.future = asyncio.get_running_loop().create_future()
+        self.future.add_done_callback(_retrieve_exception)
+
+
+class EditCoalescer:
+    """
+    Collapses the edits of the same message: the first edit waits
+    for the window, the next ones replace its request.
+    Only the latest request is sent and all the callers get its result
+    """
+
+    window: float
+
+    _pending: dict[Hashable, _PendingEdit]
+    _tasks: set["asyncio.Task[None]"]
+
+    def __init__(self, window: float = Const.EDIT_COALESCE_WINDOW_SECONDS):
+        self.window = window
+
+        self._pending = {}
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def _send(self, key: Hashable) -> None:
+        pending = self._pending[key]
+
+        try:
+            await asyncio.sleep(self.window)
+
+            # The edits after this point wait for the next window
+            del self._pending[key]
+
+            result = await pending.request()
+
+        except Exception as error:
+            pending.future.set_exception(error)
+
+        else:
+            pending.future.set_result(result)
+
+        finally:
+            # The task is cancelled, the callers must not wait forever
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+
+            if not pending.future.done():
+                pending.future.cancel()
+
+    async def call(self, key: Hashable, request: RequestFactory[T]) -> T:
+        """
+        :param key: chat id and message id
+        :param request: edit request factory
+        :return: the result of the latest request in the window
+        """
+
+        pending = self._pending.get(key)
+
+        if pending is None:
+            pending = _PendingEdit(request)
+
+            self._pending[key] = pending
+
+            task = asyncio.create_task(self._send(key))
+
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        else:
+            pending.request = request
+
+        # One cancelled caller does not cancel the edit for the others
+        return await asyncio.shield(pending.future)
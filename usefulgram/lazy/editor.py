@@ -1,4 +1,5 @@
 
+from functools import partial
 from typing import Optional, Union, Coroutine, Any
 
 from aiogram.types import (
@@ -13,21 +14,25 @@ from aiogram.types import (
 from aiogram import Bot
 
 from usefulgram.exceptions import CantEditMedia
+from usefulgram.lazy.scheduler import OutboundScheduler, RequestFactory
+from usefulgram.lazy.retry import RetryPolicy, call_request
+from usefulgram.lazy.coalescer import EditCoalescer
 
 
 class MessageEditor:
     @staticmethod
-    def edit(
+    def _get_request(
             bot: Bot,
             chat_id: int,
             message_id: int,
-            text: Optional[str] = None,
-            photo: Optional[FSInputFile] = None,
-            video: Optional[FSInputFile] = None,
-            reply_markup: Optional[InlineKeyboardMarkup] = None,
-            parse_mode: Union[str] = UNSET_PARSE_MODE,
-            disable_web_page_preview: bool = False
-    ) -> Coroutine[Any, Any, Union[Message, bool]]:
+            text: Optional[str],
+            is_caption: bool,
+            photo: Optional[FSInputFile],
+            video: Optional[FSInputFile],
+            reply_markup: Optional[InlineKeyboardMarkup],
+            parse_mode: Union[str],
+            disable_web_page_preview: bool
+    ) -> RequestFactory[Union[Message, bool]]:
 
         if photo or video:
             media: Union[InputMediaVideo, InputMediaPhoto]
@@ -49,7 +54,8 @@ class MessageEditor:
             else:
                 raise CantEditMedia
 
-            return bot.edit_message_media(
+            return partial(
+                bot.edit_message_media,
                 chat_id=chat_id,
                 message_id=message_id,
                 media=media,
@@ -57,17 +63,73 @@ class MessageEditor:
             )
 
         if text is None:
-            return bot.edit_message_reply_markup(
+            return partial(
+                bot.edit_message_reply_markup,
+                chat_id=chat_id,
+                message_id=message_id,
+                reply_markup=reply_markup,
+            )
+
+        if is_caption:
+            return partial(
+                bot.edit_message_caption,
                 chat_id=chat_id,
                 message_id=message_id,
+                caption=text,
                 reply_markup=reply_markup,
+                parse_mode=parse_mode,
             )
 
-        return bot.edit_message_text(
+        return partial(
+            bot.edit_message_text,
+            chat_id=chat_id,
+            message_id=message_id,
+            text=text,
+            reply_markup=reply_markup,
+            parse_mode=parse_mode,
+            disable_web_page_preview=disable_web_page_preview
+        )
+
+    @staticmethod
+    def edit(
+            bot: Bot,
+            chat_id: int,
+            message_id: int,
+            text: Optional[str] = None,
+            photo: Optional[FSInputFile] = None,
+            video: Optional[FSInputFile] = None,
+            reply_markup: Optional[InlineKeyboardMarkup] = None,
+            parse_mode: Union[str] = UNSET_PARSE_MODE,
+            disable_web_page_preview: bool = False,
+            is_caption: bool = False,
+            scheduler: Optional[OutboundScheduler] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            coalescer: Optional[EditCoalescer] = None
+    ) -> Coroutine[Any, Any, Union[Message, bool]]:
+
+        request = MessageEditor._get_request(
+            bot=bot,
             chat_id=chat_id,
             message_id=message_id,
             text=text,
+            is_caption=is_caption,
+            photo=photo,
+            video=video,
             reply_markup=reply_markup,
             parse_mode=parse_mode,
             disable_web_page_preview=disable_web_page_preview
         )
+
+        if coalescer is not None:
+            return coalescer.call(
+                (chat_id, message_id),
+                partial(
+                    call_request,
+                    chat_id=chat_id,
+                    request=request,
+                    scheduler=scheduler,
+                    retry_policy=retry_policy
+                )
+            )
+
+        return call_request(chat_id, request, scheduler, retry_policy)
@@ -0,0 +1,472 @@
+
+
+import re
+
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Optional, Union, Any
+
+from aiogram import Bot
+from aiogram.types import Message, MessageEntity
+
+try:
+    from aiogram.client.default import Default
+
+except ImportError:  # aiogram before 3.4
+    Default = None  # type: ignore
+
+from usefulgram.enums import Const
+
+
+# type, offset, length and url, language, custom emoji id or user id
+EntityKey = tuple[str, int, int, Optional[str]]
+FormattedText = tuple[str, tuple[EntityKey, ...]]
+
+
+# Telegram adds the other entities (urls, mentions, hashtags) itself,
+# so only these ones depend on the parse mode
+_FORMATTING_ENTITIES = frozenset((
+    "bold",
+    "italic",
+    "underline",
+    "strikethrough",
+    "spoiler",
+    "code",
+    "pre",
+    "text_link",
+    "text_mention",
+    "custom_emoji",
+    "blockquote",
+    "expandable_blockquote",
+))
+
+_USER_LINK_PREFIX = "tg://user?id="
+
+_CODE_ESCAPE_PATTERN = re.compile(r"\\([`\\])")
+_URL_ESCAPE_PATTERN = re.compile(r"\\([)\\])")
+
+
+def _get_utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+class _UnsupportedFormatting(Exception):
+    pass
+
+
+class _HTMLEntityParser(HTMLParser):
+    _SIMPLE_TAGS = {
+        "b": "bold",
+        "strong": "bold",
+        "i": "italic",
+        "em": "italic",
+        "u": "underline",
+        "ins": "underline",
+        "s": "strikethrough",
+        "strike": "strikethrough",
+        "del": "strikethrough",
+        "tg-spoiler": "spoiler",
+        "code": "code",
+        "pre": "pre",
+    }
+
+    _parts: list[str]
+    _length: int
+    _open: list[tuple[str, Optional[str], int, Optional[str]]]
+    entities: list[EntityKey]
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+
+        self._parts = []
+        self._length = 0
+        self._open = []
+        self.entities = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def _get_entity(
+            self,
+            tag: str,
+            attrs: dict[str, Optional[str]]
+    ) -> tuple[Optional[str], Optional[str]]:
+
+        if tag in self._SIMPLE_TAGS:
+            return self._SIMPLE_TAGS[tag], None
+
+        if tag == "span" and attrs.get("class") == "tg-spoiler":
+            return "spoiler", None
+
+        if tag == "a":
+            url = attrs.get("href") or ""
+
+            if url.startswith(_USER_LINK_PREFIX):
+                return "text_mention", url[len(_USER_LINK_PREFIX):]
+
+            return "text_link", url
+
+        if tag == "tg-emoji":
+            return "custom_emoji", attrs.get("emoji-id")
+
+        if tag == "blockquote":
+            if "expandable" in attrs:
+                return "expandable_blockquote", None
+
+            return "blockquote", None
+
+        raise _UnsupportedFormatting
+
+    def handle_starttag(
+            self,
+            tag: str,
+            attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+
+        attrs_dict = dict(attrs)
+
+        entity_type, extra = self._get_entity(tag, attrs_dict)
+
+        # <pre><code class="language-python"> is the one pre entity
+        if entity_type == "code" and self._open and self._open[-1][1] == "pre":
+            language = attrs_dict.get("class") or ""
+
+            if language.startswith("language-"):
+                pre_tag, _, offset, _ = self._open[-1]
+
+                self._open[-1] = (pre_tag, "pre", offset, language[9:])
+
+                entity_type = None
+
+        self._open.append((tag, entity_type, self._length, extra))
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._open or self._open[-1][0] != tag:
+            raise _UnsupportedFormatting
+
+        _, entity_type, offset, extra = self._open.pop()
+
+        length = self._length - offset
+
+        if entity_type is not None and length > 0:
+            self.entities.append((entity_type, offset, length, extra))
+
+    def handle_data(self, data: str) -> None:
+        self._parts.append(data)
+        self._length += _get_utf16_length(data)
+
+
+class _MarkdownEntityParser:
+    _V2_MARKERS = (
+        ("```", "pre"),
+        ("||", "spoiler"),
+        ("__", "underline"),
+        ("*", "bold"),
+        ("_", "italic"),
+        ("~", "strikethrough"),
+        ("`", "code"),
+    )
+
+    _LEGACY_MARKERS = (
+        ("```", "pre"),
+        ("*", "bold"),
+        ("_", "italic"),
+        ("`", "code"),
+    )
+
+    _LEGACY_ESCAPED = "_*`["
+
+    _text: str
+    _is_legacy: bool
+    _position: int
+    _parts: list[str]
+    _length: int
+    _open: dict[str, int]
+    entities: list[EntityKey]
+
+    def __init__(self, text: str, is_legacy: bool):
+        self._text = text
+        self._is_legacy = is_legacy
+        self._position = 0
+        self._parts = []
+        self._length = 0
+        self._open = {}
+        self.entities = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def _add_text(self, text: str) -> None:
+        self._parts.append(text)
+        self._length += _get_utf16_length(text)
+
+    def _add_entity(
+            self,
+            entity_type: str,
+            offset: int,
+            extra: Optional[str] = None
+    ) -> None:
+
+        length = self._length - offset
+
+        if length > 0:
+            self.entities.append((entity_type, offset, length, extra))
+
+    def _find(self, value: str, start: int) -> int:
+        position = start
+
+        while position < len(self._text):
+            if self._text.startswith(value, position):
+                return position
+
+            # The escaped chars are skipped only in MarkdownV2,
+            # the legacy code and urls have no escaping
+            if self._text[position] == "\\" and not self._is_legacy:
+                position += 2
+
+            else:
+                position += 1
+
+        raise _UnsupportedFormatting
+
+    def _get_escaped(self, position: int) -> Optional[str]:
+        if self._text[position] != "\\" or position + 1 >= len(self._text):
+            return None
+
+        next_char = self._text[position + 1]
+
+        if self._is_legacy and next_char not in self._LEGACY_ESCAPED:
+            return None
+
+        return next_char
+
+    def _parse_code(self, marker: str, entity_type: str) -> None:
+        start = self._position + len(marker)
+        end = self._find(marker, start)
+
+        code = self._text[start:end]
+        language = None
+
+        if entity_type == "pre":
+            first_line, separator, other_lines = code.partition("\n")
+
+            if separator and first_line and " " not in first_line:
+                language = first_line
+                code = other_lines
+
+        if not self._is_legacy:
+            code = _CODE_ESCAPE_PATTERN.sub(r"\1", code)
+
+        offset = self._length
+
+        self._add_text(code)
+        self._add_entity(entity_type, offset, language)
+
+        self._position = end + len(marker)
+
+    def _parse_link(self) -> None:
+        text_end = self._find("](", self._position)
+        url_end = self._find(")", text_end)
+
+        link_text = self._text[self._position + 1:text_end]
+        url = self._text[text_end + 2:url_end]
+
+        if not self._is_legacy:
+            url = _URL_ESCAPE_PATTERN.sub(r"\1", url)
+
+        offset = self._length
+
+        link_parser = _MarkdownEntityParser(link_text, self._is_legacy)
+        link_parser.parse()
+
+        for entity_type, entity_offset, length, extra in link_parser.entities:
+            self.entities.append(
+                (entity_type, entity_offset + offset, length, extra)
+            )
+
+        self._add_text(link_parser.text)
+
+        if url.startswith(_USER_LINK_PREFIX):
+            user_id = url[len(_USER_LINK_PREFIX):]
+
+            self._add_entity("text_mention", offset, user_id)
+
+        else:
+            self._add_entity("text_link", offset, url)
+
+        self._position = url_end + 1
+
+    def _parse_marker(self) -> bool:
+        markers = self._LEGACY_MARKERS if self._is_legacy else self._V2_MARKERS
+
+        for marker, entity_type in markers:
+            if not self._text.startswith(marker, self._position):
+                continue
+
+            if entity_type in ("code", "pre"):
+                self._parse_code(marker, entity_type)
+
+                return True
+
+            offset = self._open.pop(marker, None)
+
+            if offset is None:
+                self._open[marker] = self._length
+
+            else:
+                self._add_entity(entity_type, offset)
+
+            self._position += len(marker)
+
+            return True
+
+        return False
+
+    def parse(self) -> None:
+        text = self._text
+        plain_start = self._position
+
+        while self._position < len(text):
+            escaped = self._get_escaped(self._position)
+
+            if escaped is not None:
+                self._add_text(text[plain_start:self._position])
+                self._add_text(escaped)
+
+                self._position += 2
+                plain_start = self._position
+
+                continue
+
+            char = text[self._position]
+
+            if char not in "`*_~|[>!":
+                self._position += 1
+
+                continue
+
+            self._add_text(text[plain_start:self._position])
+
+            if char == "[":
+                self._parse_link()
+
+            elif not self._parse_marker():
+                # Custom emoji and block quotes are not compared
+                if not self._is_legacy and char in ">!":
+                    raise _UnsupportedFormatting
+
+                self._add_text(char)
+                self._position += 1
+
+            plain_start = self._position
+
+        self._add_text(text[plain_start:])
+
+        if self._open:
+            raise _UnsupportedFormatting
+
+
+class TextFormatter:
+    """
+    Renders the text with the parse mode to the plain text and the entities
+    as Telegram does it, so the editor sees that the message has
+    the same formatted text without the request to Telegram
+    """
+
+    @staticmethod
+    def get_parse_mode(
+            bot: Bot,
+            parse_mode: Union[str, "Default", None]
+    ) -> Optional[str]:
+
+        if parse_mode is None or isinstance(parse_mode, str):
+            return parse_mode
+
+        default = getattr(bot, "default", None)
+
+        # The old aiogram has the sentinel instead of Default
+        if Default is None or default is None:
+            return getattr(bot, "parse_mode", None)
+
+        return default[parse_mode.name]
+
+    @staticmethod
+    @lru_cache(maxsize=Const.FORMATTED_TEXT_CACHE_SIZE)
+    def render(
+            text: str,
+            parse_mode: Optional[str]
+    ) -> Optional[FormattedText]:
+        """
+        :param text:
+        :param parse_mode: HTML, MarkdownV2, Markdown or None
+        :return: plain text and sorted entities
+        or None if the formatting can't be rendered
+        """
+
+        parser: Union[_HTMLEntityParser, _MarkdownEntityParser]
+
+        if parse_mode is None:
+            return text, ()
+
+        mode = parse_mode.lower()
+
+        try:
+            if mode == "html":
+                parser = _HTMLEntityParser()
+                parser.feed(text)
+                parser.close()
+
+            elif mode in ("markdownv2", "markdown"):
+                parser = _MarkdownEntityParser(text, mode == "markdown")
+                parser.parse()
+
+            else:
+                return None
+
+        except _UnsupportedFormatting:
+            return None
+
+        return parser.text, tuple(sorted(parser.entities))
+
+    @staticmethod
+    def _get_entity_key(entity: MessageEntity) -> EntityKey:
+        extra: Any = entity.url or entity.language or entity.custom_emoji_id
+
+        if entity.user is not None:
+            extra = str(entity.user.id)
+
+        return entity.type, entity.offset, entity.length, extra
+
+    @staticmethod
+    def get_message_text(message: Message) -> FormattedText:
+        if message.text is None:
+            text = message.caption or ""
+            entities = message.caption_entities
+
+        else:
+            text = message.text
+            entities = message.entities
+
+        entity_keys = tuple(sorted(
+            TextFormatter._get_entity_key(entity)
+            for entity in entities or ()
+            if entity.type in _FORMATTING_ENTITIES
+        ))
+
+        return text, entity_keys
+
+    @staticmethod
+    def is_same_text(
+            message: Message,
+            text: str,
+            parse_mode: Optional[str]
+    ) -> bool:
+
+        formatted_text = TextFormatter.render(text, parse_mode)
+
+        if formatted_text is None:
+            return False
+
+        return formatted_text == TextFormatter.get_message_text(message)
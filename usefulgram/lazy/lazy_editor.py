@@ -1,7 +1,5 @@
 
 
-import asyncio
-
 from typing import Optional, Union, Any
 from datetime import datetime, timedelta
 from datetime import timezone
@@ -17,23 +15,72 @@ from aiogram.types import (
 from aiogram import Bot
 from aiogram.enums.chat_type import ChatType
 
-from usefulgram.enums import Const
+from usefulgram.enums import Const, CallbackAnswerMode
 from usefulgram.exceptions import MessageTooOld
 from usefulgram.lazy.editor import MessageEditor
 from usefulgram.lazy.sender import MessageSender
-from usefulgram.lazy.stable_wait import StableWaiter
-from usefulgram.lazy.callback_responder import CallbackAnswer
+from usefulgram.lazy.scheduler import OutboundScheduler, outbound_scheduler
+from usefulgram.lazy.retry import RetryPolicy
+from usefulgram.lazy.coalescer import EditCoalescer
+from usefulgram.lazy.formatting import TextFormatter
+from usefulgram.keyboard.fingerprint import MarkupFingerprint
+from usefulgram.lazy.callback_responder import (
+    CallbackAnswer,
+    AnswerErrorHandler
+)
 
 
 class LazyEditor:
+    __slots__ = (
+        "_callback",
+        "_bot",
+        "_scheduler",
+        "_retry_policy",
+        "_coalescer",
+        "_answer_mode",
+        "_answer_error_handler"
+    )
+
     _callback: CallbackQuery
     _bot: Bot
-    _stable: bool
+    _scheduler: Optional[OutboundScheduler]
+    _retry_policy: Optional[RetryPolicy]
+    _coalescer: Optional[EditCoalescer]
+    _answer_mode: CallbackAnswerMode
+    _answer_error_handler: Optional[AnswerErrorHandler]
+
+    def __init__(
+            self,
+            callback: CallbackQuery,
+            bot: Bot,
+            stable: bool = False,
+            answer_mode: CallbackAnswerMode = CallbackAnswerMode.INLINE,
+            answer_error_handler: Optional[AnswerErrorHandler] = None,
+            scheduler: Optional[OutboundScheduler] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            coalescer: Optional[EditCoalescer] = None
+    ):
+        """
+        :param stable: wait for the Telegram limits before the requests,
+        the shared scheduler is used if the other one is not passed
+        :param scheduler: outbound scheduler for the requests
+        :param retry_policy: repeat the requests after the flood control
+        and the network errors
+        :param coalescer: send only the latest of the rapid edits
+        of the message
+        """
 
-    def __init__(self, callback: CallbackQuery, bot: Bot, stable: bool = False):
         self._callback = callback
         self._bot = bot
-        self._stable = stable
+
+        if stable and scheduler is None:
+            scheduler = outbound_scheduler
+
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy
+        self._coalescer = coalescer
+        self._answer_mode = answer_mode
+        self._answer_error_handler = answer_error_handler
 
     @staticmethod
     def _get_text_by_caption(
@@ -49,31 +96,50 @@ class LazyEditor:
     @staticmethod
     def _get_message_text(text: Optional[str], message: Message) -> Optional[str]:
         if text is None:
-            return message.text
+            return LazyEditor._get_current_text(message)
 
         return text
 
     @staticmethod
-    def _get_data_changes_status(
+    def _get_caption_status(message: Message) -> bool:
+        # The message without the text is the media one,
+        # so the text is its caption
+        return message.text is None
+
+    @staticmethod
+    def _get_current_text(message: Message) -> Optional[str]:
+        if LazyEditor._get_caption_status(message):
+            return message.caption
+
+        return message.text
+
+    def _get_text_changes_status(
+            self,
             message: Message,
             text: Optional[str],
-            reply_markup: Optional[InlineKeyboardMarkup],
-            video: Optional[FSInputFile],
-            photo: Optional[FSInputFile],
+            parse_mode: Union[str, Any]
     ) -> bool:
 
-        media = photo or video
+        # None text keeps the current one
+        if text is None:
+            return False
 
-        if message.text != text:
-            return True
+        # The message has the plain text and the entities,
+        # so the formatted text is rendered before the comparison
+        parse_mode = TextFormatter.get_parse_mode(self._bot, parse_mode)
 
-        if message.reply_markup != reply_markup:
-            return True
+        return not TextFormatter.is_same_text(message, text, parse_mode)
 
-        if media:
-            return True
+    @staticmethod
+    def _get_markup_changes_status(
+            message: Message,
+            reply_markup: Optional[InlineKeyboardMarkup]
+    ) -> bool:
 
-        return False
+        # None markup removes the current one
+        return not MarkupFingerprint.is_same_markup(
+            message.reply_markup, reply_markup
+        )
 
     @staticmethod
     def _get_delta_between_current_and_message(
@@ -105,7 +171,8 @@ class LazyEditor:
     def _get_message_media_is_correct_status(
             message: Message,
             photo: Optional[FSInputFile],
-            video: Optional[FSInputFile]
+            video: Optional[FSInputFile],
+            keep_media: bool
     ) -> bool:
 
         message_has_media = message.photo or message.video
@@ -114,7 +181,7 @@ class LazyEditor:
         if media and not message_has_media:
             return False
 
-        if not media and message_has_media:
+        if not media and message_has_media and not keep_media:
             return False
 
         return True
@@ -124,6 +191,7 @@ class LazyEditor:
             message: Message,
             photo: Optional[FSInputFile],
             video: Optional[FSInputFile],
+            keep_media: bool
     ) -> bool:
 
         if self._get_message_in_chat_status(message):
@@ -133,7 +201,7 @@ class LazyEditor:
             return False
 
         if not self._get_message_media_is_correct_status(
-            message=message, photo=photo, video=video
+            message=message, photo=photo, video=video, keep_media=keep_media
         ):
             return False
 
@@ -150,7 +218,11 @@ class LazyEditor:
             reply_markup: Optional[InlineKeyboardMarkup],
             parse_mode: Union[str],
             disable_web_page_preview: bool,
-            on_onflict_do_nothing: bool
+            on_onflict_do_nothing: bool,
+            scheduler: Optional[OutboundScheduler],
+            retry_policy: Optional[RetryPolicy],
+            coalescer: Optional[EditCoalescer],
+            is_text_changed: bool
     ) -> Union[Message, bool]:
 
         if not can_edit:
@@ -168,19 +240,30 @@ class LazyEditor:
                 video=video,
                 reply_markup=reply_markup,
                 parse_mode=parse_mode,
-                disable_web_page_preview=disable_web_page_preview
+                disable_web_page_preview=disable_web_page_preview,
+                scheduler=scheduler,
+                retry_policy=retry_policy
             )
 
+        # The text is not sent if it is the same,
+        # so only the keyboard is edited
+        if not is_text_changed and not (photo or video):
+            text = None
+
         return await MessageEditor.edit(
             bot=bot,
             chat_id=message.chat.id,
             message_id=message.message_id,
             text=text,
+            is_caption=LazyEditor._get_caption_status(message),
             photo=photo,
             video=video,
             reply_markup=reply_markup,
             parse_mode=parse_mode,
-            disable_web_page_preview=disable_web_page_preview
+            disable_web_page_preview=disable_web_page_preview,
+            scheduler=scheduler,
+            retry_policy=retry_policy,
+            coalescer=coalescer
         )
 
     def _get_can_edit_status(
@@ -188,6 +271,7 @@ class LazyEditor:
             message: Message,
             photo: Optional[FSInputFile],
             video: Optional[FSInputFile],
+            keep_media: bool
     ) -> bool:
 
         if message is None:
@@ -196,21 +280,30 @@ class LazyEditor:
         if not self._get_bot_allow_edit_status(
                 message=message,
                 photo=photo,
-                video=video
+                video=video,
+                keep_media=keep_media
         ):
             return False
 
         return True
 
-    @staticmethod
-    def _get_stable_wait_time(message: Message) -> float:
-        if message.edit_date:
-            dt = datetime.fromtimestamp(message.edit_date, tz=timezone.utc)
-
-        else:
-            dt = message.date
+    async def _answer(
+            self,
+            answer_mode: CallbackAnswerMode,
+            autoanswer: bool,
+            answer_text: Optional[str],
+            answer_show_alert: bool
+    ) -> None:
 
-        return StableWaiter.get_stable_wait_time(dt)
+        await CallbackAnswer.answer_by_mode(
+            bot=self._bot,
+            callback_id=self._callback.id,
+            answer_mode=answer_mode,
+            autoanswer=autoanswer,
+            answer_text=answer_text,
+            answer_show_alert=answer_show_alert,
+            error_handler=self._answer_error_handler
+        )
 
     async def edit(
             self,
@@ -221,9 +314,11 @@ class LazyEditor:
             parse_mode: Union[str, Any] = UNSET_PARSE_MODE,
             disable_web_page_preview: bool = False,
             on_onflict_do_nothing: bool = False,
+            keep_media: bool = False,
             answer_text: Optional[str] = None,
             answer_show_alert: bool = False,
-            autoanswer: bool = True
+            autoanswer: bool = True,
+            answer_mode: Optional[CallbackAnswerMode] = None
     ) -> Union[Message, bool]:
         """
         Smart edit menager
@@ -235,9 +330,14 @@ class LazyEditor:
         See formatting options for more details.
         :param disable_web_page_preview:
         :param on_onflict_do_nothing:
+        :param keep_media: edit only the caption and the keyboard
+        of the media message. Otherwise the message without
+        the new photo or video is sent again as the text one
         :param answer_text: if autoanser, it got callback.answer()
         :param answer_show_alert: if autoanser, it got callback.answer()
         :param autoanswer: should menager calls callback.answer()
+        :param answer_mode: how callback.answer() is called,
+        the mode of the editor is used by default
         :return:
         """
 
@@ -249,15 +349,24 @@ class LazyEditor:
 
             raise MessageTooOld
 
-        if self._stable:
-            await asyncio.sleep(self._get_stable_wait_time(message))
+        is_text_changed = self._get_text_changes_status(
+            message=message, text=text, parse_mode=parse_mode
+        )
 
-        if not self._get_data_changes_status(
+        # The media message is sent again as the text one
+        is_media_changed = photo or video or not (
+            self._get_message_media_is_correct_status(
                 message=message,
-                text=text,
-                reply_markup=reply_markup,
-                video=video,
                 photo=photo,
+                video=video,
+                keep_media=keep_media
+            )
+        )
+
+        if not (
+            is_text_changed
+            or is_media_changed
+            or self._get_markup_changes_status(message, reply_markup)
         ):
             return message
 
@@ -265,8 +374,19 @@ class LazyEditor:
             message=message,
             photo=photo,
             video=video,
+            keep_media=keep_media
         )
 
+        if answer_mode is None:
+            answer_mode = self._answer_mode
+
+        is_concurrent = answer_mode is CallbackAnswerMode.CONCURRENT
+
+        if is_concurrent:
+            await self._answer(
+                answer_mode, autoanswer, answer_text, answer_show_alert
+            )
+
         result = await self._send_or_edit(
             bot=self._bot,
             can_edit=can_edit,
@@ -277,15 +397,16 @@ class LazyEditor:
             reply_markup=reply_markup,
             parse_mode=parse_mode,
             disable_web_page_preview=disable_web_page_preview,
-            on_onflict_do_nothing=on_onflict_do_nothing
+            on_onflict_do_nothing=on_onflict_do_nothing,
+            scheduler=self._scheduler,
+            retry_policy=self._retry_policy,
+            coalescer=self._coalescer,
+            is_text_changed=is_text_changed
         )
 
-        await CallbackAnswer.auto_callback_answer(
-            bot=self._bot,
-            callback_id=callback.id,
-            autoanswer=autoanswer,
-            answer_text=answer_text,
-            answer_show_alert=answer_show_alert
-        )
+        if not is_concurrent:
+            await self._answer(
+                answer_mode, autoanswer, answer_text, answer_show_alert
+            )
 
         return result
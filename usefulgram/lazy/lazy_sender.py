@@ -1,5 +1,3 @@
-import asyncio
-
 from typing import Union, Optional
 
 from aiogram import Bot
@@ -11,27 +9,62 @@ from aiogram.types import (
     InlineKeyboardMarkup
 )
 
+from usefulgram.enums import CallbackAnswerMode
 from usefulgram.exceptions import MessageTooOld
 from usefulgram.lazy.sender import MessageSender
-from usefulgram.lazy.stable_wait import StableWaiter
-from usefulgram.lazy.callback_responder import CallbackAnswer
+from usefulgram.lazy.scheduler import OutboundScheduler, outbound_scheduler
+from usefulgram.lazy.retry import RetryPolicy
+from usefulgram.lazy.callback_responder import (
+    CallbackAnswer,
+    AnswerErrorHandler
+)
 
 
 class LazySender:
+    __slots__ = (
+        "_event",
+        "_bot",
+        "_scheduler",
+        "_retry_policy",
+        "_answer_mode",
+        "_answer_error_handler"
+    )
+
     _event: Union[CallbackQuery, Message]
     _bot: Bot
-    _stable: bool
+    _scheduler: Optional[OutboundScheduler]
+    _retry_policy: Optional[RetryPolicy]
+    _answer_mode: CallbackAnswerMode
+    _answer_error_handler: Optional[AnswerErrorHandler]
 
     def __init__(
             self,
             event: Union[CallbackQuery, Message],
             bot: Bot,
-            stable: bool = False
+            stable: bool = False,
+            answer_mode: CallbackAnswerMode = CallbackAnswerMode.INLINE,
+            answer_error_handler: Optional[AnswerErrorHandler] = None,
+            scheduler: Optional[OutboundScheduler] = None,
+            retry_policy: Optional[RetryPolicy] = None
     ):
+        """
+        :param stable: wait for the Telegram limits before the requests,
+        the shared scheduler is used if the other one is not passed
+        :param scheduler: outbound scheduler for the requests
+        :param retry_policy: repeat the requests after the flood control
+        and the network errors
+        """
 
         self._event = event
         self._bot = bot
-        self._stable = stable
+
+        if stable and scheduler is None:
+            scheduler = outbound_scheduler
+
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy
+        self._answer_mode = answer_mode
+        self._answer_error_handler = answer_error_handler
 
     @staticmethod
     def get_empty_text() -> str:
@@ -39,6 +72,27 @@ class LazySender:
 
         return f"⁣{spaces}⁣"
 
+    async def _answer(
+            self,
+            answer_mode: CallbackAnswerMode,
+            autoanswer: bool,
+            answer_text: Optional[str],
+            answer_show_alert: bool
+    ) -> None:
+
+        if not isinstance(self._event, CallbackQuery):
+            return
+
+        await CallbackAnswer.answer_by_mode(
+            bot=self._bot,
+            callback_id=self._event.id,
+            answer_mode=answer_mode,
+            autoanswer=autoanswer,
+            answer_text=answer_text,
+            answer_show_alert=answer_show_alert,
+            error_handler=self._answer_error_handler
+        )
+
     async def send(
             self,
             text: Optional[str] = None,
@@ -49,7 +103,8 @@ class LazySender:
             disable_web_page_preview: bool = False,
             answer_text: Optional[str] = None,
             answer_show_alert: bool = False,
-            autoanswer: bool = True
+            autoanswer: bool = True,
+            answer_mode: Optional[CallbackAnswerMode] = None
     ) -> Message:
         """
         Smart send menager
@@ -63,6 +118,8 @@ class LazySender:
         :param answer_text:
         :param answer_show_alert:
         :param autoanswer:
+        :param answer_mode: how callback.answer() is called,
+        the mode of the sender is used by default
         :return:
         """
 
@@ -74,19 +131,24 @@ class LazySender:
 
             chat_id = self._event.message.chat.id
             thread_id = self._event.message.message_thread_id
-            dt = self._event.message.date
 
         else:
             chat_id = self._event.chat.id
             thread_id = self._event.message_thread_id
-            dt = self._event.date
-
-        if self._stable:
-            await asyncio.sleep(StableWaiter.get_stable_wait_time(dt))
 
         if text is None:
             text = self.get_empty_text()
 
+        if answer_mode is None:
+            answer_mode = self._answer_mode
+
+        is_concurrent = answer_mode is CallbackAnswerMode.CONCURRENT
+
+        if is_concurrent:
+            await self._answer(
+                answer_mode, autoanswer, answer_text, answer_show_alert
+            )
+
         result = await MessageSender.send(
             bot=self._bot,
             chat_id=chat_id,
@@ -96,16 +158,14 @@ class LazySender:
             video=video,
             reply_markup=reply_markup,
             parse_mode=parse_mode,
-            disable_web_page_preview=disable_web_page_preview
+            disable_web_page_preview=disable_web_page_preview,
+            scheduler=self._scheduler,
+            retry_policy=self._retry_policy
         )
 
-        if isinstance(self._event, CallbackQuery):
-            await CallbackAnswer.auto_callback_answer(
-                bot=self._bot,
-                callback_id=self._event.id,
-                autoanswer=autoanswer,
-                answer_text=answer_text,
-                answer_show_alert=answer_show_alert
+        if not is_concurrent:
+            await self._answer(
+                answer_mode, autoanswer, answer_text, answer_show_alert
             )
 
         return result
@@ -0,0 +1,101 @@
+
+
+import time
+import random
+import asyncio
+
+from typing import Optional, Coroutine, Any
+
+from aiogram.exceptions import TelegramRetryAfter, TelegramNetworkError
+
+from usefulgram.enums import Const
+from usefulgram.lazy.scheduler import OutboundScheduler, RequestFactory, T
+
+
+class RetryPolicy:
+    """
+    Repeats the request after the flood control and the network errors.
+    The flood control error waits for retry_after and pauses
+    all requests to the chat in the scheduler, the network error waits
+    for the exponential backoff with full jitter.
+    The last error is raised if the next try does not fit the deadline
+    """
+
+    deadline: float
+    backoff_base: float
+    backoff_max: float
+
+    def __init__(
+            self,
+            deadline: float = Const.RETRY_DEADLINE_SECONDS,
+            backoff_base: float = Const.RETRY_BACKOFF_BASE_SECONDS,
+            backoff_max: float = Const.RETRY_BACKOFF_MAX_SECONDS
+    ):
+
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def get_backoff(self, attempt: int) -> float:
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+
+        return random.uniform(0, backoff)
+
+    async def call(
+            self,
+            chat_id: int,
+            request: RequestFactory[T],
+            scheduler: Optional[OutboundScheduler] = None
+    ) -> T:
+
+        deadline_time = time.monotonic() + self.deadline
+        attempt = 0
+
+        while True:
+            if scheduler is not None:
+                await scheduler.wait(chat_id)
+
+            try:
+                return await request()
+
+            except TelegramRetryAfter as error:
+                delay: float = error.retry_after
+
+                if time.monotonic() + delay > deadline_time:
+                    raise
+
+                if scheduler is not None:
+                    # The scheduler waits for the penalty itself
+                    # and the other requests to the chat wait too
+                    scheduler.penalize(chat_id, delay)
+
+                    continue
+
+            except TelegramNetworkError:
+                delay = self.get_backoff(attempt)
+                attempt += 1
+
+                if time.monotonic() + delay > deadline_time:
+                    raise
+
+            await asyncio.sleep(delay)
+
+
+def call_request(
+        chat_id: int,
+        request: RequestFactory[T],
+        scheduler: Optional[OutboundScheduler],
+        retry_policy: Optional[RetryPolicy]
+) -> Coroutine[Any, Any, T]:
+    """
+    Send the request by the retry policy and the scheduler,
+    both of them are optional
+    """
+
+    if retry_policy is not None:
+        return retry_policy.call(chat_id, request, scheduler)
+
+    if scheduler is None:
+        return request()
+
+    return scheduler.call(chat_id, request)
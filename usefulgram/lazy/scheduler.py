@@ -0,0 +1,217 @@
+
+
+import time
+import asyncio
+
+from typing import Optional, Callable, Coroutine, Any, TypeVar
+
+from usefulgram.enums import Const
+
+
+T = TypeVar("T")
+
+RequestFactory = Callable[[], Coroutine[Any, Any, T]]
+
+
+class _RateLimit:
+    """
+    Token bucket written as the theoretical arrival time (GCRA):
+    the bucket is full when the arrival time is in the past
+    """
+
+    __slots__ = ("_interval", "_tolerance", "_arrival_time", "blocked_until")
+
+    _interval: float
+    _tolerance: float
+    _arrival_time: float
+    blocked_until: float
+
+    def __init__(self, rate: float, burst: int):
+        self._interval = 1 / rate
+        self._tolerance = self._interval * (burst - 1)
+        self._arrival_time = 0
+        self.blocked_until = 0
+
+    def get_ready_time(self, now: float) -> float:
+        return max(
+            now, self._arrival_time - self._tolerance, self.blocked_until
+        )
+
+    def reserve(self, send_time: float) -> None:
+        self._arrival_time = (
+            max(self._arrival_time, send_time) + self._interval
+        )
+
+    def is_idle(self, now: float) -> bool:
+        # The idle bucket is the same as the new one,
+        # so it can be removed without changing the limits
+        return self.get_ready_time(now) <= now
+
+
+class OutboundScheduler:
+    """
+    Keeps the outgoing requests under the Telegram limits:
+    one message per second in a private chat,
+    twenty messages per minute in a group and thirty per second for the bot.
+
+    Every request reserves the time slot in the chat bucket and waits
+    until this slot, only then it takes the slot of the global bucket.
+    So the queue of one chat does not take the global slots
+    and the requests to the different chats are not delayed by each other
+    """
+
+    _private_rate: float
+    _private_burst: int
+    _group_rate: float
+    _group_burst: int
+    _idle_check_seconds: float
+    _global_limit: _RateLimit
+    _chat_limits: dict[int, _RateLimit]
+    _last_idle_check: float
+
+    def __init__(
+            self,
+            private_rate: float = Const.PRIVATE_CHAT_MESSAGES_PER_SECOND,
+            private_burst: int = 1,
+            group_rate: float = Const.GROUP_CHAT_MESSAGES_PER_SECOND,
+            group_burst: int = 1,
+            global_rate: float = Const.GLOBAL_MESSAGES_PER_SECOND,
+            global_burst: int = 1,
+            idle_check_seconds: float = Const.SCHEDULER_IDLE_CHECK_SECONDS
+    ):
+
+        self._private_rate = private_rate
+        self._private_burst = private_burst
+        self._group_rate = group_rate
+        self._group_burst = group_burst
+        self._idle_check_seconds = idle_check_seconds
+
+        self._global_limit = _RateLimit(global_rate, global_burst)
+        self._chat_limits = {}
+        self._last_idle_check = 0
+
+    def __len__(self) -> int:
+        return len(self._chat_limits)
+
+    def _get_chat_limit(self, chat_id: int) -> _RateLimit:
+        limit = self._chat_limits.get(chat_id)
+
+        if limit is not None:
+            return limit
+
+        # The groups and the channels have the negative ids
+        if chat_id < 0:
+            limit = _RateLimit(self._group_rate, self._group_burst)
+
+        else:
+            limit = _RateLimit(self._private_rate, self._private_burst)
+
+        self._chat_limits[chat_id] = limit
+
+        return limit
+
+    def _remove_idle_limits(self, now: float) -> None:
+        if now - self._last_idle_check < self._idle_check_seconds:
+            return
+
+        self._last_idle_check = now
+
+        idle_chats = [
+            chat_id
+            for chat_id, limit in self._chat_limits.items()
+            if limit.is_idle(now)
+        ]
+
+        for chat_id in idle_chats:
+            del self._chat_limits[chat_id]
+
+    def reserve(self, chat_id: int, now: Optional[float] = None) -> float:
+        """
+        Take the first free time slot of the chat
+        :param chat_id:
+        :param now: monotonic time, the current one by default
+        :return: monotonic time of the chat slot, the global slot
+        is taken by reserve_global when this time comes
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        self._remove_idle_limits(now)
+
+        chat_limit = self._get_chat_limit(chat_id)
+
+        send_time = chat_limit.get_ready_time(now)
+
+        chat_limit.reserve(send_time)
+
+        return send_time
+
+    def reserve_global(self, now: Optional[float] = None) -> float:
+        """
+        Take the first free time slot of the bot
+        :param now: monotonic time, the current one by default
+        :return: monotonic time when the request can be sent
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        send_time = self._global_limit.get_ready_time(now)
+
+        self._global_limit.reserve(send_time)
+
+        return send_time
+
+    def penalize(
+            self,
+            chat_id: int,
+            seconds: float,
+            now: Optional[float] = None
+    ) -> None:
+        """
+        Stop the requests to the chat, the reserved ones too.
+        It is used after the flood control error
+        :param chat_id:
+        :param seconds: retry after
+        :param now: monotonic time, the current one by default
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        chat_limit = self._get_chat_limit(chat_id)
+
+        chat_limit.blocked_until = max(chat_limit.blocked_until, now + seconds)
+
+    def _get_blocked_until(self, chat_id: int) -> float:
+        chat_limit = self._chat_limits.get(chat_id)
+
+        if chat_limit is None:
+            return 0
+
+        return chat_limit.blocked_until
+
+    @staticmethod
+    async def _sleep_until(send_time: float) -> None:
+        wait_time = send_time - time.monotonic()
+
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    async def wait(self, chat_id: int) -> None:
+        while True:
+            await self._sleep_until(self.reserve(chat_id))
+            await self._sleep_until(self.reserve_global())
+
+            # The chat could be penalized while the request was waiting
+            if self._get_blocked_until(chat_id) <= time.monotonic():
+                return
+
+    async def call(self, chat_id: int, request: RequestFactory[T]) -> T:
+        await self.wait(chat_id)
+
+        return await request()
+
+
+outbound_scheduler = OutboundScheduler()
@@ -1,5 +1,6 @@
 
 
+from functools import partial
 from typing import Optional, Union, Coroutine, Any
 
 from aiogram.types import (
@@ -12,24 +13,27 @@ from aiogram.types import (
 from aiogram import Bot
 
 from usefulgram.exceptions import MessageTextIsNone
+from usefulgram.lazy.scheduler import OutboundScheduler, RequestFactory
+from usefulgram.lazy.retry import RetryPolicy, call_request
 
 
 class MessageSender:
     @staticmethod
-    def send(
+    def _get_request(
             bot: Bot,
             chat_id: int,
             text: Optional[str],
-            message_thread_id: Optional[int] = None,
-            photo: Optional[FSInputFile] = None,
-            video: Optional[FSInputFile] = None,
-            reply_markup: Optional[InlineKeyboardMarkup] = None,
-            parse_mode: Union[str] = UNSET_PARSE_MODE,
-            disable_web_page_preview: bool = False,
-    ) -> Coroutine[Any, Any, Message]:
+            message_thread_id: Optional[int],
+            photo: Optional[FSInputFile],
+            video: Optional[FSInputFile],
+            reply_markup: Optional[InlineKeyboardMarkup],
+            parse_mode: Union[str],
+            disable_web_page_preview: bool
+    ) -> RequestFactory[Message]:
 
         if photo is not None:
-            return bot.send_photo(
+            return partial(
+                bot.send_photo,
                 chat_id=chat_id,
                 message_thread_id=message_thread_id,
                 photo=photo,
@@ -39,7 +43,8 @@ class MessageSender:
             )
 
         if video is not None:
-            return bot.send_video(
+            return partial(
+                bot.send_video,
                 chat_id=chat_id,
                 message_thread_id=message_thread_id,
                 video=video,
@@ -51,7 +56,8 @@ class MessageSender:
         if text is None:
             raise MessageTextIsNone
 
-        return bot.send_message(
+        return partial(
+            bot.send_message,
             chat_id=chat_id,
             message_thread_id=message_thread_id,
             text=text,
@@ -59,3 +65,32 @@ class MessageSender:
             parse_mode=parse_mode,
             disable_web_page_preview=disable_web_page_preview
         )
+
+    @staticmethod
+    def send(
+            bot: Bot,
+            chat_id: int,
+            text: Optional[str],
+            message_thread_id: Optional[int] = None,
+            photo: Optional[FSInputFile] = None,
+            video: Optional[FSInputFile] = None,
+            reply_markup: Optional[InlineKeyboardMarkup] = None,
+            parse_mode: Union[str] = UNSET_PARSE_MODE,
+            disable_web_page_preview: bool = False,
+            scheduler: Optional[OutboundScheduler] = None,
+            retry_policy: Optional[RetryPolicy] = None
+    ) -> Coroutine[Any, Any, Message]:
+
+        request = MessageSender._get_request(
+            bot=bot,
+            chat_id=chat_id,
+            text=text,
+            message_thread_id=message_thread_id,
+            photo=photo,
+            video=video,
+            reply_markup=reply_markup,
+            parse_mode=parse_mode,
+            disable_web_page_preview=disable_web_page_preview
+        )
+
+        return call_request(chat_id, request, scheduler, retry_policy)
@@ -3,9 +3,15 @@
 from datetime import datetime, timedelta, timezone
 
 from usefulgram.enums.const import Const
+from usefulgram.lazy.scheduler import outbound_scheduler
 
 
 class StableWaiter:
+    """
+    The old fixed wait before the request. stable=True uses
+    OutboundScheduler now, the class is kept for the old code
+    """
+
     @staticmethod
     def _get_delta_between_current_and_datetime(
             message_datetime: datetime
@@ -27,3 +33,11 @@ class StableWaiter:
         wait_time = Const.STABLE_WAIT_TIME_SECONDS - total_seconds
 
         return round(wait_time, 3)
+
+    @staticmethod
+    async def wait(chat_id: int) -> None:
+        """
+        Wait for the slot of the chat in the shared OutboundScheduler
+        """
+
+        await outbound_scheduler.wait(chat_id)
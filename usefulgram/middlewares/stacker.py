@@ -5,16 +5,43 @@ from typing import Dict, Any, Awaitable, Callable, Optional, Union
 from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject, CallbackQuery, Message, Update
 
+from usefulgram.enums import CallbackAnswerMode
 from usefulgram.exceptions import BotIsUndefined
 from usefulgram.parsing.decode import DecodeCallbackData
 from usefulgram.lazy import LazyEditor
 from usefulgram.lazy import LazySender
+from usefulgram.lazy.callback_responder import AnswerErrorHandler
+from usefulgram.lazy.scheduler import OutboundScheduler
+from usefulgram.lazy.retry import RetryPolicy
+from usefulgram.lazy.coalescer import EditCoalescer
 
 
 class StackerMiddleware(BaseMiddleware):
-    def __init__(self, stable: bool = False, separator: str = "/"):
+    """
+    Adds sender, editor and decoder to the handlers data.
+    All of them do nothing until they are used: the lazy objects
+    only keep the event and the decoder splits the callback data
+    on the first access
+    """
+
+    def __init__(
+            self,
+            stable: bool = False,
+            separator: str = "/",
+            answer_mode: CallbackAnswerMode = CallbackAnswerMode.INLINE,
+            answer_error_handler: Optional[AnswerErrorHandler] = None,
+            scheduler: Optional[OutboundScheduler] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            coalescer: Optional[EditCoalescer] = None
+    ):
+
         self.separator = separator
         self.stable = stable
+        self.answer_mode = answer_mode
+        self.answer_error_handler = answer_error_handler
+        self.scheduler = scheduler
+        self.retry_policy = retry_policy
+        self.coalescer = coalescer
 
     async def __call__(
             self,
@@ -26,7 +53,7 @@ class StackerMiddleware(BaseMiddleware):
         event_object: Union[CallbackQuery, Message]
 
         if not isinstance(event, (CallbackQuery, Message, Update)):
-            raise await handler(event, data)
+            return await handler(event, data)
 
         if isinstance(event, Update):
             if event.message is not None:
@@ -36,7 +63,7 @@ class StackerMiddleware(BaseMiddleware):
                 event_object = event.callback_query
 
             else:
-                raise await handler(event, data)
+                return await handler(event, data)
 
         else:
             event_object = event
@@ -49,7 +76,11 @@ class StackerMiddleware(BaseMiddleware):
         data["sender"] = LazySender(
             event=event_object,
             bot=bot,
-            stable=self.stable
+            stable=self.stable,
+            answer_mode=self.answer_mode,
+            answer_error_handler=self.answer_error_handler,
+            scheduler=self.scheduler,
+            retry_policy=self.retry_policy
         )
 
         if not isinstance(event_object, CallbackQuery):
@@ -63,7 +94,12 @@ class StackerMiddleware(BaseMiddleware):
         data["editor"] = LazyEditor(
             callback=event_object,
             bot=bot,
-            stable=self.stable
+            stable=self.stable,
+            answer_mode=self.answer_mode,
+            answer_error_handler=self.answer_error_handler,
+            scheduler=self.scheduler,
+            retry_policy=self.retry_policy,
+            coalescer=self.coalescer
         )
 
         return await handler(event, data)
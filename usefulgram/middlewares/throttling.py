@@ -5,47 +5,128 @@ This code based on
 https://github.com/wakaree/simple_echo_bot/blob/main/middlewares/throttling.py
 """
 
-from typing import Callable, Dict, Any, Awaitable, MutableMapping, Optional
+from typing import Callable, Dict, Any, Awaitable, Optional
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject, User
-
-from cachetools import TTLCache
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject, User, Chat, Update, CallbackQuery
 
+from usefulgram.enums import ThrottlingKeyType
 from usefulgram.exceptions import Throttling
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.throttling import (
+    BaseThrottlingAlgorithm,
+    BaseThrottlingBackend,
+    MemoryThrottlingBackend,
+    Cooldown,
+    ThrottlingPolicy,
+    ThrottlingPolicyTable
+)
 
 
 class ThrottlingMiddleware(BaseMiddleware):
     RATE_LIMIT = 0.7
     SIMPLE = True
+    FLAG = "throttling"
 
     def __init__(
-            self, rate_limit: float = RATE_LIMIT, simple: bool = SIMPLE
+            self,
+            rate_limit: float = RATE_LIMIT,
+            simple: bool = SIMPLE,
+            algorithm: Optional[BaseThrottlingAlgorithm] = None,
+            backend: Optional[BaseThrottlingBackend] = None,
+            key_type: ThrottlingKeyType = ThrottlingKeyType.USER,
+            prefix_policies: Optional[dict[str, ThrottlingPolicy]] = None,
+            flag_policies: Optional[dict[str, ThrottlingPolicy]] = None,
+            separator: str = "/"
     ) -> None:
-
-        self._cache: MutableMapping[int, None] = TTLCache(
-            maxsize=10_000, ttl=rate_limit
+        """
+        :param rate_limit: seconds between the events of the user,
+        it is used when the algorithm is not set
+        :param simple: ignore the throttled events instead of
+        raising Throttling
+        :param algorithm: Cooldown(rate_limit) by default,
+        TokenBucket, SlidingWindowCounter or GCRA allow the bursts
+        :param backend: state of the users, in the memory of the process
+        by default. SharedMemoryThrottlingBackend or RedisThrottlingBackend
+        share the limits between the workers
+        :param key_type: the user or the chat is limited by default
+        :param prefix_policies: policies by the prefix of the callback data,
+        ThrottlingPolicy(None) turns the throttling off
+        :param flag_policies: policies by the throttling flag
+        of the handler, for example flags={"throttling": "reports"}.
+        The flags are known only when the middleware is not outer
+        :param separator: separator of the callback data
+        """
+
+        if algorithm is None:
+            algorithm = Cooldown(rate_limit)
+
+        self._policies = ThrottlingPolicyTable(
+            default=ThrottlingPolicy(algorithm, key_type),
+            prefixes=prefix_policies,
+            flags=flag_policies
         )
 
+        self._separator = separator
+
+        if backend is None:
+            backend = MemoryThrottlingBackend()
+
+        self._backend = backend
+
         self.SIMPLE = simple
 
+    def _get_prefix(
+            self,
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Optional[str]:
+
+        if not self._policies.has_prefixes:
+            return None
+
+        decoder: Optional[DecodeCallbackData] = data.get("decoder", None)
+
+        if decoder is not None:
+            return decoder.prefix
+
+        if isinstance(event, Update):
+            event = event.callback_query
+
+        if not isinstance(event, CallbackQuery):
+            return None
+
+        return DecodeCallbackData(event.data, self._separator).prefix
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Optional[Any]:
+        policy = self._policies.get_policy(
+            get_flag(data, self.FLAG), self._get_prefix(event, data)
+        )
+
+        if policy.algorithm is None:
+            return await handler(event, data)
+
         user: Optional[User] = data.get("event_from_user", None)
+        chat: Optional[Chat] = data.get("event_chat", None)
+
+        key = policy.get_key(
+            None if user is None else user.id,
+            None if chat is None else chat.id
+        )
 
-        if user is not None:
-            if user.id in self._cache:
-                self._cache[user.id] = None
+        if key is not None:
+            is_allowed = await self._backend.hit(key, policy.algorithm)
 
+            if not is_allowed:
                 if self.SIMPLE:
                     return None
 
                 raise Throttling()
 
-            self._cache[user.id] = None
-
         return await handler(event, data)
@@ -2,3 +2,12 @@
 
 from .decode import DecodeCallbackData
 from .encode import CallbackData, AdditionalInstance
+from .codec import CodecRegistry, codec_registry
+from .temporal import TemporalCodec
+from .storage import (
+    BasePayloadStore,
+    MemoryPayloadStore,
+    SQLitePayloadStore,
+    PayloadStoreStats
+)
+from .prefixes import PrefixRegistry, prefix_registry
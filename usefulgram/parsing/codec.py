@@ -0,0 +1,470 @@
+
+
+import re
+
+from typing import Any, Callable, Optional, Iterable
+from datetime import datetime, date, time
+from decimal import Decimal
+from enum import Enum
+
+from pydantic import BaseModel
+
+from usefulgram.exceptions import WrongObjectType, RecursionObjectParse
+from usefulgram.parsing.temporal import TemporalCodec
+
+
+Encoder = Callable[[Any], str]
+Decoder = Callable[[str], Any]
+ValueCheck = Callable[[str], bool]
+
+_NUMBER_PATTERN = re.compile(
+    r"[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?|s?nan)",
+    re.IGNORECASE
+)
+
+
+class DecodePlan:
+    """
+    Flat description of how the additional values map to the object fields.
+    It is compiled once per type, so the decode itself is a simple loop
+    """
+
+    format_object: type
+    prefix_decoder: Optional[Decoder]
+    fields: tuple[tuple[str, Optional[Decoder], Optional["DecodePlan"]], ...]
+    width: int
+
+    def __init__(
+            self,
+            format_object: type,
+            prefix_decoder: Optional[Decoder],
+            fields: tuple[
+                tuple[str, Optional[Decoder], Optional["DecodePlan"]], ...
+            ],
+            width: int
+    ):
+        self.format_object = format_object
+        self.prefix_decoder = prefix_decoder
+        self.fields = fields
+        self.width = width
+
+
+class CodecRegistry:
+    _value_encoders: dict[type, Encoder]
+    _value_decoders: dict[Any, Decoder]
+    _field_names: dict[type, tuple[str, ...]]
+    _decode_plans: dict[type, DecodePlan]
+    _compiling: set[type]
+    temporal: TemporalCodec
+
+    def __init__(self, temporal: Optional[TemporalCodec] = None):
+        if temporal is None:
+            temporal = TemporalCodec()
+
+        self.temporal = temporal
+
+        self._value_encoders = {}
+        self._value_decoders = {}
+        self._field_names = {}
+        self._decode_plans = {}
+        self._compiling = set()
+
+    def clear(self) -> None:
+        self._value_encoders.clear()
+        self._value_decoders.clear()
+        self._field_names.clear()
+        self._decode_plans.clear()
+
+    def set_temporal_codec(self, temporal: TemporalCodec) -> None:
+        """
+        Change the datetime, date and time format.
+        All compiled plans are dropped, because they keep the old one
+        """
+
+        self.temporal = temporal
+
+        self.clear()
+
+    @staticmethod
+    def _get_annotations(obj_type: type) -> Iterable[tuple[str, Any]]:
+        if issubclass(obj_type, BaseModel):
+            return [
+                (key, field.annotation)
+                for key, field in obj_type.model_fields.items()
+            ]
+
+        return obj_type.__annotations__.items()
+
+    @staticmethod
+    def _get_instance_field_names(obj_type: type) -> tuple[str, ...]:
+        if issubclass(obj_type, BaseModel):
+            return tuple(obj_type.model_fields.keys())
+
+        # Same lookup as instance.__annotations__,
+        # the class attribute is created lazily and always exists
+        for klass in obj_type.__mro__:
+            annotations = klass.__dict__.get("__annotations__")
+
+            if annotations is not None:
+                return tuple(annotations.keys())
+
+        raise AttributeError(f"{obj_type} has no annotations")
+
+    def get_field_names(self, obj_type: type) -> tuple[str, ...]:
+        field_names = self._field_names.get(obj_type)
+
+        if field_names is None:
+            field_names = self._get_instance_field_names(obj_type)
+
+            self._field_names[obj_type] = field_names
+
+        return field_names
+
+    # Encoding
+
+    @staticmethod
+    def _encode_none(_item: None) -> str:
+        return ""
+
+    @staticmethod
+    def _encode_bool(item: bool) -> str:
+        return "1" if item else "0"
+
+    @staticmethod
+    def _encode_str(item: str) -> str:
+        return item
+
+    @staticmethod
+    def _encode_enum(item: Enum) -> str:
+        return item.name
+
+    def _encode_object(self, item: object) -> str:
+        encode_value = self.encode_value
+
+        return "&".join([
+            encode_value(item.__getattribute__(key))
+            for key in self.get_field_names(type(item))
+            if key != "prefix"
+        ])
+
+    def _compile_value_encoder(self, value_type: type) -> Encoder:
+        if value_type is type(None):
+            return self._encode_none
+
+        if issubclass(value_type, bool):
+            return self._encode_bool
+
+        if issubclass(value_type, str):
+            if self.temporal.compact:
+                return self.temporal.escape_str
+
+            return self._encode_str
+
+        if issubclass(value_type, (int, float, Decimal)):
+            return str
+
+        if issubclass(value_type, datetime):
+            return self.temporal.datetime_to_str
+
+        if issubclass(value_type, date):
+            return self.temporal.date_to_str
+
+        if issubclass(value_type, time):
+            return self.temporal.time_to_str
+
+        if issubclass(value_type, Enum):
+            return self._encode_enum
+
+        return self._encode_object
+
+    def get_value_encoder(self, value_type: type) -> Encoder:
+        encoder = self._value_encoders.get(value_type)
+
+        if encoder is None:
+            encoder = self._compile_value_encoder(value_type)
+
+            self._value_encoders[value_type] = encoder
+
+        return encoder
+
+    def encode_value(self, item: Any) -> str:
+        encoder = self._value_encoders.get(type(item))
+
+        if encoder is None:
+            encoder = self.get_value_encoder(type(item))
+
+        return encoder(item)
+
+    # Decoding
+
+    @staticmethod
+    def _decode_bool(value: str) -> bool:
+        return bool(int(value))
+
+    @staticmethod
+    def _decode_undefined(_value: str) -> Any:
+        raise WrongObjectType
+
+    @staticmethod
+    def _get_enum_decoder(obj_type: type[Enum]) -> Decoder:
+        members = obj_type.__members__
+
+        def decode_enum(value: str) -> Enum:
+            return members[value]
+
+        return decode_enum
+
+    @staticmethod
+    def _get_type_decoder(obj_type: type) -> Decoder:
+        def decode_type(value: str) -> Any:
+            try:
+                return obj_type(value)  # type: ignore
+
+            except (ValueError, AttributeError):
+                raise WrongObjectType
+
+        return decode_type
+
+    @staticmethod
+    def _is_int(value: str) -> bool:
+        if value[0] in "+-":
+            return value[1:].isdecimal()
+
+        return value.isdecimal()
+
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        return _NUMBER_PATTERN.fullmatch(value) is not None
+
+    def _get_value_check(self, obj_type: Any) -> Optional[ValueCheck]:
+        """
+        Return the cheap check which says that the value can be decoded
+        as the type. None means that the type has no check
+        and it must be tried by the decoder itself
+        """
+
+        if not isinstance(obj_type, type):
+            return None
+
+        if issubclass(obj_type, (bool, int)):
+            return self._is_int
+
+        if issubclass(obj_type, (float, Decimal)):
+            return self._is_number
+
+        if issubclass(obj_type, (datetime, date, time)):
+            return self.temporal.get_check()
+
+        if issubclass(obj_type, Enum):
+            return obj_type.__members__.__contains__
+
+        return None
+
+    @staticmethod
+    def _get_union_decoder(
+            members: tuple[tuple[Optional[ValueCheck], Decoder], ...]
+    ) -> Decoder:
+
+        def decode_union(value: str) -> Any:
+            for check, decoder in members:
+                if check is not None and not check(value):
+                    continue
+
+                try:
+                    return decoder(value)
+
+                # The check is passed, but the value is still wrong
+                # (e.g. 13th month), so the next type is tried
+                except (ValueError, TypeError):
+                    continue
+
+            raise WrongObjectType
+
+        return decode_union
+
+    def _compile_value_decoder(self, obj_type: Any) -> Decoder:
+        # Optional[...] or Union[...] checker
+        if not isinstance(obj_type, type):
+            irregular_types = getattr(obj_type, "__args__", None)
+
+            if irregular_types is None:
+                return self._decode_undefined
+
+            # An empty string is None, so NoneType never matches a value
+            return self._get_union_decoder(tuple(
+                (self._get_value_check(i), self.get_value_decoder(i))
+                for i in irregular_types
+                if i is not type(None)
+            ))
+
+        if issubclass(obj_type, bool):
+            return self._decode_bool
+
+        if issubclass(obj_type, datetime):
+            return self.temporal.to_datetime
+
+        if issubclass(obj_type, date):
+            return self.temporal.to_date
+
+        if issubclass(obj_type, time):
+            return self.temporal.to_time
+
+        if issubclass(obj_type, Enum):
+            return self._get_enum_decoder(obj_type)
+
+        if obj_type is str:
+            if self.temporal.compact:
+                return self.temporal.unescape_str
+
+            return str
+
+        return self._get_type_decoder(obj_type)
+
+    def get_value_decoder(self, obj_type: Any) -> Decoder:
+        """
+        Return the decoder of a not empty string value.
+        Empty string always means None and must be checked by a caller
+        """
+
+        try:
+            decoder = self._value_decoders.get(obj_type)
+
+        except TypeError:  # unhashable annotation
+            return self._compile_value_decoder(obj_type)
+
+        if decoder is None:
+            decoder = self._compile_value_decoder(obj_type)
+
+            self._value_decoders[obj_type] = decoder
+
+        return decoder
+
+    @staticmethod
+    def _get_dataclass_obj(obj_type: Any) -> Optional[type[BaseModel]]:
+        if isinstance(obj_type, type):
+            if issubclass(obj_type, BaseModel):
+                return obj_type
+
+            return None
+
+        irregular_types = getattr(obj_type, "__args__", ())
+
+        for irregular_type in irregular_types:
+            if not isinstance(irregular_type, type):
+                continue
+
+            if issubclass(irregular_type, BaseModel):
+                return irregular_type
+
+        return None
+
+    def _compile_decode_plan(self, format_object: type) -> DecodePlan:
+        prefix_decoder: Optional[Decoder] = None
+        fields = []
+        width = 0
+
+        for key, obj_type in self._get_annotations(format_object):
+            if key == "prefix":
+                # The prefix is written as it is, only the values are escaped
+                if obj_type is str:
+                    prefix_decoder = str
+
+                else:
+                    prefix_decoder = self.get_value_decoder(obj_type)
+
+                continue
+
+            dataclass_obj = self._get_dataclass_obj(obj_type)
+
+            if dataclass_obj is not None:
+                nested_plan = self.get_decode_plan(dataclass_obj)
+
+                fields.append((key, None, nested_plan))
+                width += nested_plan.width
+
+                continue
+
+            fields.append((key, self.get_value_decoder(obj_type), None))
+            width += 1
+
+        return DecodePlan(
+            format_object=format_object,
+            prefix_decoder=prefix_decoder,
+            fields=tuple(fields),
+            width=width
+        )
+
+    def get_decode_plan(self, format_object: type) -> DecodePlan:
+        plan = self._decode_plans.get(format_object)
+
+        if plan is not None:
+            return plan
+
+        if format_object in self._compiling:
+            raise RecursionObjectParse
+
+        self._compiling.add(format_object)
+
+        try:
+            plan = self._compile_decode_plan(format_object)
+
+        finally:
+            self._compiling.discard(format_object)
+
+        self._decode_plans[format_object] = plan
+
+        return plan
+
+    def _decode_by_plan(
+            self,
+            plan: DecodePlan,
+            prefix: str,
+            additional: list[str],
+            start_index: int,
+            add_prefix: bool
+    ) -> Any:
+
+        params: dict[str, Any] = {}
+
+        if add_prefix:
+            params["prefix"] = prefix
+
+        prefix_decoder = plan.prefix_decoder
+
+        if prefix_decoder is not None:
+            params["prefix"] = prefix_decoder(prefix) if prefix else None
+
+        index = start_index
+
+        for key, decoder, nested_plan in plan.fields:
+            if nested_plan is not None:
+                params[key] = self._decode_by_plan(
+                    nested_plan, prefix, additional, index, False
+                )
+
+                index += nested_plan.width
+
+                continue
+
+            value = additional[index]
+
+            params[key] = decoder(value) if value else None  # type: ignore
+
+            index += 1
+
+        return plan.format_object(**params)
+
+    def decode(
+            self,
+            format_object: type,
+            prefix: str,
+            additional: list[str],
+            add_prefix: bool = False
+    ) -> Any:
+
+        plan = self.get_decode_plan(format_object)
+
+        return self._decode_by_plan(plan, prefix, additional, 0, add_prefix)
+
+
+codec_registry = CodecRegistry()
@@ -1,223 +1,230 @@
 
 
-from typing import Union, Any, Optional, Type
-from datetime import datetime, date, time
-
-from usefulgram.enums import Const
-from usefulgram.exceptions import WrongObjectType
-
-from enum import Enum
+from typing import Union, Any, Optional
 
 from pydantic import BaseModel
 
-from contextlib import suppress
+from usefulgram.parsing.codec import codec_registry
+from usefulgram.parsing.encode import CallbackData
+from usefulgram.parsing.storage import BasePayloadStore
+from usefulgram.parsing.prefixes import prefix_registry
 
 
-class DecodeCallbackData:
-    prefix: str
-    additional: list[str]
+_MISSING = object()
 
-    @staticmethod
-    def _get_prefix_and_additional(
-            callback_data: str,
-            separator: str
-    ) -> tuple[str, list[str]]:
 
-        split_data = callback_data.split(separator)
+class _DecodeError:
+    error: Exception
+
+    def __init__(self, error: Exception):
+        self.error = error
 
-        additional = split_data[1].split("&")
 
-        return split_data[0], additional
+class DecodeCallbackData:
+    """
+    Callback data parser. The callback data is split on the first access
+    to prefix, additional or payload_expired, so the decoder is cheap
+    for the handlers which do not use it
+    """
+
+    __slots__ = (
+        "_callback_data",
+        "_separator",
+        "_store",
+        "_prefix",
+        "_additional",
+        "_payload_expired",
+        "_models",
+        "_dicts",
+    )
+
+    _callback_data: Optional[str]
+    _separator: str
+    _store: Optional[BasePayloadStore]
+    _prefix: Optional[str]
+    _additional: list[str]
+    _payload_expired: bool
+    _models: Optional[dict[tuple[type, bool], Any]]
+    _dicts: Optional[dict[type, dict[str, Any]]]
 
     @staticmethod
-    def _get_empty_prefix_and_additional() -> tuple[str, list[str]]:
-        return "", []
+    def _get_additional(
+            split_data: list[str],
+            store: Optional[BasePayloadStore]
+    ) -> Optional[list[str]]:
 
-    def __init__(self, callback_data: Optional[str], separator: str = "/"):
-        if callback_data is not None:
-            self.prefix, self.additional = self._get_prefix_and_additional(
-                callback_data, separator
-            )
+        if len(split_data) < 2:
+            return []
 
-            return
+        # prefix, empty part and token
+        if len(split_data) == 3 and split_data[1] == "":
+            if store is None:
+                return None
 
-        self.prefix, self.additional = self._get_empty_prefix_and_additional()
+            payload = store.get(split_data[2])
 
-    def _convert_typing_object_to_type(
-            self, obj_value: str, *args: type
-    ) -> Any:
+            if payload is None:
+                return None
 
-        for obj_type in args:
-            with suppress(ValueError, TypeError):
-                return self._convert_str_to_type(
-                    obj_value=obj_value,
-                    obj_type=obj_type
-                )
+            return payload.split("&")
 
-        raise WrongObjectType
+        return split_data[1].split("&")
 
-    def _convert_str_to_type(
+    def _get_prefix_and_additional(
             self,
-            obj_value: str,
-            obj_type: Any
-    ) -> Any:
-
-        if obj_value == "":
-            return None
-
-        # Optional[...] or Union[...] checker
-        if not isinstance(obj_type, type):
-            irregular_types = obj_type.__getattribute__("__args__")
-
-            return self._convert_typing_object_to_type(
-                obj_value, *irregular_types
-            )
-
-        if issubclass(obj_type, bool):
-            return bool(int(obj_value))
-
-        if issubclass(obj_type, datetime):
-            return datetime.strptime(obj_value, Const.DATETIME_FORMAT)
+            callback_data: str,
+            separator: str,
+            store: Optional[BasePayloadStore]
+    ) -> tuple[str, list[str]]:
 
-        if issubclass(obj_type, date):
-            return datetime.strptime(obj_value, Const.DATETIME_FORMAT).date()
+        split_data = callback_data.split(separator)
 
-        if issubclass(obj_type, time):
-            return datetime.strptime(obj_value, Const.DATETIME_FORMAT).time()
+        prefix = prefix_registry.to_prefix(split_data[0])
+        additional = self._get_additional(split_data, store)
 
-        if issubclass(obj_type, Enum):
-            return obj_type[obj_value]
+        if additional is None:
+            self._payload_expired = True
 
-        try:
-            return obj_type(obj_value)  # type: ignore
+            return prefix, []
 
-        except (ValueError, AttributeError):
-            raise WrongObjectType
+        return prefix, additional
 
     @staticmethod
-    def _is_dataclass(obj_type: Any) -> bool:
-        if isinstance(obj_type, type):
-            return issubclass(obj_type, BaseModel)
+    def _get_empty_prefix_and_additional() -> tuple[str, list[str]]:
+        return "", []
 
-        try:
-            irregular_types = obj_type.__getattribute__("__args__")
+    def __init__(
+            self,
+            callback_data: Optional[str],
+            separator: str = "/",
+            store: Optional[BasePayloadStore] = None
+    ):
+        """
+
+        :param callback_data:
+        :param separator:
+        :param store: payload store of the oversized callback data,
+        the store of CallbackData is used by default
+        """
+
+        self._callback_data = callback_data
+        self._separator = separator
+        self._store = store
+        self._prefix = None
+        self._payload_expired = False
+        self._models = None
+        self._dicts = None
+
+    def _parse(self) -> None:
+        if self._callback_data is None:
+            self._prefix, self._additional = \
+                self._get_empty_prefix_and_additional()
 
-        except (ValueError, AttributeError):
-            return False
+            return
 
-        for irregular_type in irregular_types:
-            if issubclass(irregular_type, BaseModel):
-                return True
+        store = self._store
 
-        return False
+        if store is None:
+            store = CallbackData.store
 
-    @staticmethod
-    def _get_dataclass_obj(obj_type: Any) -> Type[BaseModel]:
-        if isinstance(obj_type, type):
-            if issubclass(obj_type, BaseModel):
-                return obj_type
+        self._prefix, self._additional = self._get_prefix_and_additional(
+            self._callback_data, self._separator, store
+        )
 
-        irregular_types = obj_type.__getattribute__("__args__")
+    @property
+    def prefix(self) -> str:
+        if self._prefix is None:
+            self._parse()
 
-        for irregular_type in irregular_types:
-            if issubclass(irregular_type, BaseModel):
-                return irregular_type
+        return self._prefix  # type: ignore
 
-        raise WrongObjectType
+    @property
+    def additional(self) -> list[str]:
+        if self._prefix is None:
+            self._parse()
 
-    def _iter_key_and_type(
-            self, keys: list[str], objects_types: list[type],
-            add_prefix: bool, start_additional_value: int = 0
-    ) -> dict[str, Any]:
+        return self._additional
 
-        return_param: dict[str, Any] = {}
+    @property
+    def payload_expired(self) -> bool:
+        """
+        The callback data has the token of the payload store,
+        but the payload is evicted or expired
+        """
 
-        if add_prefix:
-            return_param["prefix"] = self.prefix
+        if self._prefix is None:
+            self._parse()
 
-        additional_value = start_additional_value
+        return self._payload_expired
 
-        for key, obj_type in zip(keys, objects_types):
+    def _decode(self, format_object: type, add_prefix: bool) -> Any:
+        if self._models is None:
+            self._models = {}
 
-            if key == "prefix":
-                return_param[key] = self._convert_str_to_type(
-                    self.prefix, obj_type
-                )
+        key = (format_object, add_prefix)
 
-                continue
+        result = self._models.get(key, _MISSING)
 
-            if self._is_dataclass(obj_type):
-                dataclass_obj = self._get_dataclass_obj(obj_type)
-
-                keys, values = self._get_key_and_values_by_obj(
-                    format_object=dataclass_obj
-                )
-
-                params = self._iter_key_and_type(
-                    keys=keys,
-                    objects_types=values,
-                    add_prefix=False,
-                    start_additional_value=additional_value
+        if result is _MISSING:
+            try:
+                result = codec_registry.decode(
+                    format_object=format_object,
+                    prefix=self.prefix,
+                    additional=self.additional,
+                    add_prefix=add_prefix
                 )
 
-                additional_value += len(keys)
+            except (AttributeError, ValueError, IndexError, KeyError) as error:
+                self._models[key] = _DecodeError(error)
 
-                return_param[key] = self._get_convert_obj(dataclass_obj, params)
+                raise
 
-                continue
+            self._models[key] = result
 
-            return_param[key] = self._convert_str_to_type(
-                self.additional[additional_value], obj_type
-            )
+        elif isinstance(result, _DecodeError):
+            raise result.error
 
-            additional_value += 1
+        return result
 
-        return return_param
-
-    @staticmethod
-    def _get_convert_obj(
-            format_obj: type, params: dict[str, Any]
+    def to_format(
+            self, format_object: type, add_prefix: bool = False
     ) -> Union[BaseModel, object]:
-        return format_obj(**params)
+        """
+        Decode the callback data to the object. The result is memoized,
+        so every filter of the same type gets the same object
+        during the update and it should not be changed
+        :param format_object: BaseModel or annotated class
+        :param add_prefix: pass the callback prefix to the object
+        :return:
+        """
 
-    @staticmethod
-    def _get_key_and_values_by_obj(
-            format_object: type
-    ) -> tuple[list[str], list[Any]]:
+        return self._decode(format_object, add_prefix)
 
-        if issubclass(format_object, BaseModel):
-            fields = format_object.model_fields
-            values = [i.annotation for i in fields.values()]
+    def to_dict(self, format_object: type) -> dict[str, Any]:
+        """
+        Memoized class_to_dict of to_format(format_object, add_prefix=True).
+        The dict is shared between the filters and should not be changed
+        :param format_object: BaseModel or annotated class
+        :return:
+        """
 
-            return list(fields.keys()), values
+        if self._dicts is None:
+            self._dicts = {}
 
-        fields = format_object.__annotations__
+        result = self._dicts.get(format_object)
 
-        another_values = list(fields.values())
+        if result is None:
+            result = self.class_to_dict(self._decode(format_object, True))
 
-        return list(fields.keys()), another_values
+            self._dicts[format_object] = result
 
-    def to_format(
-            self, format_object: type, add_prefix: bool = False
-    ) -> Union[BaseModel, object]:
-
-        keys, values = self._get_key_and_values_by_obj(format_object=format_object)
-
-        obj_params = self._iter_key_and_type(keys, values, add_prefix)
-
-        return self._get_convert_obj(format_object, obj_params)
+        return result
 
     @staticmethod
     def class_to_dict(class_: Union[BaseModel, object]) -> dict[str, Any]:
         result_dict = {"prefix": class_.__getattribute__("prefix")}
 
-        if isinstance(class_, BaseModel):
-            fields = class_.model_fields
-
-        else:
-            fields = class_.__annotations__
-
-        for key in fields.keys():
+        for key in codec_registry.get_field_names(type(class_)):
             result_dict[key] = class_.__getattribute__(key)
 
         return result_dict
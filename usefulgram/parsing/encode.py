@@ -1,72 +1,21 @@
 
 
-import sys
+from typing import Any, Optional
 
-from typing import Any
-
-from enum import Enum
-from decimal import Decimal
-
-from datetime import date, time, datetime
-
-from pydantic import BaseModel
-
-from usefulgram.exceptions import TooMoreCharacters
 from usefulgram.enums import Const
+from usefulgram.exceptions import TooMoreCharacters, SeparatorInCallbackData
+from usefulgram.parsing.codec import codec_registry
+from usefulgram.parsing.storage import BasePayloadStore
+from usefulgram.parsing.prefixes import prefix_registry
 
 
 class _Additional:
     @staticmethod
-    def _add_separator(item: str, separator: str = "&") -> str:
-        return f"{item}{separator}"
-
-    def _object_to_str(self, item: object) -> str:
-        if isinstance(item, BaseModel):
-            fields = item.model_fields
-
-        else:
-            fields = item.__annotations__
-
-        annotations_keys = list(fields.keys())
-
-        result = ""
-
-        for key in annotations_keys:
-            if key == "prefix":
-                continue
-
-            values = item.__getattribute__(f"{key}")
-
-            string_value = self._to_str(values, is_recursion=True)
-
-            result += self._add_separator(string_value)
-
-        return result[:-1]
-
-    def _to_str(self, item: Any, is_recursion: bool = False) -> str:
-        if item is None:
-            return ""
-
-        if isinstance(item, bool):
-            return str(int(item))
-
-        if isinstance(item, str):
-            return item
-
-        if isinstance(item, (int, float, Decimal)):
-            return str(item)
-
-        if isinstance(item, (datetime, date, time)):
-            return item.strftime(Const.DATETIME_FORMAT)
-
-        if isinstance(item, Enum):
-            return item.name
-
-        if is_recursion:
-            return self._object_to_str(item)
-
+    def _to_str(item: Any) -> str:
+        # Nested objects are encoded by the compiled codec plans,
+        # only the top level objects without annotations become a string
         try:
-            return self._object_to_str(item)
+            return codec_registry.encode_value(item)
 
         except AttributeError:
             return f"{item}"
@@ -75,17 +24,28 @@ class _Additional:
         if args == ():
             return ""
 
-        result = ""
+        to_str = self._to_str
 
-        for item in args:
-            result += self._add_separator(self._to_str(item))
+        return "&".join([to_str(item) for item in args])
 
-        result = result[:-1]
 
-        return result
+class _CallbackData:
+    store: Optional[BasePayloadStore]
 
+    def __init__(self):
+        self.store = None
+
+    def set_store(self, store: Optional[BasePayloadStore]) -> None:
+        """
+        Enable the server-side storage of the oversized callback data.
+        The additional values which do not fit into 64 bytes
+        or contain the separator are saved in the store
+        and the callback data gets a short token instead
+        :param store: payload store or None to disable it
+        """
+
+        self.store = store
 
-class _CallbackData:
     @staticmethod
     def _get_str_callback_data(
             prefix: str, additional: str, separator: str
@@ -94,12 +54,24 @@ class _CallbackData:
         return f"{prefix}{separator}{additional}"
 
     @staticmethod
-    def _check_callback_data_bytes(callback_data: str) -> bool:
-        size = sys.getsizeof(callback_data)
+    def _get_token_callback_data(
+            prefix: str, token: str, separator: str
+    ) -> str:
 
-        true_size = size - 37  # 37 - is a system empty string lenght
+        # The additional part with the separator is always stored,
+        # so the empty part between two separators marks only the token
+        return f"{prefix}{separator}{separator}{token}"
 
-        if true_size < 64:
+    @staticmethod
+    def _get_fit_status(callback_data: str) -> bool:
+        if len(callback_data) * 4 <= Const.CALLBACK_DATA_MAX_BYTES:
+            return True
+
+        return len(callback_data.encode()) <= Const.CALLBACK_DATA_MAX_BYTES
+
+    @staticmethod
+    def _check_callback_data_bytes(callback_data: str) -> bool:
+        if _CallbackData._get_fit_status(callback_data):
             return True
 
         raise TooMoreCharacters
@@ -109,12 +81,25 @@ class _CallbackData:
             *args: Any,
             separator: str = "/") -> str:
 
+        prefix = prefix_registry.to_code(prefix)
         additional = AdditionalInstance(*args)
 
         callback_data = self._get_str_callback_data(
             prefix, additional, separator
         )
 
+        has_separator = separator in additional
+
+        if self.store is None:
+            # The decoder would split the value or read it as the token
+            if has_separator:
+                raise SeparatorInCallbackData
+
+        elif has_separator or not self._get_fit_status(callback_data):
+            callback_data = self._get_token_callback_data(
+                prefix, self.store.put(additional), separator
+            )
+
         self._check_callback_data_bytes(callback_data)
 
         return callback_data
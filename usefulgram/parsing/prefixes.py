@@ -0,0 +1,176 @@
+
+
+import os
+import json
+
+from typing import Optional, Union, Any
+from pathlib import Path
+
+from usefulgram.exceptions import (
+    UndefinedPrefix,
+    PrefixIsCode,
+    PrefixCodeConflict,
+    PrefixCodesAreOver
+)
+
+
+_CODE_DIGITS = (
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+
+
+class PrefixRegistry:
+    """
+    Maps the long callback prefixes to the short codes.
+    The encoder writes the code and the decoder returns the long prefix,
+    so the filters do not see the codes at all.
+
+    The mapping is saved to the file, so the codes stay the same
+    between the deploys and the buttons in chats keep working
+    """
+
+    _codes: dict[str, str]
+    _prefixes: dict[str, str]
+    _path: Optional[Path]
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self._codes = {}
+        self._prefixes = {}
+        self._path = None
+
+        if path is not None:
+            self.load(path)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """
+        Load the saved codes. New registered prefixes are saved there too.
+        The saved codes must not conflict with the registered ones
+        :param path: json file, it is created if it does not exist
+        """
+
+        self._path = Path(path)
+
+        if not self._path.exists():
+            return
+
+        with self._path.open(encoding="utf-8") as file:
+            codes: dict[str, str] = json.load(file)
+
+        new_codes = dict(self._codes)
+        new_prefixes = dict(self._prefixes)
+
+        for prefix, code in codes.items():
+            if new_codes.get(prefix, code) != code:
+                raise PrefixCodeConflict
+
+            if new_prefixes.get(code, prefix) != prefix:
+                raise PrefixCodeConflict
+
+            new_codes[prefix] = code
+            new_prefixes[code] = prefix
+
+        # The decoder would return the prefix of the code instead
+        if any(code in new_codes for code in new_prefixes):
+            raise PrefixCodeConflict
+
+        self._codes = new_codes
+        self._prefixes = new_prefixes
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+
+        temp_path = self._path.with_name(f"{self._path.name}.tmp")
+
+        with temp_path.open("w", encoding="utf-8") as file:
+            json.dump(self._codes, file, ensure_ascii=False, indent=4)
+
+        os.replace(temp_path, self._path)
+
+    @staticmethod
+    def _get_code_by_number(number: int) -> str:
+        base = len(_CODE_DIGITS)
+
+        if number < base:
+            return _CODE_DIGITS[number]
+
+        first, second = divmod(number - base, base)
+
+        if first >= base:
+            raise PrefixCodesAreOver
+
+        return f"{_CODE_DIGITS[first]}{_CODE_DIGITS[second]}"
+
+    def _get_free_code(self) -> str:
+        number = len(self._prefixes)
+
+        while True:
+            code = self._get_code_by_number(number)
+
+            if code not in self._prefixes and code not in self._codes:
+                return code
+
+            number += 1
+
+    @staticmethod
+    def _get_prefix(item: Union[str, Any]) -> str:
+        if isinstance(item, str):
+            return item
+
+        prefix_field = item.model_fields.get("prefix")
+
+        if prefix_field is None or not isinstance(prefix_field.default, str):
+            raise UndefinedPrefix
+
+        return prefix_field.default
+
+    def register(self, *items: Union[str, Any]) -> None:
+        """
+        Give the short codes to the prefixes.
+        Call it once at startup, before the keyboards are built
+        :param items: prefixes or BasePydanticFilter classes
+        with the default prefix
+        """
+
+        is_changed = False
+
+        for item in items:
+            prefix = self._get_prefix(item)
+
+            if prefix in self._codes:
+                continue
+
+            if prefix in self._prefixes:
+                raise PrefixIsCode
+
+            code = self._get_free_code()
+
+            self._codes[prefix] = code
+            self._prefixes[code] = prefix
+
+            is_changed = True
+
+        if is_changed:
+            self._save()
+
+    def to_code(self, prefix: str) -> str:
+        code = self._codes.get(prefix)
+
+        if code is not None:
+            return code
+
+        # Otherwise the decoder would return the registered prefix
+        if prefix in self._prefixes:
+            raise PrefixIsCode
+
+        return prefix
+
+    def to_prefix(self, code: str) -> str:
+        return self._prefixes.get(code, code)
+
+    def clear(self) -> None:
+        self._codes.clear()
+        self._prefixes.clear()
+
+
+prefix_registry = PrefixRegistry()
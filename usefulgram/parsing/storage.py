@@ -0,0 +1,279 @@
+
+
+import time
+import sqlite3
+import hashlib
+
+from base64 import urlsafe_b64encode
+from collections import OrderedDict
+from typing import Optional, Union
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from usefulgram.enums import Const
+
+
+class PayloadStoreStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"PayloadStoreStats(hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions}, expirations={self.expirations})"
+        )
+
+
+class BasePayloadStore(ABC):
+    """
+    Keeps the callback data which does not fit into 64 bytes.
+    The callback data gets a short token instead of the payload
+    """
+
+    stats: PayloadStoreStats
+
+    @staticmethod
+    def get_token(payload: str) -> str:
+        # The same payload always gets the same token,
+        # so a menu which is shown again does not grow the store
+        digest = hashlib.blake2b(
+            payload.encode(), digest_size=Const.PAYLOAD_TOKEN_BYTES
+        ).digest()
+
+        return urlsafe_b64encode(digest).decode().rstrip("=")
+
+    @abstractmethod
+    def put(self, payload: str) -> str:
+        """
+        Save the payload
+        :param payload: callback data additional string
+        :return: token
+        """
+        pass
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[str]:
+        """
+        :param token:
+        :return: payload or None if it was evicted or expired
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryPayloadStore(BasePayloadStore):
+    """
+    In-memory LRU store. Every access refreshes the ttl,
+    so the least recently used entry is also the first to expire
+    """
+
+    _data: "OrderedDict[str, tuple[str, float]]"
+    _maxsize: int
+    _ttl: float
+
+    def __init__(
+            self,
+            maxsize: int = Const.PAYLOAD_STORE_MAXSIZE,
+            ttl: float = Const.PAYLOAD_STORE_TTL
+    ):
+
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+        self.stats = PayloadStoreStats()
+
+    def _remove_expired(self, now: float) -> None:
+        data = self._data
+
+        while data:
+            token, (_, expires_at) = next(iter(data.items()))
+
+            if expires_at > now:
+                return
+
+            del data[token]
+
+            self.stats.expirations += 1
+
+    def put(self, payload: str) -> str:
+        token = self.get_token(payload)
+        now = time.monotonic()
+
+        self._remove_expired(now)
+
+        self._data[token] = (payload, now + self._ttl)
+        self._data.move_to_end(token)
+
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+            self.stats.evictions += 1
+
+        return token
+
+    def get(self, token: str) -> Optional[str]:
+        item = self._data.get(token)
+        now = time.monotonic()
+
+        if item is None:
+            self.stats.misses += 1
+
+            return None
+
+        payload, expires_at = item
+
+        if expires_at <= now:
+            del self._data[token]
+
+            self.stats.expirations += 1
+            self.stats.misses += 1
+
+            return None
+
+        self._data[token] = (payload, now + self._ttl)
+        self._data.move_to_end(token)
+
+        self.stats.hits += 1
+
+        return payload
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLitePayloadStore(BasePayloadStore):
+    """
+    Local SQLite store. Tokens survive the bot restarts,
+    so the old buttons keep working after a deploy
+    """
+
+    _connection: sqlite3.Connection
+    _maxsize: int
+    _ttl: float
+    _puts_before_trim: int
+
+    def __init__(
+            self,
+            path: Union[str, Path],
+            maxsize: int = Const.PAYLOAD_STORE_MAXSIZE,
+            ttl: float = Const.PAYLOAD_STORE_TTL
+    ):
+
+        self._connection = sqlite3.connect(
+            str(path), isolation_level=None, check_same_thread=False
+        )
+
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS payloads ("
+            "token TEXT PRIMARY KEY, "
+            "payload TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS payloads_expires_at "
+            "ON payloads (expires_at)"
+        )
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._puts_before_trim = 0
+
+        self.stats = PayloadStoreStats()
+
+    def _trim(self, now: float) -> None:
+        cursor = self._connection.execute(
+            "DELETE FROM payloads WHERE expires_at <= ?", (now,)
+        )
+
+        self.stats.expirations += max(cursor.rowcount, 0)
+
+        overflow = len(self) - self._maxsize
+
+        if overflow <= 0:
+            return
+
+        self._connection.execute(
+            "DELETE FROM payloads WHERE token IN ("
+            "SELECT token FROM payloads ORDER BY expires_at LIMIT ?)",
+            (overflow,)
+        )
+
+        self.stats.evictions += overflow
+
+    def put(self, payload: str) -> str:
+        token = self.get_token(payload)
+        now = time.time()
+
+        self._connection.execute(
+            "INSERT INTO payloads (token, payload, expires_at) "
+            "VALUES (?, ?, ?) ON CONFLICT (token) "
+            "DO UPDATE SET expires_at = excluded.expires_at",
+            (token, payload, now + self._ttl)
+        )
+
+        # The size is checked in batches, so a put is a single statement
+        self._puts_before_trim -= 1
+
+        if self._puts_before_trim <= 0:
+            self._puts_before_trim = max(self._maxsize // 100, 1)
+
+            self._trim(now)
+
+        return token
+
+    def get(self, token: str) -> Optional[str]:
+        now = time.time()
+
+        row = self._connection.execute(
+            "SELECT payload, expires_at FROM payloads WHERE token = ?",
+            (token,)
+        ).fetchone()
+
+        if row is None:
+            self.stats.misses += 1
+
+            return None
+
+        payload, expires_at = row
+
+        if expires_at <= now:
+            self._connection.execute(
+                "DELETE FROM payloads WHERE token = ?", (token,)
+            )
+
+            self.stats.expirations += 1
+            self.stats.misses += 1
+
+            return None
+
+        self._connection.execute(
+            "UPDATE payloads SET expires_at = ? WHERE token = ?",
+            (now + self._ttl, token)
+        )
+
+        self.stats.hits += 1
+
+        return payload
+
+    def __len__(self) -> int:
+        row = self._connection.execute(
+            "SELECT COUNT(*) FROM payloads"
+        ).fetchone()
+
+        return row[0]
+
+    def close(self) -> None:
+        self._connection.close()
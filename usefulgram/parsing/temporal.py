@@ -0,0 +1,262 @@
+
+
+from typing import Callable, Optional, Union
+from datetime import datetime, date, time
+
+from usefulgram.enums import Const
+
+
+FIXED_DATETIME_FORMAT = "%Y%m%d%H%M%S"
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_DIGIT_VALUES = {digit: value for value, digit in enumerate(_DIGITS)}
+
+# Seconds since the epoch fit in 7 base-62 digits up to the year 9999
+_COMPACT_MAX_LENGTH = 7
+
+# The numbers do not start with it and the words which start with it
+# are escaped, so the compact values are not taken for the other types
+# of a Union
+_COMPACT_MARKER = "~"
+
+_SECONDS_IN_DAY = 86400
+
+
+class TemporalCodec:
+    """
+    Converts datetime, date and time objects to the callback data strings
+    and back. The default fixed-width format is sliced into integers
+    directly, any other format falls back to strftime and strptime.
+
+    The compact mode writes base-N numbers instead: days since the epoch
+    for date, seconds of the day for time and seconds since the epoch
+    for datetime. The numbers start with "~" and the strings which
+    start with it get one more "~", so in Union[date, int]
+    or Union[date, str] the numbers and the words stay as they are.
+    Values in the fixed-width format are still decoded,
+    so the mode can be enabled with the old buttons in chats
+    """
+
+    datetime_format: str
+    is_fixed: bool
+    compact: bool
+    base: int
+    epoch_ordinal: int
+
+    def __init__(
+            self,
+            datetime_format: str = Const.DATETIME_FORMAT,
+            compact: bool = False,
+            epoch: date = Const.COMPACT_TEMPORAL_EPOCH,
+            base: int = Const.COMPACT_TEMPORAL_BASE
+    ):
+
+        if not 2 <= base <= len(_DIGITS):
+            raise ValueError(f"The base must be from 2 to {len(_DIGITS)}")
+
+        self.datetime_format = datetime_format
+        self.is_fixed = datetime_format == FIXED_DATETIME_FORMAT
+        self.compact = compact
+        self.base = base
+        self.epoch_ordinal = epoch.toordinal()
+
+    @staticmethod
+    def is_fixed_datetime(value: str) -> bool:
+        return len(value) == 14 and value.isdecimal()
+
+    @staticmethod
+    def is_compact_number(value: str) -> bool:
+        if value[0] != _COMPACT_MARKER:
+            return False
+
+        value = value[1:]
+
+        if value[:1] == "-":
+            value = value[1:]
+
+        return (
+            0 < len(value) <= _COMPACT_MAX_LENGTH
+            and value.isascii()
+            and value.isalnum()
+        )
+
+    def _is_temporal(self, value: str) -> bool:
+        return self.is_fixed_datetime(value) or self.is_compact_number(value)
+
+    def get_check(self) -> Optional[Callable[[str], bool]]:
+        if self.compact and self.is_fixed:
+            return self._is_temporal
+
+        if self.compact:
+            return self.is_compact_number
+
+        if self.is_fixed:
+            return self.is_fixed_datetime
+
+        return None
+
+    # Strings
+
+    @staticmethod
+    def escape_str(value: str) -> str:
+        # "~~" is never the compact number
+        if value[:1] == _COMPACT_MARKER:
+            return f"{_COMPACT_MARKER}{value}"
+
+        return value
+
+    @staticmethod
+    def unescape_str(value: str) -> str:
+        if value[:1] == _COMPACT_MARKER:
+            return value[1:]
+
+        return value
+
+    # Base-N numbers
+
+    def _number_to_str(self, number: int) -> str:
+        return f"{_COMPACT_MARKER}{self._digits_to_str(number)}"
+
+    def _digits_to_str(self, number: int) -> str:
+        if number < 0:
+            return f"-{self._digits_to_str(-number)}"
+
+        base = self.base
+        digits = []
+
+        while True:
+            number, digit = divmod(number, base)
+            digits.append(_DIGITS[digit])
+
+            if number == 0:
+                return "".join(reversed(digits))
+
+    def _str_to_number(self, value: str) -> int:
+        if value[0] == _COMPACT_MARKER:
+            value = value[1:]
+
+        if value[0] == "-":
+            return -self._str_to_number(value[1:])
+
+        base = self.base
+        number = 0
+
+        for char in value:
+            digit = _DIGIT_VALUES.get(char, base)
+
+            if digit >= base:
+                raise ValueError(f"Wrong compact temporal value: {value}")
+
+            number = number * base + digit
+
+        return number
+
+    # Formatting
+
+    def datetime_to_str(self, item: datetime) -> str:
+        if self.compact:
+            days = item.toordinal() - self.epoch_ordinal
+            seconds = item.hour * 3600 + item.minute * 60 + item.second
+
+            return self._number_to_str(days * _SECONDS_IN_DAY + seconds)
+
+        if not self.is_fixed:
+            return item.strftime(self.datetime_format)
+
+        return "%04d%02d%02d%02d%02d%02d" % (
+            item.year, item.month, item.day,
+            item.hour, item.minute, item.second
+        )
+
+    def date_to_str(self, item: date) -> str:
+        if self.compact:
+            return self._number_to_str(item.toordinal() - self.epoch_ordinal)
+
+        if not self.is_fixed:
+            return item.strftime(self.datetime_format)
+
+        return "%04d%02d%02d000000" % (item.year, item.month, item.day)
+
+    def time_to_str(self, item: time) -> str:
+        if self.compact:
+            return self._number_to_str(
+                item.hour * 3600 + item.minute * 60 + item.second
+            )
+
+        if not self.is_fixed:
+            return item.strftime(self.datetime_format)
+
+        # strftime uses 1900-01-01 as the date of a time object
+        return "19000101%02d%02d%02d" % (item.hour, item.minute, item.second)
+
+    def to_str(self, item: Union[datetime, date, time]) -> str:
+        if isinstance(item, datetime):
+            return self.datetime_to_str(item)
+
+        if isinstance(item, date):
+            return self.date_to_str(item)
+
+        return self.time_to_str(item)
+
+    # Parsing
+
+    def _to_fixed_datetime(self, value: str) -> Optional[datetime]:
+        if not self.is_fixed or not self.is_fixed_datetime(value):
+            return None
+
+        return datetime(
+            int(value[0:4]), int(value[4:6]), int(value[6:8]),
+            int(value[8:10]), int(value[10:12]), int(value[12:14])
+        )
+
+    def _get_compact_number(self, value: str) -> Optional[int]:
+        if not self.compact or not self.is_compact_number(value):
+            return None
+
+        return self._str_to_number(value)
+
+    def _date_from_days(self, days: int) -> date:
+        return date.fromordinal(self.epoch_ordinal + days)
+
+    @staticmethod
+    def _time_from_seconds(seconds: int) -> time:
+        if not 0 <= seconds < _SECONDS_IN_DAY:
+            raise ValueError(f"Wrong compact time value: {seconds}")
+
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+
+        return time(hour, minute, second)
+
+    def to_datetime(self, value: str) -> datetime:
+        fixed_datetime = self._to_fixed_datetime(value)
+
+        if fixed_datetime is not None:
+            return fixed_datetime
+
+        number = self._get_compact_number(value)
+
+        if number is not None:
+            days, seconds = divmod(number, _SECONDS_IN_DAY)
+
+            return datetime.combine(
+                self._date_from_days(days), self._time_from_seconds(seconds)
+            )
+
+        return datetime.strptime(value, self.datetime_format)
+
+    def to_date(self, value: str) -> date:
+        number = self._get_compact_number(value)
+
+        if number is not None:
+            return self._date_from_days(number)
+
+        return self.to_datetime(value).date()
+
+    def to_time(self, value: str) -> time:
+        number = self._get_compact_number(value)
+
+        if number is not None:
+            return self._time_from_seconds(number)
+
+        return self.to_datetime(value).time()
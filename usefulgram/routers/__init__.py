@@ -0,0 +1,3 @@
+
+
+from .prefix_router import PrefixRouter, PrefixEventObserver
@@ -0,0 +1,143 @@
+
+
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from aiogram import Router
+from aiogram.types import TelegramObject
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+
+from usefulgram.parsing.decode import DecodeCallbackData
+from usefulgram.filters.parse_filters import (
+    BasePydanticFilter,
+    CallbackPrefixFilter
+)
+
+
+class PrefixEventObserver(TelegramEventObserver):
+    """
+    Callback query observer which keeps the handlers indexed by prefix.
+    An event is checked only by the handlers with the same prefix
+    and the handlers which filters do not depend on the prefix,
+    in the order of registration
+    """
+
+    _all_handlers: list[HandlerObject]
+    _handler_prefixes: list[Optional[str]]
+    _candidates: dict[str, list[HandlerObject]]
+    _any_prefix_candidates: list[HandlerObject]
+    _current_handlers: ContextVar[Optional[list[HandlerObject]]]
+
+    def __init__(self, router: Router, event_name: str):
+        self._all_handlers = []
+        self._handler_prefixes = []
+        self._candidates = {}
+        self._any_prefix_candidates = []
+        self._current_handlers = ContextVar(
+            f"{event_name}_handlers", default=None
+        )
+
+        super().__init__(router=router, event_name=event_name)
+
+    # The aiogram trigger iterates over self.handlers,
+    # so it gets only the candidates while the event is triggered
+    @property
+    def handlers(self) -> list[HandlerObject]:  # type: ignore
+        current_handlers = self._current_handlers.get()
+
+        if current_handlers is not None:
+            return current_handlers
+
+        return self._all_handlers
+
+    @handlers.setter
+    def handlers(self, value: list[HandlerObject]) -> None:
+        self._all_handlers = value
+        self._handler_prefixes = [None for _ in value]
+
+        self._reset_candidates()
+
+    @staticmethod
+    def _get_filter_prefix(filters: tuple[Any, ...]) -> Optional[str]:
+        for filter_obj in filters:
+            if isinstance(filter_obj, (BasePydanticFilter, CallbackPrefixFilter)):
+                if filter_obj.prefix is not None:
+                    return filter_obj.prefix
+
+        return None
+
+    def _reset_candidates(self) -> None:
+        self._candidates = {}
+        self._any_prefix_candidates = self._get_candidates(None)
+
+    def _get_candidates(self, prefix: Optional[str]) -> list[HandlerObject]:
+        return [
+            handler
+            for handler, handler_prefix in zip(
+                self._all_handlers, self._handler_prefixes
+            )
+            if handler_prefix is None or handler_prefix == prefix
+        ]
+
+    def register(self, callback: Any, *filters: Any, **kwargs: Any) -> Any:
+        result = super().register(callback, *filters, **kwargs)
+
+        # The handler is added to the end of the list by aiogram,
+        # so the candidates lists keep the order of registration
+        handler = self._all_handlers[-1]
+        prefix = self._get_filter_prefix(filters)
+
+        self._handler_prefixes.append(prefix)
+
+        if prefix is None:
+            for candidates in self._candidates.values():
+                candidates.append(handler)
+
+            self._any_prefix_candidates.append(handler)
+
+        elif prefix in self._candidates:
+            self._candidates[prefix].append(handler)
+
+        else:
+            self._candidates[prefix] = self._get_candidates(prefix)
+
+        return result
+
+    def get_candidates(self, prefix: str) -> list[HandlerObject]:
+        # Unknown prefixes are not saved, so the index does not grow
+        # because of the callback data from the users
+        return self._candidates.get(prefix, self._any_prefix_candidates)
+
+    async def trigger(self, event: TelegramObject, **kwargs: Any) -> Any:
+        decoder: Optional[DecodeCallbackData] = kwargs.get("decoder", None)
+
+        if decoder is None:
+            return await super().trigger(event, **kwargs)
+
+        token = self._current_handlers.set(self.get_candidates(decoder.prefix))
+
+        try:
+            return await super().trigger(event, **kwargs)
+
+        finally:
+            self._current_handlers.reset(token)
+
+
+class PrefixRouter(Router):
+    """
+    Router with the callback query handlers indexed by prefix.
+    It needs the decoder from StackerMiddleware,
+    without it the handlers are checked one by one as usual
+    """
+
+    callback_query: PrefixEventObserver
+
+    def __init__(self, *, name: Optional[str] = None):
+        super().__init__(name=name)
+
+        self.callback_query = PrefixEventObserver(
+            router=self, event_name="callback_query"
+        )
+
+        self.observers["callback_query"] = self.callback_query
@@ -0,0 +1,23 @@
+
+
+from .algorithms import (
+    BaseThrottlingAlgorithm,
+    Cooldown,
+    TokenBucket,
+    SlidingWindowCounter,
+    GCRA
+)
+
+from .store import ThrottlingStore
+
+from .backends import (
+    BaseThrottlingBackend,
+    MemoryThrottlingBackend,
+    ThrottlingKey
+)
+
+from .shared_memory import SharedMemoryThrottlingBackend
+
+from .redis_backend import RedisThrottlingBackend
+
+from .policy import ThrottlingPolicy, ThrottlingPolicyTable
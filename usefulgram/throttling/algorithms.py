@@ -0,0 +1,196 @@
+
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+# The state of the key is a few numbers,
+# so it is kept by any storage without the objects of the algorithm
+State = tuple[float, ...]
+
+
+class BaseThrottlingAlgorithm(ABC):
+    """
+    Limit of the events of one key. The algorithm has no state of the keys:
+    it gets the state and returns the new one
+    """
+
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def ttl(self) -> float:
+        """
+        Seconds after the last hit when the state is the same as
+        the missing one, so the state can be removed
+        """
+
+    @property
+    @abstractmethod
+    def parameters(self) -> tuple[float, ...]:
+        """
+        Arguments of the constructor,
+        the shared backends pass them to the server scripts
+        """
+
+    @abstractmethod
+    def hit(self, state: Optional[State], now: float) -> tuple[bool, State]:
+        """
+        :param state: state of the key or None for the new key
+        :param now: monotonic time in seconds
+        :return: is the event allowed and the new state of the key
+        """
+
+
+class Cooldown(BaseThrottlingAlgorithm):
+    """
+    One event per rate_limit. Every event starts the rate_limit again,
+    also the throttled one. It is the behaviour of the old middleware
+    """
+
+    __slots__ = ("_rate_limit",)
+
+    _rate_limit: float
+
+    def __init__(self, rate_limit: float):
+        self._rate_limit = rate_limit
+
+    @property
+    def ttl(self) -> float:
+        return self._rate_limit
+
+    @property
+    def parameters(self) -> tuple[float, ...]:
+        return (self._rate_limit,)
+
+    def hit(self, state: Optional[State], now: float) -> tuple[bool, State]:
+        if state is None:
+            return True, (now,)
+
+        return now - state[0] >= self._rate_limit, (now,)
+
+
+class TokenBucket(BaseThrottlingAlgorithm):
+    """
+    The bucket of burst tokens is filled by rate tokens per second,
+    every event takes one token. State: tokens and the time of the count
+    """
+
+    __slots__ = ("_rate", "_burst")
+
+    _rate: float
+    _burst: int
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._burst = burst
+
+    @property
+    def ttl(self) -> float:
+        return self._burst / self._rate
+
+    @property
+    def parameters(self) -> tuple[float, ...]:
+        return self._rate, self._burst
+
+    def hit(self, state: Optional[State], now: float) -> tuple[bool, State]:
+        if state is None:
+            tokens = float(self._burst)
+
+        else:
+            tokens = min(
+                self._burst, state[0] + (now - state[1]) * self._rate
+            )
+
+        if tokens < 1:
+            return False, (tokens, now)
+
+        return True, (tokens - 1, now)
+
+
+class SlidingWindowCounter(BaseThrottlingAlgorithm):
+    """
+    Limit events per window. The events of the previous window are counted
+    by the part of the previous window which is still in the sliding one.
+    State: number of the window, events in it and in the previous window
+    """
+
+    __slots__ = ("_limit", "_window")
+
+    _limit: int
+    _window: float
+
+    def __init__(self, limit: int, window: float):
+        self._limit = limit
+        self._window = window
+
+    @property
+    def ttl(self) -> float:
+        return self._window * 2
+
+    @property
+    def parameters(self) -> tuple[float, ...]:
+        return self._limit, self._window
+
+    def hit(self, state: Optional[State], now: float) -> tuple[bool, State]:
+        window_number = now // self._window
+
+        if state is None or window_number - state[0] > 1:
+            current, previous = 0.0, 0.0
+
+        elif window_number == state[0]:
+            current, previous = state[1], state[2]
+
+        else:
+            current, previous = 0.0, state[1]
+
+        elapsed = now / self._window - window_number
+        count = previous * (1 - elapsed) + current
+
+        if count >= self._limit:
+            return False, (window_number, current, previous)
+
+        return True, (window_number, current + 1, previous)
+
+
+class GCRA(BaseThrottlingAlgorithm):
+    """
+    Generic cell rate algorithm: the token bucket written
+    as the theoretical arrival time, so the state is one number.
+    The throttled events do not change the state
+    """
+
+    __slots__ = ("_rate", "_burst", "_interval", "_tolerance", "_ttl")
+
+    _rate: float
+    _burst: int
+    _interval: float
+    _tolerance: float
+    _ttl: float
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._burst = burst
+        self._interval = 1 / rate
+        self._tolerance = self._interval * (burst - 1)
+        self._ttl = self._interval * burst
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @property
+    def parameters(self) -> tuple[float, ...]:
+        return self._rate, self._burst
+
+    def hit(self, state: Optional[State], now: float) -> tuple[bool, State]:
+        if state is None:
+            arrival_time = now
+
+        else:
+            arrival_time = max(state[0], now)
+
+        if arrival_time - now > self._tolerance:
+            return False, (arrival_time,)
+
+        return True, (arrival_time + self._interval,)
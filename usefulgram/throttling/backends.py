@@ -0,0 +1,60 @@
+
+
+import time
+
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+from usefulgram.throttling.algorithms import BaseThrottlingAlgorithm
+from usefulgram.throttling.store import ThrottlingStore
+
+
+ThrottlingKey = Union[int, str]
+
+
+class BaseThrottlingBackend(ABC):
+    """
+    Storage of the throttling state. The check and the update
+    of the key are one atomic operation, so the workers
+    with the same backend share the limits
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    async def hit(
+            self,
+            key: ThrottlingKey,
+            algorithm: BaseThrottlingAlgorithm
+    ) -> bool:
+        """
+        Count the event of the key
+        :return: is the event allowed
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryThrottlingBackend(BaseThrottlingBackend):
+    """
+    State in the memory of the process, the limits are not shared
+    """
+
+    __slots__ = ("store",)
+
+    store: ThrottlingStore
+
+    def __init__(self, store: Optional[ThrottlingStore] = None):
+        if store is None:
+            store = ThrottlingStore()
+
+        self.store = store
+
+    async def hit(
+            self,
+            key: ThrottlingKey,
+            algorithm: BaseThrottlingAlgorithm
+    ) -> bool:
+
+        return self.store.hit(key, algorithm, time.monotonic())
@@ -0,0 +1,122 @@
+
+
+from typing import Optional
+
+from usefulgram.enums import ThrottlingKeyType
+from usefulgram.throttling.algorithms import BaseThrottlingAlgorithm
+
+
+class ThrottlingPolicy:
+    """
+    Limit of the handlers and what is limited: the user or the chat.
+    The policy without the algorithm is not throttled
+    """
+
+    __slots__ = ("algorithm", "key_type")
+
+    algorithm: Optional[BaseThrottlingAlgorithm]
+    key_type: ThrottlingKeyType
+
+    def __init__(
+            self,
+            algorithm: Optional[BaseThrottlingAlgorithm],
+            key_type: ThrottlingKeyType = ThrottlingKeyType.USER
+    ):
+
+        self.algorithm = algorithm
+        self.key_type = key_type
+
+
+class ResolvedPolicy:
+    """
+    Policy of the table with the ready beginning of the state keys,
+    the policies have the different keys, so their states are not mixed
+    """
+
+    __slots__ = ("algorithm", "is_chat", "key_prefix")
+
+    algorithm: Optional[BaseThrottlingAlgorithm]
+    is_chat: bool
+    key_prefix: str
+
+    def __init__(self, policy: ThrottlingPolicy, name: str):
+        self.algorithm = policy.algorithm
+        self.is_chat = policy.key_type is ThrottlingKeyType.CHAT
+        self.key_prefix = f"{name}:{policy.key_type.value}:"
+
+    def get_key(
+            self,
+            user_id: Optional[int],
+            chat_id: Optional[int]
+    ) -> Optional[str]:
+
+        # The event without the chat is limited by the user
+        if self.is_chat and chat_id is not None:
+            return f"{self.key_prefix}{chat_id}"
+
+        if user_id is None:
+            return None
+
+        return f"{self.key_prefix}{user_id}"
+
+
+class ThrottlingPolicyTable:
+    """
+    The policies by the handler flags and by the callback prefixes.
+    They are resolved once, so the event costs two dict lookups.
+    The flag is more important than the prefix
+    """
+
+    __slots__ = ("_default", "_prefixes", "_flags")
+
+    _default: ResolvedPolicy
+    _prefixes: dict[str, ResolvedPolicy]
+    _flags: dict[str, ResolvedPolicy]
+
+    def __init__(
+            self,
+            default: ThrottlingPolicy,
+            prefixes: Optional[dict[str, ThrottlingPolicy]] = None,
+            flags: Optional[dict[str, ThrottlingPolicy]] = None
+    ):
+        """
+        :param default: policy of the other events
+        :param prefixes: policies by the prefix of the callback data
+        :param flags: policies by the value of the throttling flag
+        """
+
+        self._default = ResolvedPolicy(default, "default")
+
+        self._prefixes = {
+            prefix: ResolvedPolicy(policy, f"prefix:{prefix}")
+            for prefix, policy in (prefixes or {}).items()
+        }
+
+        self._flags = {
+            flag: ResolvedPolicy(policy, f"flag:{flag}")
+            for flag, policy in (flags or {}).items()
+        }
+
+    @property
+    def has_prefixes(self) -> bool:
+        return bool(self._prefixes)
+
+    def get_policy(
+            self,
+            flag: Optional[str],
+            prefix: Optional[str]
+    ) -> ResolvedPolicy:
+
+        if flag is not None:
+            policy = self._flags.get(flag)
+
+            if policy is not None:
+                return policy
+
+        if prefix is not None:
+            policy = self._prefixes.get(prefix)
+
+            if policy is not None:
+                return policy
+
+        return self._default
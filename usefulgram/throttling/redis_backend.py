@@ -0,0 +1,410 @@
+
+
+import asyncio
+import hashlib
+
+from collections import deque
+from typing import Optional, Any, Union
+
+from usefulgram.enums import Const
+from usefulgram.exceptions import (
+    RedisResponseError,
+    UnknownThrottlingAlgorithm
+)
+from usefulgram.throttling.algorithms import (
+    BaseThrottlingAlgorithm,
+    Cooldown,
+    TokenBucket,
+    SlidingWindowCounter,
+    GCRA
+)
+from usefulgram.throttling.backends import (
+    BaseThrottlingBackend,
+    ThrottlingKey
+)
+
+
+RespValue = Union[str, int, bytes, list[Any], None]
+
+
+# The state is kept as the numbers separated by the spaces,
+# the time is the time of the server, so the workers have the same clock
+_SCRIPT_START = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local ttl = tonumber(ARGV[1])
+local state = nil
+local value = redis.call('GET', KEYS[1])
+
+if value then
+    state = {}
+
+    for number in string.gmatch(value, '%S+') do
+        state[#state + 1] = tonumber(number)
+    end
+end
+"""
+
+_SCRIPT_END = """
+local parts = {}
+
+for index, number in ipairs(new_state) do
+    parts[index] = string.format('%.17g', number)
+end
+
+redis.call(
+    'SET', KEYS[1], table.concat(parts, ' '),
+    'PX', math.max(math.ceil(ttl * 1000), 1)
+)
+
+if allowed then
+    return 1
+end
+
+return 0
+"""
+
+_COOLDOWN_SCRIPT = """
+local rate_limit = tonumber(ARGV[2])
+
+local allowed = state == nil or now - state[1] >= rate_limit
+local new_state = {now}
+"""
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local tokens = burst
+
+if state then
+    tokens = math.min(burst, state[1] + (now - state[2]) * rate)
+end
+
+local allowed = tokens >= 1
+
+if allowed then
+    tokens = tokens - 1
+end
+
+local new_state = {tokens, now}
+"""
+
+_SLIDING_WINDOW_COUNTER_SCRIPT = """
+local limit = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local window_number = math.floor(now / window)
+local current = 0
+local previous = 0
+
+if state and window_number == state[1] then
+    current = state[2]
+    previous = state[3]
+
+elseif state and window_number - state[1] == 1 then
+    previous = state[2]
+end
+
+local elapsed = now / window - window_number
+local allowed = previous * (1 - elapsed) + current < limit
+
+if allowed then
+    current = current + 1
+end
+
+local new_state = {window_number, current, previous}
+"""
+
+_GCRA_SCRIPT = """
+local interval = 1 / tonumber(ARGV[2])
+local tolerance = interval * (tonumber(ARGV[3]) - 1)
+local arrival_time = now
+
+if state then
+    arrival_time = math.max(state[1], now)
+end
+
+local allowed = arrival_time - now <= tolerance
+
+if allowed then
+    arrival_time = arrival_time + interval
+end
+
+local new_state = {arrival_time}
+"""
+
+_SCRIPTS: dict[type, str] = {
+    algorithm: f"{_SCRIPT_START}{script}{_SCRIPT_END}"
+    for algorithm, script in (
+        (Cooldown, _COOLDOWN_SCRIPT),
+        (TokenBucket, _TOKEN_BUCKET_SCRIPT),
+        (SlidingWindowCounter, _SLIDING_WINDOW_COUNTER_SCRIPT),
+        (GCRA, _GCRA_SCRIPT)
+    )
+}
+
+_SCRIPT_HASHES: dict[type, str] = {
+    algorithm: hashlib.sha1(script.encode()).hexdigest()
+    for algorithm, script in _SCRIPTS.items()
+}
+
+
+class _RespConnection:
+    """
+    Connection with the Redis protocol. The commands are written
+    without waiting for the previous answers and the answers
+    are read in the same order by one task
+    """
+
+    __slots__ = (
+        "_host",
+        "_port",
+        "_password",
+        "_db",
+        "_reader",
+        "_writer",
+        "_pending",
+        "_read_task",
+        "_connect_lock",
+        "_is_ready"
+    )
+
+    _reader: Optional[asyncio.StreamReader]
+    _writer: Optional[asyncio.StreamWriter]
+    _pending: deque["asyncio.Future[RespValue]"]
+    _read_task: Optional["asyncio.Task[None]"]
+    _connect_lock: Optional[asyncio.Lock]
+    _is_ready: bool
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            password: Optional[str],
+            db: int
+    ):
+
+        self._host = host
+        self._port = port
+        self._password = password
+        self._db = db
+
+        self._reader = None
+        self._writer = None
+        self._pending = deque()
+        self._read_task = None
+        self._connect_lock = None
+        self._is_ready = False
+
+    @staticmethod
+    def _encode_command(*args: Any) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = f"{arg}".encode()
+
+            parts.append(f"${len(arg)}\r\n".encode())
+            parts.append(arg)
+            parts.append(b"\r\n")
+
+        return b"".join(parts)
+
+    @staticmethod
+    async def _read_reply(reader: asyncio.StreamReader) -> Any:
+        line = await reader.readuntil(b"\r\n")
+
+        reply_type, body = line[:1], line[1:-2]
+
+        if reply_type == b"+":
+            return body.decode()
+
+        if reply_type == b"-":
+            return RedisResponseError(body.decode())
+
+        if reply_type == b":":
+            return int(body)
+
+        if reply_type == b"$":
+            length = int(body)
+
+            if length == -1:
+                return None
+
+            data = await reader.readexactly(length + 2)
+
+            return data[:-2]
+
+        if reply_type == b"*":
+            length = int(body)
+
+            if length == -1:
+                return None
+
+            return [
+                await _RespConnection._read_reply(reader)
+                for _ in range(length)
+            ]
+
+        raise RedisResponseError(f"Unknown reply type {reply_type!r}")
+
+    async def _read_replies(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                reply = await self._read_reply(reader)
+                future = self._pending.popleft()
+
+                if future.done():
+                    continue
+
+                if isinstance(reply, RedisResponseError):
+                    future.set_exception(reply)
+
+                else:
+                    future.set_result(reply)
+
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            error: Exception = ConnectionError(f"Redis connection lost: {e}")
+
+        except Exception as e:
+            error = e
+
+        self._disconnect(error)
+
+    def _disconnect(self, error: Exception) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+        self._is_ready = False
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+
+        while self._pending:
+            future = self._pending.popleft()
+
+            if not future.done():
+                future.set_exception(error)
+
+    def _send(self, *args: Any) -> "asyncio.Future[RespValue]":
+        future = asyncio.get_running_loop().create_future()
+
+        self._pending.append(future)
+        self._writer.write(self._encode_command(*args))  # type: ignore
+
+        return future
+
+    async def _connect(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self._is_ready:
+                return
+
+            reader, writer = await asyncio.open_connection(
+                self._host, self._port
+            )
+
+            self._reader = reader
+            self._writer = writer
+            self._read_task = asyncio.create_task(self._read_replies(reader))
+
+            try:
+                if self._password is not None:
+                    await self._send("AUTH", self._password)
+
+                if self._db != 0:
+                    await self._send("SELECT", self._db)
+
+            # The commands must not go to the wrong database
+            except Exception as e:
+                await self._close(e)
+
+                raise
+
+            self._is_ready = True
+
+    async def execute(self, *args: Any) -> RespValue:
+        if not self._is_ready:
+            await self._connect()
+
+        return await self._send(*args)
+
+    async def _close(self, error: Exception) -> None:
+        read_task = self._read_task
+
+        self._disconnect(error)
+
+        if read_task is not None:
+            read_task.cancel()
+
+    async def close(self) -> None:
+        await self._close(ConnectionError("Redis connection is closed"))
+
+
+class RedisThrottlingBackend(BaseThrottlingBackend):
+    """
+    State in Redis or in any server with the Redis protocol.
+    Every algorithm is a Lua script, so the check and the update
+    are one EVALSHA. The script is sent by EVAL only if the server
+    does not know it yet. The scripts read the server time,
+    so Redis 5 or newer is needed
+    """
+
+    __slots__ = ("_connection", "_prefix")
+
+    _connection: _RespConnection
+    _prefix: str
+
+    def __init__(
+            self,
+            host: str = "localhost",
+            port: int = 6379,
+            password: Optional[str] = None,
+            db: int = 0,
+            prefix: str = Const.REDIS_THROTTLING_PREFIX
+    ):
+
+        self._connection = _RespConnection(host, port, password, db)
+        self._prefix = prefix
+
+    @staticmethod
+    def _get_script(algorithm: BaseThrottlingAlgorithm) -> tuple[str, str]:
+        algorithm_type = type(algorithm)
+
+        script = _SCRIPTS.get(algorithm_type)
+
+        if script is None:
+            raise UnknownThrottlingAlgorithm
+
+        return script, _SCRIPT_HASHES[algorithm_type]
+
+    async def hit(
+            self,
+            key: ThrottlingKey,
+            algorithm: BaseThrottlingAlgorithm
+    ) -> bool:
+
+        script, script_hash = self._get_script(algorithm)
+
+        arguments = (
+            1, f"{self._prefix}{key}", algorithm.ttl, *algorithm.parameters
+        )
+
+        try:
+            result = await self._connection.execute(
+                "EVALSHA", script_hash, *arguments
+            )
+
+        except RedisResponseError as e:
+            if not e.message.startswith("NOSCRIPT"):
+                raise
+
+            result = await self._connection.execute(
+                "EVAL", script, *arguments
+            )
+
+        return result == 1
+
+    async def close(self) -> None:
+        await self._connection.close()
@@ -0,0 +1,258 @@
+
+
+import os
+import sys
+import time
+import errno
+import asyncio
+import struct
+import hashlib
+import tempfile
+
+from multiprocessing import shared_memory, resource_tracker
+from typing import Optional
+
+try:
+    import fcntl
+
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+from usefulgram.enums import Const
+from usefulgram.exceptions import (
+    SharedMemoryIsUnavailable,
+    SharedMemoryIsTooSmall
+)
+from usefulgram.throttling.algorithms import BaseThrottlingAlgorithm, State
+from usefulgram.throttling.backends import (
+    BaseThrottlingBackend,
+    ThrottlingKey
+)
+
+
+# The longest state of the algorithms
+_STATE_SIZE = 3
+
+# Digest of the key, expire time, size of the state and the state
+_SLOT = struct.Struct(f"<16sdB{_STATE_SIZE}d")
+
+_EMPTY_STATE = (0.0,) * _STATE_SIZE
+
+
+class SharedMemoryThrottlingBackend(BaseThrottlingBackend):
+    """
+    Hash table in the shared memory for the workers on one host.
+
+    The table is split into the sets of a few slots, the key lives
+    only in its set. The set is locked by fcntl for the check and
+    the update, so the other sets are not blocked. The expired slots
+    are reused, when the set is full the slot which expires first
+    is replaced.
+
+    The first worker creates the memory, the others open it.
+    The memory stays after the exit of the workers until unlink()
+    """
+
+    __slots__ = (
+        "_memory",
+        "_lock_path",
+        "_lock_fd",
+        "_sets_count",
+        "_set_size"
+    )
+
+    _memory: shared_memory.SharedMemory
+    _lock_path: str
+    _lock_fd: int
+    _sets_count: int
+    _set_size: int
+
+    def __init__(
+            self,
+            name: str,
+            capacity: int = Const.SHARED_THROTTLING_CAPACITY,
+            set_size: int = Const.SHARED_THROTTLING_SET_SIZE,
+            lock_path: Optional[str] = None
+    ):
+        """
+        :param name: name of the memory, the same for all the workers
+        :param capacity: slots of the table, the same for all the workers
+        :param set_size: slots of the key set
+        :param lock_path: file of the locks, in the temp dir by default
+        """
+
+        if fcntl is None:
+            raise SharedMemoryIsUnavailable
+
+        self._set_size = set_size
+        self._sets_count = max(capacity // set_size, 1)
+
+        size = self._sets_count * set_size * _SLOT.size
+
+        self._memory = self._open_memory(name, size)
+
+        if self._memory.size < size:
+            self._memory.close()
+
+            raise SharedMemoryIsTooSmall
+
+        if lock_path is None:
+            lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+
+        self._lock_path = lock_path
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    @staticmethod
+    def _open_memory(name: str, size: int) -> shared_memory.SharedMemory:
+        # The memory is shared by the workers,
+        # so the exit of one worker must not remove it
+        if sys.version_info >= (3, 13):
+            try:
+                return shared_memory.SharedMemory(
+                    name, create=True, size=size, track=False
+                )
+
+            except FileExistsError:
+                return shared_memory.SharedMemory(name, track=False)
+
+        try:
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+
+        except FileExistsError:
+            memory = shared_memory.SharedMemory(name)
+
+        resource_tracker.unregister(memory._name, "shared_memory")
+
+        return memory
+
+    @staticmethod
+    def _get_digest(key: ThrottlingKey) -> bytes:
+        # The hash of the str is different in every process
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+    def _get_set_number(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self._sets_count
+
+    def _hit_in_set(
+            self,
+            set_number: int,
+            digest: bytes,
+            algorithm: BaseThrottlingAlgorithm,
+            now: float
+    ) -> bool:
+
+        buffer = self._memory.buf
+        slot_size = _SLOT.size
+        first_offset = set_number * self._set_size * slot_size
+
+        state: Optional[State] = None
+        target_offset: Optional[int] = None
+        free_offset: Optional[int] = None
+        oldest_offset = first_offset
+        oldest_expire_time = float("inf")
+
+        for slot_number in range(self._set_size):
+            offset = first_offset + slot_number * slot_size
+
+            slot_digest, expire_time, state_size, *slot_state = (
+                _SLOT.unpack_from(buffer, offset)
+            )
+
+            if slot_digest == digest:
+                target_offset = offset
+
+                if expire_time > now:
+                    state = tuple(slot_state[:state_size])
+
+                break
+
+            # The empty slots have the zero expire time
+            if expire_time <= now:
+                if free_offset is None:
+                    free_offset = offset
+
+            elif expire_time < oldest_expire_time:
+                oldest_offset = offset
+                oldest_expire_time = expire_time
+
+        if target_offset is None:
+            if free_offset is not None:
+                target_offset = free_offset
+
+            else:
+                target_offset = oldest_offset
+
+        is_allowed, new_state = algorithm.hit(state, now)
+
+        _SLOT.pack_into(
+            buffer,
+            target_offset,
+            digest,
+            now + algorithm.ttl,
+            len(new_state),
+            *(new_state + _EMPTY_STATE)[:_STATE_SIZE]
+        )
+
+        return is_allowed
+
+    def _try_lock_set(self, set_number: int) -> bool:
+        try:
+            fcntl.lockf(
+                self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, set_number
+            )
+
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EAGAIN):
+                return False
+
+            raise
+
+        return True
+
+    async def _lock_set(self, set_number: int) -> None:
+        # The byte of the lock file is the lock of the set.
+        # The lock is not waited in the call, so the event loop is not blocked
+        while not self._try_lock_set(set_number):
+            await asyncio.sleep(Const.SHARED_THROTTLING_LOCK_RETRY_SECONDS)
+
+    async def hit(
+            self,
+            key: ThrottlingKey,
+            algorithm: BaseThrottlingAlgorithm
+    ) -> bool:
+
+        digest = self._get_digest(key)
+        set_number = self._get_set_number(digest)
+
+        await self._lock_set(set_number)
+
+        try:
+            # The monotonic clock is the same for the processes of the host
+            return self._hit_in_set(
+                set_number, digest, algorithm, time.monotonic()
+            )
+
+        finally:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, set_number)
+
+    async def close(self) -> None:
+        self._memory.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """
+        Remove the memory and the lock file, after it the workers
+        which are still open keep the old table
+        """
+
+        if sys.version_info < (3, 13):
+            # unlink() removes the memory from the tracker
+            resource_tracker.register(self._memory._name, "shared_memory")
+
+        self._memory.unlink()
+
+        try:
+            os.remove(self._lock_path)
+
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,177 @@
+
+
+import heapq
+
+from typing import Optional, Hashable
+
+from usefulgram.enums import Const
+from usefulgram.throttling.algorithms import BaseThrottlingAlgorithm, State
+
+
+class ThrottlingStore:
+    """
+    In-process state of the throttling keys without the size limit.
+
+    The keys are grouped into the buckets by the expire time,
+    the heap keeps only the numbers of the buckets. The old buckets
+    are removed lazily by the next calls, so the expiry costs
+    nothing per key until the whole bucket is old
+    """
+
+    __slots__ = (
+        "_entries",
+        "_buckets",
+        "_bucket_heap",
+        "_bucket_seconds",
+        "_maxsize",
+        "expired",
+        "evicted"
+    )
+
+    _entries: dict[Hashable, tuple[int, State]]
+    _buckets: dict[int, set[Hashable]]
+    _bucket_heap: list[int]
+    _bucket_seconds: float
+    _maxsize: Optional[int]
+
+    expired: int
+    evicted: int
+
+    def __init__(
+            self,
+            maxsize: Optional[int] = None,
+            bucket_seconds: float = Const.THROTTLING_BUCKET_SECONDS
+    ):
+        """
+        :param maxsize: None for the store which grows with the users,
+        else the keys which expire first are evicted
+        :param bucket_seconds: the keys live up to this time
+        after the expire time
+        """
+
+        self._entries = {}
+        self._buckets = {}
+        self._bucket_heap = []
+        self._bucket_seconds = bucket_seconds
+        self._maxsize = maxsize
+
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def occupancy(self) -> int:
+        return len(self._entries)
+
+    def _get_bucket_number(self, time: float) -> int:
+        return int(time // self._bucket_seconds)
+
+    def _pop_bucket(self) -> set[Hashable]:
+        bucket_number = heapq.heappop(self._bucket_heap)
+        keys = self._buckets.pop(bucket_number)
+
+        for key in keys:
+            del self._entries[key]
+
+        return keys
+
+    def _remove_expired(self, now: float) -> None:
+        bucket_heap = self._bucket_heap
+        now_bucket = self._get_bucket_number(now)
+
+        # The bucket has the keys which expire before its end
+        while bucket_heap and bucket_heap[0] < now_bucket:
+            self.expired += len(self._pop_bucket())
+
+    def _evict(self) -> None:
+        if self._maxsize is None:
+            return
+
+        while len(self._entries) > self._maxsize and self._bucket_heap:
+            self.evicted += len(self._pop_bucket())
+
+    def _move_key(
+            self,
+            key: Hashable,
+            old_bucket_number: Optional[int],
+            bucket_number: int
+    ) -> None:
+
+        if old_bucket_number == bucket_number:
+            return
+
+        if old_bucket_number is not None:
+            self._buckets[old_bucket_number].discard(key)
+
+        bucket = self._buckets.get(bucket_number)
+
+        if bucket is None:
+            bucket = set()
+
+            self._buckets[bucket_number] = bucket
+            heapq.heappush(self._bucket_heap, bucket_number)
+
+        bucket.add(key)
+
+    def _set_entry(
+            self,
+            key: Hashable,
+            entry: Optional[tuple[int, State]],
+            state: State,
+            expire_time: float
+    ) -> None:
+
+        old_bucket_number = None if entry is None else entry[0]
+        bucket_number = self._get_bucket_number(expire_time)
+
+        self._move_key(key, old_bucket_number, bucket_number)
+        self._entries[key] = (bucket_number, state)
+
+        self._evict()
+
+    def get(self, key: Hashable, now: float) -> Optional[State]:
+        self._remove_expired(now)
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        return entry[1]
+
+    def set(
+            self,
+            key: Hashable,
+            state: State,
+            expire_time: float,
+            now: float
+    ) -> None:
+
+        self._remove_expired(now)
+
+        self._set_entry(key, self._entries.get(key), state, expire_time)
+
+    def hit(
+            self,
+            key: Hashable,
+            algorithm: BaseThrottlingAlgorithm,
+            now: float
+    ) -> bool:
+        """
+        Count the event of the key
+        :return: is the event allowed
+        """
+
+        self._remove_expired(now)
+
+        entry = self._entries.get(key)
+
+        is_allowed, state = algorithm.hit(
+            None if entry is None else entry[1], now
+        )
+
+        self._set_entry(key, entry, state, now + algorithm.ttl)
+
+        return is_allowed
@@ -1,11 +1,16 @@
 
 
+import asyncio
 import calendar as python_calendar
+from functools import lru_cache
 from typing import Optional, Iterable, Coroutine, Any, Union
 from datetime import datetime, date
 
+from cachetools import LRUCache
+
 from aiogram.types import InlineKeyboardMarkup, Message
 
+from usefulgram.enums import Const
 from usefulgram.enums.calendar import CalendarEnum
 from usefulgram.lazy import LazySender, LazyEditor
 from usefulgram.keyboard import Builder, Row, Button
@@ -18,7 +23,27 @@ from usefulgram.utils.calendar_manager.filters import (
 from usefulgram.utils.calendar_manager.model import BaseCalendar, en_calendar
 
 
+# year, month, weekdays, result class, its fields without the date, today
+_MarkupKey = tuple[int, int, tuple[str, ...], type, str, date]
+
+
+_month_calendar = python_calendar.Calendar()
+
+
 class Calendar:
+    _markups: LRUCache
+    _markups_date: Optional[date]
+    _tasks: set["asyncio.Task[None]"]
+    _headings: dict[tuple[str, ...], Row]
+    _empty_button: Optional[Button]
+
+    def __init__(self):
+        self._markups = LRUCache(maxsize=Const.CALENDAR_CACHE_SIZE)
+        self._markups_date = None
+        self._tasks = set()
+        self._headings = {}
+        self._empty_button = None
+
     @staticmethod
     def _get_minus_month_and_year(month: int, year: int) -> tuple[int, int]:
         if month - 1 < 1:
@@ -46,19 +71,31 @@ class Calendar:
         else:
             text = "⇦"
 
-        return Button(text, CalendarChangeButton(year=year, month=month))
+        return Button.trusted(
+            text, CalendarChangeButton(year=year, month=month)
+        )
 
-    @staticmethod
-    def _get_heading(weekdays: Iterable[str]) -> Row:
-        heading_buttons = []
+    def _get_heading(self, weekdays: tuple[str, ...]) -> Row:
+        heading = self._headings.get(weekdays)
+
+        if heading is not None:
+            return heading
+
+        info_button = CalendarInfoButton(button_type=CalendarEnum.WEEKDAY)
 
-        for day in weekdays:
-            heading_buttons.append(
-                Button(
-                    day, CalendarInfoButton(button_type=CalendarEnum.WEEKDAY))
+        heading = Row(*(Button.trusted(day, info_button) for day in weekdays))
+
+        self._headings[weekdays] = heading
+
+        return heading
+
+    def _get_empty_button(self) -> Button:
+        if self._empty_button is None:
+            self._empty_button = Button.trusted(
+                " ", CalendarInfoButton(button_type=CalendarEnum.EMPTY)
             )
 
-        return Row(*heading_buttons)
+        return self._empty_button
 
     @staticmethod
     def _get_format_date(month: int, year: int) -> str:
@@ -67,24 +104,29 @@ class Calendar:
     def _get_format_date_button(self, month: int, year: int) -> Button:
         text = self._get_format_date(month, year)
 
-        return Button(text, CalendarInfoButton(button_type=CalendarEnum.DATE))
+        return Button.trusted(
+            text, CalendarInfoButton(button_type=CalendarEnum.DATE)
+        )
 
     @staticmethod
     def _get_current_date() -> date:
         return datetime.now().date()
 
     @staticmethod
-    def _get_calendar(year: int, month: int) -> Iterable[date]:
-        return python_calendar.Calendar().itermonthdates(year, month)
+    @lru_cache(maxsize=Const.CALENDAR_CACHE_SIZE)
+    def _get_calendar(year: int, month: int) -> tuple[date, ...]:
+        return tuple(_month_calendar.itermonthdates(year, month))
 
-    @staticmethod
     def _get_calendars_day_buttons(
+            self,
             days: Iterable[date],
             current_date: date,
             month: int,
             result_class: CalendarDateFilter
     ) -> list[Row]:
 
+        empty_button = self._get_empty_button()
+
         row_list: list[Row] = []
         current_row: list[Button] = []
 
@@ -94,11 +136,7 @@ class Calendar:
                 current_row = []
 
             if day.month != month:
-                current_row.append(
-                    Button(
-                        " ",
-                        CalendarInfoButton(button_type=CalendarEnum.EMPTY))
-                )
+                current_row.append(empty_button)
 
                 continue
 
@@ -108,10 +146,11 @@ class Calendar:
             else:
                 humanize_day = str(day.day)
 
-            result_class.date_value = day
+            # The result class of the user is not changed
+            day_class = result_class.model_copy(update={"date_value": day})
 
             current_row.append(
-                Button(humanize_day, result_class)
+                Button.trusted(humanize_day, day_class)
             )
 
         row_list.append(Row(*current_row))
@@ -122,11 +161,10 @@ class Calendar:
             self,
             month: int,
             year: int,
-            result_class: CalendarDateFilter
+            result_class: CalendarDateFilter,
+            current_date: date
     ) -> list[Row]:
 
-        current_date = self._get_current_date()
-
         month_day = self._get_calendar(year, month)
 
         return self._get_calendars_day_buttons(
@@ -162,6 +200,118 @@ class Calendar:
             bottom_buttons
         )
 
+    def _build_markup(
+            self,
+            month: int,
+            year: int,
+            result_class: CalendarDateFilter,
+            localization_class: BaseCalendar,
+            current_date: date
+    ) -> InlineKeyboardMarkup:
+
+        heading = self._get_heading(localization_class.weekdays)
+        day_buttons = self._get_days_buttons(
+            month, year, result_class, current_date
+        )
+        bottom_buttons = self._get_bottom_buttons(month, year)
+
+        return self._get_calendar_markup(
+            heading, day_buttons, bottom_buttons
+        )
+
+    @staticmethod
+    def _get_markup_key(
+            month: int,
+            year: int,
+            result_class: CalendarDateFilter,
+            localization_class: BaseCalendar,
+            current_date: date
+    ) -> _MarkupKey:
+
+        result_fields = result_class.model_dump_json(exclude={"date_value"})
+
+        return (
+            year,
+            month,
+            localization_class.weekdays,
+            type(result_class),
+            result_fields,
+            current_date
+        )
+
+    def _get_cached_markup(
+            self,
+            key: _MarkupKey,
+            current_date: date
+    ) -> Optional[InlineKeyboardMarkup]:
+
+        # The keyboards mark today, so they are old after the midnight
+        if self._markups_date != current_date:
+            self._markups.clear()
+            self._markups_date = current_date
+
+        return self._markups.get(key)
+
+    async def _prefetch(
+            self,
+            month: int,
+            year: int,
+            result_class: CalendarDateFilter,
+            localization_class: BaseCalendar,
+            current_date: date
+    ) -> None:
+
+        adjacent_months = (
+            self._get_minus_month_and_year(month, year),
+            self._get_plus_month_and_year(month, year)
+        )
+
+        for adjacent_month, adjacent_year in adjacent_months:
+            # The task started before the midnight must not
+            # replace the keyboards of the new day
+            if self._get_current_date() != current_date:
+                return
+
+            key = self._get_markup_key(
+                adjacent_month,
+                adjacent_year,
+                result_class,
+                localization_class,
+                current_date
+            )
+
+            if self._get_cached_markup(key, current_date) is not None:
+                continue
+
+            self._markups[key] = self._build_markup(
+                adjacent_month,
+                adjacent_year,
+                result_class,
+                localization_class,
+                current_date
+            )
+
+            # The other updates are not blocked by the both months
+            await asyncio.sleep(0)
+
+    def _schedule_prefetch(
+            self,
+            month: int,
+            year: int,
+            result_class: CalendarDateFilter,
+            localization_class: BaseCalendar,
+            current_date: date
+    ) -> None:
+
+        task = asyncio.create_task(
+            self._prefetch(
+                month, year, result_class, localization_class, current_date
+            )
+        )
+
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
     def show(
             self,
             sender: LazySender,
@@ -170,7 +320,8 @@ class Calendar:
             result_class: CalendarDateFilter,
             text: Optional[str] = None,
             localization_class: BaseCalendar = en_calendar,
-            editor: Optional[LazyEditor] = None
+            editor: Optional[LazyEditor] = None,
+            prefetch: bool = False
     ) -> Coroutine[Any, Any, Union[Message, bool]]:
         """
         Send or edit the calendar
@@ -181,17 +332,36 @@ class Calendar:
         :param result_class:
         :param localization_class:
         :param editor:
+        :param prefetch: build the previous and the next months
+        in the background, so the change month button is answered
+        by the ready keyboard. It needs the running event loop
         :return:
         """
 
-        heading = self._get_heading(localization_class.weekdays)
-        day_buttons = self._get_days_buttons(month, year, result_class)
-        bottom_buttons = self._get_bottom_buttons(month, year)
+        current_date = self._get_current_date()
 
-        markup = self._get_calendar_markup(
-            heading, day_buttons, bottom_buttons
+        key = self._get_markup_key(
+            month, year, result_class, localization_class, current_date
         )
 
+        markup = self._get_cached_markup(key, current_date)
+
+        if markup is None:
+            markup = self._build_markup(
+                month, year, result_class, localization_class, current_date
+            )
+
+            self._markups[key] = markup
+
+        # The cached keyboard and its rows are shared by the users,
+        # so the caller gets the own copy which it can change
+        markup = markup.model_copy(deep=True)
+
+        if prefetch:
+            self._schedule_prefetch(
+                month, year, result_class, localization_class, current_date
+            )
+
         if editor is not None:
             return editor.edit(text=text, reply_markup=markup)
 
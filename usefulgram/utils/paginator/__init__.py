@@ -0,0 +1,4 @@
+
+from .filters import PaginatorPageButton, PaginatorInfoButton
+
+from .views import PageSource, paginator
@@ -0,0 +1,14 @@
+
+
+from typing import Optional
+
+from usefulgram.filters.parse_filters import BasePydanticFilter
+
+
+class PaginatorPageButton(BasePydanticFilter):
+    prefix: str = "paginator_page"
+    page: Optional[int] = None
+
+
+class PaginatorInfoButton(BasePydanticFilter):
+    prefix: str = "paginator_info"
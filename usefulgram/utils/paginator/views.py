@@ -0,0 +1,205 @@
+
+
+from typing import Optional, Union, Sequence, Callable, Any, TypeVar
+from abc import ABC, abstractmethod
+
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, Message
+
+from usefulgram.enums import Const
+from usefulgram.lazy import LazySender, LazyEditor
+from usefulgram.keyboard import Builder, Row, Button
+from usefulgram.utils.paginator.filters import (
+    PaginatorPageButton,
+    PaginatorInfoButton
+)
+
+
+T = TypeVar("T")
+
+
+class PageSource(ABC):
+    """
+    Async source of the items, for example the database table.
+    Only the shown page is requested from it
+    """
+
+    @abstractmethod
+    async def count(self) -> int:
+        pass
+
+    @abstractmethod
+    async def get_items(self, offset: int, limit: int) -> Sequence[Any]:
+        pass
+
+
+class Paginator:
+    @staticmethod
+    def _get_pages_count(items_count: int, page_size: int) -> int:
+        pages_count = -(-items_count // page_size)
+
+        return max(pages_count, 1)
+
+    @staticmethod
+    def _get_correct_page(page: int, pages_count: int) -> int:
+        if page < 0:
+            return 0
+
+        if page >= pages_count:
+            return pages_count - 1
+
+        return page
+
+    @staticmethod
+    def _get_item_rows(
+            items: Sequence[T],
+            get_button: Callable[[T], InlineKeyboardButton],
+            adjust: int
+    ) -> list[Row]:
+
+        buttons = [get_button(item) for item in items]
+
+        return [
+            Row(*buttons[index:index + adjust])
+            for index in range(0, len(buttons), adjust)
+        ]
+
+    @staticmethod
+    def _get_page_button(
+            text: str,
+            page: int,
+            page_class: PaginatorPageButton
+    ) -> Button:
+
+        # The copy does not validate the model and keeps the user fields
+        return Button.trusted(
+            text, page_class.model_copy(update={"page": page})
+        )
+
+    def _get_navigation_row(
+            self,
+            page: int,
+            pages_count: int,
+            page_class: PaginatorPageButton
+    ) -> Row:
+
+        info_button = Button.trusted(
+            f"{page + 1}/{pages_count}", PaginatorInfoButton()
+        )
+
+        left_page = page - 1 if page > 0 else pages_count - 1
+        right_page = page + 1 if page < pages_count - 1 else 0
+
+        return Row(
+            self._get_page_button("⇦", left_page, page_class),
+            info_button,
+            self._get_page_button("⇨", right_page, page_class)
+        )
+
+    async def _get_page_items(
+            self,
+            items: Union[Sequence[T], PageSource],
+            page: int,
+            page_size: int
+    ) -> tuple[Sequence[T], int, int]:
+
+        if isinstance(items, PageSource):
+            items_count = await items.count()
+
+        else:
+            items_count = len(items)
+
+        pages_count = self._get_pages_count(items_count, page_size)
+        page = self._get_correct_page(page, pages_count)
+
+        offset = page * page_size
+
+        if isinstance(items, PageSource):
+            page_items = await items.get_items(offset, page_size)
+
+        else:
+            page_items = items[offset:offset + page_size]
+
+        return page_items, page, pages_count
+
+    async def get_markup(
+            self,
+            items: Union[Sequence[T], PageSource],
+            page: int,
+            get_button: Callable[[T], InlineKeyboardButton],
+            page_size: int = Const.PAGINATOR_PAGE_SIZE,
+            adjust: int = 1,
+            page_class: Optional[PaginatorPageButton] = None
+    ) -> InlineKeyboardMarkup:
+        """
+        Build the keyboard of the page.
+        Only the items of the page are taken from the sequence or the source
+        :param items: sized sequence or PageSource
+        :param page: page number from zero, it is fitted into the pages
+        :param get_button: makes the button of the item
+        :param page_size: items on the page
+        :param adjust: buttons in the row
+        :param page_class: PaginatorPageButton or its child
+        with the other prefix and fields, only its page is changed
+        :return:
+        """
+
+        if page_class is None:
+            page_class = PaginatorPageButton()
+
+        page_items, page, pages_count = await self._get_page_items(
+            items, page, page_size
+        )
+
+        item_rows = self._get_item_rows(page_items, get_button, adjust)
+
+        if pages_count == 1:
+            return Builder(*item_rows)
+
+        navigation_row = self._get_navigation_row(
+            page, pages_count, page_class
+        )
+
+        return Builder(*item_rows, navigation_row)
+
+    async def show(
+            self,
+            sender: LazySender,
+            items: Union[Sequence[T], PageSource],
+            page: int,
+            get_button: Callable[[T], InlineKeyboardButton],
+            text: Optional[str] = None,
+            page_size: int = Const.PAGINATOR_PAGE_SIZE,
+            adjust: int = 1,
+            page_class: Optional[PaginatorPageButton] = None,
+            editor: Optional[LazyEditor] = None
+    ) -> Union[Message, bool]:
+        """
+        Send or edit the page
+        :param sender:
+        :param items:
+        :param page:
+        :param get_button:
+        :param text:
+        :param page_size:
+        :param adjust:
+        :param page_class:
+        :param editor:
+        :return:
+        """
+
+        markup = await self.get_markup(
+            items=items,
+            page=page,
+            get_button=get_button,
+            page_size=page_size,
+            adjust=adjust,
+            page_class=page_class
+        )
+
+        if editor is not None:
+            return await editor.edit(text=text, reply_markup=markup)
+
+        return await sender.send(text=text, reply_markup=markup)
+
+
+paginator = Paginator()